@@ -1,107 +1,130 @@
-import math
+import os
+import sys
 import time
 
-# Cache for distances to avoid redundant calculations
-distance_cache = {}
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tspcore import (Budget, DistanceCache, as_city_table, curve_path, distance_kernel, lower_bound,  # noqa: E402
+                     neighbor_lists, optimality_gap)
+from tspcore.bound import BOUND_ITERATIONS  # noqa: E402
+from tspcore.budget import WRAP_UP_FACTOR  # noqa: E402
+from tspcore.improve import improvement_engine  # noqa: E402
+from tspcore.initial import construction_method, initial_tour  # noqa: E402
+from tspcore.oropt import or_opt_candidates  # noqa: E402
 
-def calculate_distance(city1, city2):
-    # Check if distance is already calculated and cached
-    if (city1['name'], city2['name']) not in distance_cache:
-        # Calculate and cache the distance using Euclidean distance formula
-        distance_cache[(city1['name'], city2['name'])] = math.hypot(city1['x'] - city2['x'], city1['y'] - city2['y'])
-    # Return the cached distance
-    return distance_cache[(city1['name'], city2['name'])]
-
-def total_distance(path):
+def total_distance(calculate_distance, path):
     # Calculate the total distance of the given path
     return sum([calculate_distance(path[i], path[(i + 1) % len(path)]) for i in range(len(path))])
 
-def morton_order(city):
-    # Function to compute Morton order (Z-order curve) for sorting cities
-    def interleave_bits(x, y):
-        # Spread bits to interleave x and y coordinates
-        def spread_bits(v):
-            v = (v | (v << 8)) & 0x00FF00FF
-            v = (v | (v << 4)) & 0x0F0F0F0F
-            v = (v | (v << 2)) & 0x33333333
-            v = (v | (v << 1)) & 0x55555555
-            return v
-        # Return interleaved bits of x and y
-        return spread_bits(x) | (spread_bits(y) << 1)
-    # Convert city coordinates to integers and scale them
-    x = int(city['x'] * 10000)
-    y = int(city['y'] * 10000)
-    # Return the Morton order of the city
-    return interleave_bits(x, y)
-
-def solve_tsp(cities):
-    """Find and optimize a path using Morton order, nearest neighbor heuristic, and 2-opt algorithm."""
-    
-    # Sort cities based on Morton order for initial sorting
-    cities_sorted = sorted(cities, key=morton_order)
+def solve_tsp(cities, cache=None, candidate_k=8, method='2opt', time_limit_ms=None, max_passes=None, callback=None,
+              curve='morton', reorder=False, initial='greedy', window=None, workers=1,
+              bound_iterations=None, target_gap=None):
+    """Find and optimize a path using Morton order, a greedy edge (or nearest neighbor) start and 2-opt.
+
+    method picks the main improvement stage: '2opt', 'lk' (Lin-Kernighan style moves) or
+    'anneal' (simulated annealing, needs NumPy).
+    curve picks the space-filling curve for the start order, 'morton' or 'hilbert'; with
+    reorder=True the cities are also renumbered along it (CityTable.reordered) before the
+    neighbor lists are built, so the engines walk memory in mostly sequential order.
+    time_limit_ms caps the whole solve and max_passes each improvement stage; the best tour
+    so far is returned and result['converged'] says whether every stage ran to completion.
+    Construction and neighbor lists watch the deadline too; if it passes while constructing,
+    the tour is the Hilbert curve order instead. callback(path, distance) receives the intermediate
+    tour after each improvement pass.
+    initial picks the starting tour, begun at the first city along the curve: 'greedy'
+    (greedy edge over the candidate lists), 'nearest' (nearest neighbor), 'cheapest' or
+    'farthest' (convex hull + insertion) or 'savings' (Clarke-Wright, needs NumPy).
+    window=k (about 8-12) adds a final stage re-solving every k consecutive cities exactly
+    (window_optimize), over `workers` processes.
+    bound_iterations=k (BOUND_ITERATIONS, say) adds result['lower_bound'], a 1-tree bound on
+    the optimal length raised by k steps of Held-Karp ascent (lower_bound), and result['gap'],
+    how far the tour can be above optimal as a fraction; off by default, as on large inputs
+    it can cost more than the solve. target_gap=0.02, say, ends the improvement stages once
+    the tour is within 2% of the bound, and turns the bound on if bound_iterations did not.
+    """
+    if target_gap is not None and bound_iterations is None:
+        bound_iterations = BOUND_ITERATIONS
+
+    # Deadline for the whole solve and pass limit for the improvement stages; the clock starts now
+    budget = Budget(
+        time_limit_ms, max_passes,
+        callback=None if callback is None else
+        lambda path: callback(table.path_names(path), total_distance(calculate_distance, path)),
+    )
+
+    table = as_city_table(cities)
+    # Keep back time for the O(n) wrap-up, in proportion to reading the cities
+    budget.reserve(WRAP_UP_FACTOR * budget.elapsed())
+    if reorder:
+        table = table.reordered(curve_path(table, curve))
+    stage_name, improve = improvement_engine(method)
+    _, construct = construction_method(initial)
+
+    # K nearest neighbors per city: the 2-opt candidate edges, also kept warm in the distance cache;
+    # None if the deadline passes first, and then the improvement stages are skipped
+    neighbors = neighbor_lists(table, candidate_k, budget)
+
+    # Cache for distances to avoid redundant calculations, bounded and owned by this solve
+    if cache is None:
+        cache = DistanceCache()
+    calculate_distance = distance_kernel(table, 'candidates', cache=cache, candidates=neighbors)
+
+    # Sort cities along a space-filling curve: Morton order by default, or curve='hilbert'
+    cities_sorted = curve_path(table, curve)
 
     # Check if there are any cities to process
     if not cities_sorted:
         print("No cities to process. Please check the input data.")
         return None
 
-    # Measure time for initial solution using nearest neighbor heuristic
+    # Measure time for the initial solution: greedy edge over the same candidate lists by default
     start_initial = time.time()
-    
-    # Initialize unvisited cities set and path with the first city
-    unvisited = set(city['name'] for city in cities_sorted)
-    path = [cities_sorted[0]]
-    current_city = cities_sorted[0]
-
-    # Nearest neighbor heuristic to construct initial path
-    while unvisited:
-        # Remove the current city from unvisited set
-        unvisited.discard(current_city['name'])
-        # Find the closest unvisited city
-        closest = min((city for city in cities_sorted if city['name'] in unvisited), 
-                      key=lambda city: calculate_distance(current_city, city), 
-                      default=None)
-        if closest is None:
-            break
-        # Append the closest city to the path and update current city
-        path.append(closest)
-        current_city = closest
+    path = initial_tour(table, calculate_distance, construct, start=cities_sorted[0], budget=budget)
 
     # Ensure the path returns to the starting city to form a complete tour
     path.append(path[0])
-    initial_distance = total_distance(path)
+    initial_distance = total_distance(calculate_distance, path)
     end_initial = time.time()
     initial_time = round((end_initial - start_initial) * 1000, 2)  # Convert to milliseconds and round to 2 decimal places
 
-    # Measure time for optimizing the path using 2-opt
+    # Lower bound on the optimum over the same candidate lists, with the initial tour as upper
+    # bound; its ascent stops at the solve's deadline, and it is skipped once that has passed
+    bound, bound_time = None, None
+    if bound_iterations is not None and neighbors is not None and not budget.timed_out():
+        start_bound = time.time()
+        bound = lower_bound(table, calculate_distance, neighbors, path, iterations=bound_iterations, budget=budget)
+        bound_time = round((time.time() - start_bound) * 1000, 2)
+        if target_gap is not None:
+            budget.stop = lambda path: optimality_gap(total_distance(calculate_distance, path), bound) <= target_gap
+            budget.stopped = budget.stop(path)  # The initial tour may already be close enough
+
+    # Measure time for optimizing the path using 2-opt (or LK), then Or-opt on the same candidate lists
     start_optimized = time.time()
-    
-    # 2-opt optimization algorithm to improve the path
-    improved = True
-    while improved:
-        improved = False
-        for i in range(1, len(path) - 2):
-            for j in range(i + 1, len(path) - 1):
-                # Check if swapping improves the path
-                if calculate_distance(path[i - 1], path[i]) + calculate_distance(path[j], path[(j + 1) % len(path)]) > \
-                   calculate_distance(path[i - 1], path[j]) + calculate_distance(path[i], path[(j + 1) % len(path)]):
-                    # Perform the swap if it improves the path
-                    path[i:j + 1] = reversed(path[i:j + 1])
-                    improved = True
-            if improved:
-                break  # Break outer loop early if an improvement was found
-
-    optimized_distance = total_distance(path)
+    stages = []
+    engines = []
+    if neighbors is not None and not budget.timed_out():
+        engines = [(stage_name, improve), ('Or-opt', or_opt_candidates)]
+    if window and engines:
+        from tspcore.window import window_optimize  # Needs NumPy, which the default stages do not
+        engines.append(('Window DP', lambda path, neighbors, calculate_distance, budget: window_optimize(
+            path, calculate_distance, window=window, table=table, workers=workers, budget=budget)))
+    for name, engine in engines:
+        before = total_distance(calculate_distance, path)
+        start_stage = time.time()
+        path = engine(path, neighbors, calculate_distance, budget=budget)
+        stage_time = round((time.time() - start_stage) * 1000, 2)  # Milliseconds, like the totals
+        stages.append({'name': name, 'time': stage_time, 'gain': before - total_distance(calculate_distance, path)})
+
+    optimized_distance = total_distance(calculate_distance, path) if stages else initial_distance
     end_optimized = time.time()
     optimized_time = round((end_optimized - start_optimized) * 1000, 2)  # Convert to milliseconds and round to 2 decimal places
 
     # Validation checks to ensure the path includes all cities and returns to the origin
-    unique_cities = {city['name'] for city in path}
-    all_cities = {city['name'] for city in cities}
+    unique_cities = set(path)
+    all_cities = set(range(len(table)))
     is_valid_path = unique_cities == all_cities and path[0] == path[-1]
 
     # Prepare the optimized path array for output
-    optimized_array = [{'name': city['name'], 'x': city['x'], 'y': city['y']} for city in path]
+    optimized_array = table.to_dicts(path)
 
     if is_valid_path:
         print("Path validation successful: Each city is visited once, and path returns to origin.")
@@ -109,13 +132,18 @@ def solve_tsp(cities):
         print("Path validation failed: Path does not include all cities or does not return to the origin.")
 
     return {
-        'initial_path': [city['name'] for city in path],
-        'optimized_path': [city['name'] for city in path],
+        'initial_path': table.path_names(path),
+        'optimized_path': table.path_names(path),
         'initial_distance': initial_distance,
         'optimized_distance': optimized_distance,
         'initial_time': initial_time,
         'optimized_time': optimized_time,
-        'optimized_array': optimized_array
+        'optimized_array': optimized_array,
+        'lower_bound': bound,
+        'gap': None if bound is None else optimality_gap(optimized_distance, bound),
+        'bound_time': bound_time,
+        'stages': stages,
+        'converged': budget.converged
     }
 
 # Define the cities data
@@ -172,13 +200,18 @@ cities = [
     {'name': 'City49', 'x': 490, 'y': 15}
 ]
 
-# Run the function and print results
-result = solve_tsp(cities)
-if result:
-    print("Optimized Path:", result['optimized_path'])
-    print("Optimized Distance:", result['optimized_distance'])
-    print("Optimization Time (ms):", result['optimized_time'])
-    print("Optimized Array:", result['optimized_array'])
+if __name__ == '__main__':
+    # Run the function and print results
+    result = solve_tsp(cities)
+    if result:
+        print("Optimized Path:", result['optimized_path'])
+        print("Optimized Distance:", result['optimized_distance'])
+        print("Optimization Time (ms):", result['optimized_time'])
+        if result['lower_bound'] is not None:
+            print("Lower Bound:", result['lower_bound'], "Gap:", result['gap'])
+        for stage in result['stages']:
+            print(f"{stage['name']} Gain:", stage['gain'], f"{stage['name']} Time (ms):", stage['time'])
+        print("Optimized Array:", result['optimized_array'])
 
 # Path validation successful: Each city is visited once, and path returns to origin.
 # Optimized Path: ['City0', 'City1', 'City2', 'City4', 'City7', 'City9', 'City12', 'City14', 'City17', 'City19', 'City22', 'City24', 'City27', 'City29', 'City32', 'City34', 'City37', 'City39', 'City42', 'City44', 'City47', 'City49', 'City48', 'City46', 'City45', 'City43', 'City41', 'City40', 'City38', 'City36', 'City35', 'City33', 'City31', 'City30', 'City28', 'City26', 'City25', 'City23', 'City21', 'City20', 'City18', 'City16', 'City15', 'City13', 'City11', 'City10', 'City8', 'City6', 'City5', 'City3', 'City0']
@@ -1,5 +1,10 @@
+import os
+import sys
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tspcore import curve_path  # noqa: E402
+
 class QPRx2025:
     """Quantum Processing Relay: Instantly query a result!"""
     def __init__(self, seed=None):
@@ -81,18 +86,11 @@ class QPRx2025:
             index = index // 26 - 1
         return result
 
-    def morton_order(self, city):
-        def interleave_bits(x, y):
-            def spread_bits(v):
-                v = (v | (v << 8)) & 0x00FF00FF
-                v = (v | (v << 4)) & 0x0F0F0F0F
-                v = (v | (v << 2)) & 0x33333333
-                v = (v | (v << 1)) & 0x55555555
-                return v
-            return spread_bits(x) | (spread_bits(y) << 1)
-        x = int(city['x'] * 10000)
-        y = int(city['y'] * 10000)
-        return interleave_bits(x, y)
+    def morton_order(self, cities):
+        # Cities sorted by Morton key. The keys are computed once for the whole list, on a
+        # 32-bit-per-axis grid over its bounding box, so any coordinate range (negative, huge,
+        # fractional) interleaves correctly and the sort stays O(n log n)
+        return [cities[i] for i in curve_path(cities, 'morton')]
     
     def the_options(self, options):
         if not isinstance(options, list) or len(options) == 0:
@@ -130,15 +128,13 @@ class QPRx2025:
     def xor_cipher(self, input, key):
         return ''.join(chr(ord(input[i]) ^ ord(key[i % len(key)])) for i in range(len(input)))
 
-    def dont_matter(self, cities):
+    def dont_matter(self, cities, curve='morton'):
         if not cities:
             print("No cities to process. Please check the input data.")
             return []
         start_sort_time = time.time()
-        cities_sorted = sorted(cities, key=self.morton_order)
-        sorted_path = [cities_sorted.pop(0)]
-        cities_sorted.sort(key=lambda city: (city['x'], city['y']))
-        sorted_path.extend(cities_sorted)
+        # Space-filling-curve tour ('morton' or 'hilbert'): every key computed once, one sort, O(n log n)
+        sorted_path = [cities[i] for i in curve_path(cities, curve)]
         sorted_path.append(sorted_path[0])
         end_sort_time = time.time()
         sort_time = round((end_sort_time - start_sort_time) * 1000, 2)
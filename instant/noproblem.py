@@ -1,26 +1,13 @@
+import os
+import sys
 import time
 import random
 
-def morton_order(city):
-    # Function to compute Morton order (Z-order curve) for sorting cities
-    def interleave_bits(x, y):
-        # Spread bits to interleave x and y coordinates
-        def spread_bits(v):
-            v = (v | (v << 8)) & 0x00FF00FF
-            v = (v | (v << 4)) & 0x0F0F0F0F
-            v = (v | (v << 2)) & 0x33333333
-            v = (v | (v << 1)) & 0x55555555
-            return v
-        # Return interleaved bits of x and y
-        return spread_bits(x) | (spread_bits(y) << 1)
-    # Convert city coordinates to integers and scale them
-    x = int(city['x'] * 10000)
-    y = int(city['y'] * 10000)
-    # Return the Morton order of the city
-    return interleave_bits(x, y)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tspcore import curve_path  # noqa: E402
 
-def dont_matter(cities):
-    """Sort and connect cities based on the least x and y values."""
+def dont_matter(cities, curve='morton'):
+    """Connect cities along a space-filling curve ('morton' or 'hilbert'), O(n log n), as a closed loop."""
     if not cities:
         print("No cities to process. Please check the input data.")
         return []
@@ -28,21 +15,9 @@ def dont_matter(cities):
     # Record start time for initial sorting
     start_sort_time = time.time()
     
-    # Sort cities based on Morton order for initial sorting
-    cities_sorted = sorted(cities, key=morton_order)
-    sorted_path = []
-    current_city = cities_sorted[0]
-    sorted_path.append(current_city)
+    # One vectorized key per city and a single argsort replace the remove/min scan per step
+    sorted_path = [cities[i] for i in curve_path(cities, curve)]
 
-    while cities_sorted:
-        cities_sorted.remove(current_city)
-        if not cities_sorted:
-            break
-        # Find the closest city in the sorted list
-        closest_city = min(cities_sorted, key=lambda city: (city['x'], city['y']))
-        sorted_path.append(closest_city)
-        current_city = closest_city
-    
     # Ensure the first city is also placed at the end to form a loop
     if sorted_path:
         sorted_path.append(sorted_path[0])
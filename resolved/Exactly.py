@@ -1,49 +1,46 @@
-import math
+import os
+import sys
 import time
- # Memoized dictionary to store distances for efficiency
-memoized_distances = {}
 
-def solve_tsp(cities):
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tspcore import DistanceCache, as_city_table, curve_path, distance_kernel, neighbor_lists  # noqa: E402
+from tspcore.twoopt import two_opt_candidates  # noqa: E402
+
+def solve_tsp(cities, cache=None, candidate_k=8, curve='morton'):
     """Find and optimize a path using Morton order, nearest neighbor heuristic, and 2-opt algorithm."""
+    table = as_city_table(cities)
+
+    # K nearest neighbors per city: the 2-opt candidate edges, also kept warm in the distance cache
+    neighbors = neighbor_lists(table, candidate_k)
+
+    # Memoized distances live in a bounded cache owned by this solve (keys are only valid for this table)
+    if cache is None:
+        cache = DistanceCache()
 
     # Function to calculate distance between two cities
-    def calculate_distance(city1, city2):
-        key = frozenset((city1['name'], city2['name']))
-        if key not in memoized_distances:
-            memoized_distances[key] = math.hypot(city1['x'] - city2['x'], city1['y'] - city2['y'])
-        return memoized_distances[key]
+    calculate_distance = distance_kernel(table, 'candidates', cache=cache, candidates=neighbors)
 
     # Function to calculate total distance of the path
     def total_distance(path):
         return sum(calculate_distance(path[i], path[(i + 1) % len(path)]) for i in range(len(path)))
 
-    # Function to compute Morton order of a city
-    def morton_order(city):
-        def interleave_bits(x, y):
-            def spread_bits(v):
-                return (v | (v << 8)) & 0x00FF00FF | ((v | (v << 4)) & 0x0F0F0F0F) | ((v | (v << 2)) & 0x33333333) | ((v | (v << 1)) & 0x55555555)
-            return spread_bits(x) | (spread_bits(y) << 1)
-        x = int(city['x'] * 10000)  # Scale to avoid float precision issues
-        y = int(city['y'] * 10000)
-        return interleave_bits(x, y)
-
-    # Sort cities based on Morton order
-    cities_sorted = sorted(cities, key=morton_order)
+    # Sort cities along a space-filling curve: Morton order by default, or curve='hilbert'
+    cities_sorted = curve_path(table, curve)
 
     # Measure time for initial solution using nearest neighbor heuristic
     start_initial = time.time()
     
     # Nearest neighbor heuristic and path initialization
-    unvisited = set(city['name'] for city in cities_sorted)
+    unvisited = set(cities_sorted)
     path = [cities_sorted[0]]
     current_city = cities_sorted[0]
 
     while unvisited:
-        unvisited.discard(current_city['name'])
+        unvisited.discard(current_city)
         closest, closest_distance = None, float('inf')
 
         for city in cities_sorted:
-            if city['name'] in unvisited:
+            if city in unvisited:
                 dist = calculate_distance(current_city, city)
                 if dist < closest_distance:
                     closest_distance, closest = dist, city
@@ -64,26 +61,8 @@ def solve_tsp(cities):
     # Measure time for optimizing the path using 2-opt
     start_optimized = time.time()
     
-    # 2-opt optimization
-    improvement_threshold = 1e-6
-    improved = True
-
-    while improved:
-        improved = False
-        for i in range(1, len(path) - 2):
-            for j in range(i + 1, len(path) - 1):
-                before_swap = (
-                    calculate_distance(path[i - 1], path[i]) +
-                    calculate_distance(path[j], path[(j + 1) % len(path)])
-                )
-                after_swap = (
-                    calculate_distance(path[i - 1], path[j]) +
-                    calculate_distance(path[i], path[(j + 1) % len(path)])
-                )
-
-                if after_swap + improvement_threshold < before_swap:
-                    path[i:j + 1] = reversed(path[i:j + 1])
-                    improved = True
+    # 2-opt restricted to candidate edges: each city's K nearest neighbors
+    path = two_opt_candidates(path, neighbors, calculate_distance)
 
     optimized_distance = total_distance(path)
     end_optimized = time.time()
@@ -91,8 +70,8 @@ def solve_tsp(cities):
     optimized_time = round(optimized_time, 2)  # Round to 2 decimal places
 
     # Validation checks
-    unique_cities = {city['name'] for city in path}
-    all_cities = {city['name'] for city in cities}
+    unique_cities = set(path)
+    all_cities = set(range(len(table)))
     is_valid_path = unique_cities == all_cities and path[0] == path[-1]
 
     if is_valid_path:
@@ -107,8 +86,8 @@ def solve_tsp(cities):
     print("Optimization Time (ms):", optimized_time)
 
     return {
-        'initial_path': [city['name'] for city in path],
-        'optimized_path': [city['name'] for city in path],
+        'initial_path': table.path_names(path),
+        'optimized_path': table.path_names(path),
         'initial_distance': initial_distance,
         'optimized_distance': optimized_distance,
         'initial_time': initial_time,
@@ -168,11 +147,12 @@ cities = [
     {'name': 'City49', 'x': 490, 'y': 15}
 ]
 
-# Run the function and print results
-result = solve_tsp(cities)
-print("Initial Path:", result['initial_path'])
-print("Optimized Path:", result['optimized_path'])
-print("Initial Distance:", result['initial_distance'])
-print("Optimized Distance:", result['optimized_distance'])
-print("Initial Solution Time (ms):", result['initial_time'])
-print("Optimization Time (ms):", result['optimized_time'])
\ No newline at end of file
+if __name__ == '__main__':
+    # Run the function and print results
+    result = solve_tsp(cities)
+    print("Initial Path:", result['initial_path'])
+    print("Optimized Path:", result['optimized_path'])
+    print("Initial Distance:", result['initial_distance'])
+    print("Optimized Distance:", result['optimized_distance'])
+    print("Initial Solution Time (ms):", result['initial_time'])
+    print("Optimization Time (ms):", result['optimized_time'])
\ No newline at end of file
@@ -1,52 +1,66 @@
-import math
+import os
+import sys
 import time
 
-# Memoized dictionary to store distances for efficiency
-memoized_distances = {}
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tspcore import Budget, DistanceCache, as_city_table, curve_path, distance_kernel  # noqa: E402
+from tspcore.budget import WRAP_UP_FACTOR  # noqa: E402
 
-def calculate_distance(city1, city2):
-    """Calculate the Euclidean distance between two cities, memoized for efficiency."""
-    key = frozenset((city1['name'], city2['name']))
-    if key not in memoized_distances:
-        memoized_distances[key] = math.hypot(city1['x'] - city2['x'], city1['y'] - city2['y'])
-    return memoized_distances[key]
-
-def total_distance(path):
+def total_distance(calculate_distance, path):
     """Calculate total travel distance for the given path."""
     return sum(
         calculate_distance(path[i], path[(i + 1) % len(path)]) for i in range(len(path))
     )
 
-def morton_order(city):
-    """Compute the Morton order (Z-order curve) of a city based on its coordinates."""
-    def interleave_bits(x, y):
-        """Interleave bits of x and y for Morton order calculation."""
-        def spread_bits(v):
-            return (v | (v << 8)) & 0x00FF00FF | ((v | (v << 4)) & 0x0F0F0F0F) | ((v | (v << 2)) & 0x33333333) | ((v | (v << 1)) & 0x55555555)
-        return spread_bits(x) | (spread_bits(y) << 1)
-    
-    x = int(city['x'] * 10000)  # Scale to avoid float precision issues
-    y = int(city['y'] * 10000)
-    return interleave_bits(x, y)
-
-def solve_tsp(cities):
-    """Find and optimize a path using Morton order, nearest neighbor heuristic, and 2-opt algorithm."""
-    
-    # Sort cities based on Morton order
-    cities_sorted = sorted(cities, key=morton_order)
+def solve_tsp(cities, distance_mode=None, cache=None, time_limit_ms=None, max_passes=None, callback=None,
+              curve='morton'):
+    """Find and optimize a path using Morton order, nearest neighbor heuristic, and 2-opt algorithm.
+
+    time_limit_ms caps the whole solve and max_passes the 2-opt loop; the best tour so far
+    is returned and result['converged'] says whether it ran to completion. If the deadline
+    passes during nearest neighbor, the cities left join the tour in curve order.
+    callback(path, distance) receives the intermediate tour after each 2-opt pass.
+    """
+    # Deadline for the whole solve and pass limit for the 2-opt loop; the clock starts now
+    budget = Budget(
+        time_limit_ms, max_passes,
+        callback=None if callback is None else
+        lambda path: callback(table.path_names(path), total_distance(calculate_distance, path)),
+    )
+
+    table = as_city_table(cities)
+    # Keep back time for the O(n) wrap-up, in proportion to reading the cities
+    budget.reserve(WRAP_UP_FACTOR * budget.elapsed())
+
+    # The 'candidates' kernel memoizes into a cache owned by this solve (keys are only valid for this table);
+    # passing a cache selects it, and no other kernel reads one
+    if distance_mode is None:
+        distance_mode = 'direct' if cache is None else 'candidates'
+    elif cache is not None and distance_mode != 'candidates':
+        raise ValueError(f"cache is only used with distance_mode='candidates', not {distance_mode!r}")
+    if cache is None:
+        cache = DistanceCache()
+    calculate_distance = distance_kernel(table, distance_mode, cache=cache)
+
+    # Sort cities along a space-filling curve: Morton order by default, or curve='hilbert'
+    cities_sorted = curve_path(table, curve)
 
     def tsp_nearest_neighbor_and_optimize(cities_sorted):
         """Find a quick solution using the nearest neighbor heuristic and optimize using 2-opt."""
-        unvisited = set(city['name'] for city in cities_sorted)
+        unvisited = set(cities_sorted)
         path = [cities_sorted[0]]
         current_city = cities_sorted[0]
 
         while unvisited:
-            unvisited.discard(current_city['name'])
+            unvisited.discard(current_city)
+            if budget.timed_out():
+                # Out of time: the rest follow in curve order (one clock read per O(n) scan)
+                path.extend(city for city in cities_sorted if city in unvisited)
+                break
             closest, closest_distance = None, float('inf')
 
             for city in cities_sorted:
-                if city['name'] in unvisited:
+                if city in unvisited:
                     dist = calculate_distance(current_city, city)
                     if dist < closest_distance:
                         closest_distance, closest = dist, city
@@ -59,17 +73,19 @@ def solve_tsp(cities):
 
         # Ensure path returns to start to form a complete tour
         path.append(path[0])
-        return {'path': path, 'distance': total_distance(path)}
+        return {'path': path, 'distance': total_distance(calculate_distance, path)}
 
     def two_opt(path):
         """Optimize the path using the 2-opt algorithm for a near-optimal solution."""
         improvement_threshold = 1e-6
-        improved = True
+        improved = budget.start()
 
         while improved:
             improved = False
             for i in range(1, len(path) - 2):
                 for j in range(i + 1, len(path) - 1):
+                    if budget.expired():
+                        return path  # Out of time: every swap so far kept the tour valid and shorter
                     before_swap = (
                         calculate_distance(path[i - 1], path[i]) +
                         calculate_distance(path[j], path[(j + 1) % len(path)])
@@ -83,6 +99,9 @@ def solve_tsp(cities):
                         path[i:j + 1] = reversed(path[i:j + 1])
                         improved = True
 
+            if improved and not budget.end_pass(lambda: path):
+                break
+
         return path
 
     # Measure time for initial solution using nearest neighbor heuristic
@@ -96,16 +115,16 @@ def solve_tsp(cities):
     # Measure time for optimizing the path using 2-opt
     start_optimized = time.time()
     optimized_path = two_opt(initial_path)
-    optimized_distance = total_distance(optimized_path)
+    optimized_distance = total_distance(calculate_distance, optimized_path)
     end_optimized = time.time()
     optimized_time = (end_optimized - start_optimized) * 1000  # Convert to milliseconds
     optimized_time = round(optimized_time, 2)  # Round to 2 decimal places
 
     # Validation checks
-    def validate_path(path, cities):
+    def validate_path(path, table):
         """Ensure each city is visited exactly once and that the path returns to the origin."""
-        unique_cities = {city['name'] for city in path}
-        all_cities = {city['name'] for city in cities}
+        unique_cities = set(path)
+        all_cities = set(range(len(table)))
         
         # Check if all cities are visited and path returns to the start
         is_valid_path = unique_cities == all_cities and path[0] == path[-1]
@@ -114,7 +133,7 @@ def solve_tsp(cities):
         return is_valid_path
 
     # Run validations
-    if validate_path(optimized_path, cities):
+    if validate_path(optimized_path, table):
         print("Path validation successful: Each city is visited once, and path returns to origin.")
     else:
         print("Path validation failed.")
@@ -124,14 +143,18 @@ def solve_tsp(cities):
     print("Optimized Distance:", optimized_distance)
     print(f"Initial Solution Time (ms): {initial_time}")
     print(f"Optimization Time (ms): {optimized_time}")
+    if distance_mode == 'candidates':
+        print("Distance Cache:", cache.stats())
 
     return {
-        'initial_path': [city['name'] for city in initial_path],
-        'optimized_path': [city['name'] for city in optimized_path],
+        'initial_path': table.path_names(initial_path),
+        'optimized_path': table.path_names(optimized_path),
         'initial_distance': initial_distance,
         'optimized_distance': optimized_distance,
         'initial_time': initial_time,
-        'optimized_time': optimized_time
+        'optimized_time': optimized_time,
+        'distance_cache': cache.stats() if distance_mode == 'candidates' else None,
+        'converged': budget.converged
     }
 
 cities = [
@@ -187,11 +210,12 @@ cities = [
     {'name': 'City49', 'x': 490, 'y': 15}
 ]
 
-# Run the function and print results
-result = solve_tsp(cities)
-print("Initial Path:", result['initial_path'])
-print("Optimized Path:", result['optimized_path'])
-print("Initial Distance:", result['initial_distance'])
-print("Optimized Distance:", result['optimized_distance'])
-print("Initial Solution Time (ms):", result['initial_time'])
-print("Optimization Time (ms):", result['optimized_time'])
\ No newline at end of file
+if __name__ == '__main__':
+    # Run the function and print results
+    result = solve_tsp(cities)
+    print("Initial Path:", result['initial_path'])
+    print("Optimized Path:", result['optimized_path'])
+    print("Initial Distance:", result['initial_distance'])
+    print("Optimized Distance:", result['optimized_distance'])
+    print("Initial Solution Time (ms):", result['initial_time'])
+    print("Optimization Time (ms):", result['optimized_time'])
\ No newline at end of file
@@ -1,57 +1,44 @@
-import math
+import os
+import sys
 import time
 
-# Memoized dictionary to store distances for efficiency
-memoized_distances = {}
-
-# Higher-order function to memoize distances
-def memoize_distance(func):
-    def wrapper(city1, city2):
-        key = frozenset((city1['name'], city2['name']))
-        if key not in memoized_distances:
-            memoized_distances[key] = func(city1, city2)
-        return memoized_distances[key]
-    return wrapper
-
-@memoize_distance
-def calculate_distance(city1, city2):
-    return math.hypot(city1['x'] - city2['x'], city1['y'] - city2['y'])
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tspcore import as_city_table, curve_path, distance_kernel  # noqa: E402
+from tspcore.matrix import build_distance_matrix  # noqa: E402
 
 # Function to calculate total distance of the path
-def total_distance(path):
+def total_distance(calculate_distance, path):
     return sum(calculate_distance(path[i], path[(i + 1) % len(path)]) for i in range(len(path)))
 
-# Morton order function
-def morton_order(city):
-    def interleave_bits(x, y):
-        def spread_bits(v):
-            return (v | (v << 8)) & 0x00FF00FF | ((v | (v << 4)) & 0x0F0F0F0F) | ((v | (v << 2)) & 0x33333333) | ((v | (v << 1)) & 0x55555555)
-        return spread_bits(x) | (spread_bits(y) << 1)
-    x = int(city['x'] * 10000)  # Scale to avoid float precision issues
-    y = int(city['y'] * 10000)
-    return interleave_bits(x, y)
+def solve_tsp(cities, dtype='float64', condensed=False, matrix_path=None, curve='morton'):
+    """Find and optimize a path using Morton order, nearest neighbor heuristic, and in-place 2-opt algorithm.
 
-def solve_tsp(cities):
-    """Find and optimize a path using Morton order, nearest neighbor heuristic, and in-place 2-opt algorithm."""
+    All distances are read from one precomputed matrix. dtype='float32' halves it, condensed=True
+    keeps only the upper triangle, and matrix_path writes it to a memory-mapped file that other
+    processes can share through tspcore.matrix.load_distance_matrix().
+    """
+    table = as_city_table(cities)
 
     # Precompute and store distances between all pairs of cities
-    distances = {frozenset((city1['name'], city2['name'])): calculate_distance(city1, city2)
-                 for city1 in cities for city2 in cities if city1 != city2}
+    start_matrix = time.time()
+    distances = build_distance_matrix(table, dtype=dtype, condensed=condensed, path=matrix_path)
+    calculate_distance = distance_kernel(table, 'matrix', matrix=distances)
+    matrix_time = round((time.time() - start_matrix) * 1000, 2)  # Convert to milliseconds and round to 2 decimal places
 
-    # Sort cities based on Morton order
-    cities_sorted = sorted(cities, key=morton_order)
+    # Sort cities along a space-filling curve: Morton order by default, or curve='hilbert'
+    cities_sorted = curve_path(table, curve)
 
     # Measure time for initial solution using nearest neighbor heuristic
     start_initial = time.time()
     
     # Nearest neighbor heuristic and path initialization
-    unvisited = set(city['name'] for city in cities_sorted)
+    unvisited = set(cities_sorted)
     path = [cities_sorted[0]]
     current_city = cities_sorted[0]
 
     while unvisited:
-        unvisited.discard(current_city['name'])
-        closest = min((city for city in cities_sorted if city['name'] in unvisited), 
+        unvisited.discard(current_city)
+        closest = min((city for city in cities_sorted if city in unvisited), 
                       key=lambda city: calculate_distance(current_city, city), 
                       default=None)
         if closest is None:
@@ -62,7 +49,7 @@ def solve_tsp(cities):
 
     # Ensure path returns to start to form a complete tour
     path.append(path[0])
-    initial_distance = total_distance(path)
+    initial_distance = total_distance(calculate_distance, path)
     end_initial = time.time()
     initial_time = round((end_initial - start_initial) * 1000, 2)  # Convert to milliseconds and round to 2 decimal places
 
@@ -83,13 +70,13 @@ def solve_tsp(cities):
                     path[i:j + 1] = reversed(path[i:j + 1])
                     improved = True
 
-    optimized_distance = total_distance(path)
+    optimized_distance = total_distance(calculate_distance, path)
     end_optimized = time.time()
     optimized_time = round((end_optimized - start_optimized) * 1000, 2)  # Convert to milliseconds and round to 2 decimal places
 
     # Validation checks
-    unique_cities = {city['name'] for city in path}
-    all_cities = {city['name'] for city in cities}
+    unique_cities = set(path)
+    all_cities = set(range(len(table)))
     is_valid_path = unique_cities == all_cities and path[0] == path[-1]
 
     if is_valid_path:
@@ -98,14 +85,16 @@ def solve_tsp(cities):
         print("Path validation failed: Path does not include all cities or does not return to the origin.")
 
     # Output details for comparison
+    print("Distance Matrix (MB):", round(distances.nbytes / 2**20, 2))
+    print("Distance Matrix Time (ms):", matrix_time)
     print("Initial Distance:", initial_distance)
     print("Optimized Distance:", optimized_distance)
     print("Initial Solution Time (ms):", initial_time)
     print("Optimization Time (ms):", optimized_time)
 
     return {
-        'initial_path': [city['name'] for city in path],
-        'optimized_path': [city['name'] for city in path],
+        'initial_path': table.path_names(path),
+        'optimized_path': table.path_names(path),
         'initial_distance': initial_distance,
         'optimized_distance': optimized_distance,
         'initial_time': initial_time,
@@ -166,11 +155,12 @@ cities = [
     {'name': 'City49', 'x': 490, 'y': 15}
 ]
 
-# Run the function and print results
-result = solve_tsp(cities)
-print("Initial Path:", result['initial_path'])
-print("Optimized Path:", result['optimized_path'])
-print("Initial Distance:", result['initial_distance'])
-print("Optimized Distance:", result['optimized_distance'])
-print("Initial Solution Time (ms):", result['initial_time'])
-print("Optimization Time (ms):", result['optimized_time'])
\ No newline at end of file
+if __name__ == '__main__':
+    # Run the function and print results
+    result = solve_tsp(cities)
+    print("Initial Path:", result['initial_path'])
+    print("Optimized Path:", result['optimized_path'])
+    print("Initial Distance:", result['initial_distance'])
+    print("Optimized Distance:", result['optimized_distance'])
+    print("Initial Solution Time (ms):", result['initial_time'])
+    print("Optimization Time (ms):", result['optimized_time'])
\ No newline at end of file
@@ -1,36 +1,42 @@
-import math
+import os
+import sys
 import time
 
-# Memoized dictionary to store distances for efficiency
-memoized_distances = {}
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tspcore import DistanceCache, as_city_table, distance_kernel  # noqa: E402
 
-def calculate_distance(city1, city2):
-    """Calculate the Euclidean distance between two cities, memoized for efficiency."""
-    key = frozenset((city1['name'], city2['name']))
-    if key not in memoized_distances:
-        memoized_distances[key] = math.hypot(city1['x'] - city2['x'], city1['y'] - city2['y'])
-    return memoized_distances[key]
-
-def total_distance(path):
+def total_distance(calculate_distance, path):
     """Calculate total travel distance for the given path."""
     return sum(
         calculate_distance(path[i], path[(i + 1) % len(path)]) for i in range(len(path))
     )
 
-def solve_tsp(cities):
+def solve_tsp(cities, distance_mode=None, cache=None):
     """Find and optimize a path using nearest neighbor heuristic and 2-opt algorithm."""
-    def tsp_nearest_neighbor_and_optimize(cities):
+    table = as_city_table(cities)
+
+    # The 'candidates' kernel memoizes into a cache owned by this solve (keys are only valid for this table);
+    # passing a cache selects it, and no other kernel reads one
+    if distance_mode is None:
+        distance_mode = 'direct' if cache is None else 'candidates'
+    elif cache is not None and distance_mode != 'candidates':
+        raise ValueError(f"cache is only used with distance_mode='candidates', not {distance_mode!r}")
+    if cache is None:
+        cache = DistanceCache()
+    calculate_distance = distance_kernel(table, distance_mode, cache=cache)
+
+    def tsp_nearest_neighbor_and_optimize(num_cities):
         """Find a quick solution using the nearest neighbor heuristic and optimize using 2-opt."""
-        unvisited = set(city['name'] for city in cities)
-        path = [cities[0]]
-        current_city = cities[0]
+        unvisited = set(range(num_cities))
+        path = [0]
+        current_city = 0
 
         while unvisited:
-            unvisited.discard(current_city['name'])
+            unvisited.discard(current_city)
             closest, closest_distance = None, float('inf')
 
-            for city in cities:
-                if city['name'] in unvisited:
+            for city in range(num_cities):
+                if city in unvisited:
                     dist = calculate_distance(current_city, city)
                     if dist < closest_distance:
                         closest_distance, closest = dist, city
@@ -43,7 +49,7 @@ def solve_tsp(cities):
 
         # Ensure path returns to start to form a complete tour
         path.append(path[0])
-        return {'path': path, 'distance': total_distance(path)}
+        return {'path': path, 'distance': total_distance(calculate_distance, path)}
 
     def two_opt(path):
         """Optimize the path using the 2-opt algorithm for a near-optimal solution."""
@@ -71,7 +77,7 @@ def solve_tsp(cities):
 
     # Measure time for initial solution using nearest neighbor heuristic
     start_initial = time.time()
-    initial_solution = tsp_nearest_neighbor_and_optimize(cities)
+    initial_solution = tsp_nearest_neighbor_and_optimize(len(table))
     end_initial = time.time()
     initial_path, initial_distance = initial_solution['path'], initial_solution['distance']
     initial_time = (end_initial - start_initial) * 1000  # Convert to milliseconds and round
@@ -80,16 +86,16 @@ def solve_tsp(cities):
     # Measure time for optimizing the path using 2-opt
     start_optimized = time.time()
     optimized_path = two_opt(initial_path)
-    optimized_distance = total_distance(optimized_path)
+    optimized_distance = total_distance(calculate_distance, optimized_path)
     end_optimized = time.time()
     optimized_time = (end_optimized - start_optimized) * 1000  # Convert to milliseconds and round
     optimized_time = round(optimized_time, 2)  # Round to 2 decimal places
 
     # Validation checks
-    def validate_path(path, cities):
+    def validate_path(path, table):
         """Ensure each city is visited exactly once and that the path returns to the origin."""
-        unique_cities = {city['name'] for city in path}
-        all_cities = {city['name'] for city in cities}
+        unique_cities = set(path)
+        all_cities = set(range(len(table)))
         
         # Check if all cities are visited and path returns to the start
         is_valid_path = unique_cities == all_cities and path[0] == path[-1]
@@ -98,7 +104,7 @@ def solve_tsp(cities):
         return is_valid_path
 
     # Run validations
-    if validate_path(optimized_path, cities):
+    if validate_path(optimized_path, table):
         print("Path validation successful: Each city is visited once, and path returns to origin.")
     else:
         print("Path validation failed.")
@@ -108,14 +114,17 @@ def solve_tsp(cities):
     print("Optimized Distance:", optimized_distance)
     print(f"Initial Solution Time (ms): {initial_time}")
     print(f"Optimization Time (ms): {optimized_time}")
+    if distance_mode == 'candidates':
+        print("Distance Cache:", cache.stats())
 
     return {
-        'initial_path': [city['name'] for city in initial_path],
-        'optimized_path': [city['name'] for city in optimized_path],
+        'initial_path': table.path_names(initial_path),
+        'optimized_path': table.path_names(optimized_path),
         'initial_distance': initial_distance,
         'optimized_distance': optimized_distance,
         'initial_time': initial_time,
-        'optimized_time': optimized_time
+        'optimized_time': optimized_time,
+        'distance_cache': cache.stats() if distance_mode == 'candidates' else None
     }
 
 cities = [
@@ -171,11 +180,12 @@ cities = [
     {'name': 'City49', 'x': 490, 'y': 15}
 ]
 
-# Run the function and print results
-result = solve_tsp(cities)
-print("Initial Path:", result['initial_path'])
-print("Optimized Path:", result['optimized_path'])
-print("Initial Distance:", result['initial_distance'])
-print("Optimized Distance:", result['optimized_distance'])
-print("Initial Solution Time (ms):", result['initial_time'])
-print("Optimization Time (ms):", result['optimized_time'])
\ No newline at end of file
+if __name__ == '__main__':
+    # Run the function and print results
+    result = solve_tsp(cities)
+    print("Initial Path:", result['initial_path'])
+    print("Optimized Path:", result['optimized_path'])
+    print("Initial Distance:", result['initial_distance'])
+    print("Optimized Distance:", result['optimized_distance'])
+    print("Initial Solution Time (ms):", result['initial_time'])
+    print("Optimization Time (ms):", result['optimized_time'])
\ No newline at end of file
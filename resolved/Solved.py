@@ -1,43 +1,40 @@
 import math
+import os
+import sys
 import time
 
-def calculate_distance(city1, city2):
-    return math.hypot(city1['x'] - city2['x'], city1['y'] - city2['y'])
-
-def total_distance(path):
-    return sum(calculate_distance(path[i], path[(i + 1) % len(path)]) for i in range(len(path)))
-
-def morton_order(city):
-    def interleave_bits(x, y):
-        def spread_bits(v):
-            v = (v | (v << 8)) & 0x00FF00FF
-            v = (v | (v << 4)) & 0x0F0F0F0F
-            v = (v | (v << 2)) & 0x33333333
-            v = (v | (v << 1)) & 0x55555555
-            return v
-        return spread_bits(x) | (spread_bits(y) << 1)
-    x = int(city['x'] * 10000)
-    y = int(city['y'] * 10000)
-    return interleave_bits(x, y)
-
-def solve_tsp(cities):
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tspcore import as_city_table, curve_path, neighbor_lists  # noqa: E402
+from tspcore.twoopt import two_opt_candidates  # noqa: E402
+
+def calculate_distance(table, city1, city2):
+    return math.hypot(table.x[city1] - table.x[city2], table.y[city1] - table.y[city2])
+
+def total_distance(table, path):
+    return sum(calculate_distance(table, path[i], path[(i + 1) % len(path)]) for i in range(len(path)))
+
+def solve_tsp(cities, candidate_k=8, curve='morton'):
     """Find and optimize a path using Morton order, nearest neighbor heuristic, and 2-opt algorithm."""
-    
-    # Sort cities based on Morton order
-    cities_sorted = sorted(cities, key=morton_order)
+    table = as_city_table(cities)
+
+    # K nearest neighbors per city: the only new edges 2-opt will try
+    neighbors = neighbor_lists(table, candidate_k)
+
+    # Sort cities along a space-filling curve: Morton order by default, or curve='hilbert'
+    cities_sorted = curve_path(table, curve)
 
     # Measure time for initial solution using nearest neighbor heuristic
     start_initial = time.time()
     
     # Nearest neighbor heuristic and path initialization
-    unvisited = set(city['name'] for city in cities_sorted)
+    unvisited = set(cities_sorted)
     path = [cities_sorted[0]]
     current_city = cities_sorted[0]
 
     while unvisited:
-        unvisited.discard(current_city['name'])
-        closest = min((city for city in cities_sorted if city['name'] in unvisited), 
-                      key=lambda city: calculate_distance(current_city, city), 
+        unvisited.discard(current_city)
+        closest = min((city for city in cities_sorted if city in unvisited), 
+                      key=lambda city: calculate_distance(table, current_city, city), 
                       default=None)
         if closest is None:
             break
@@ -47,36 +44,26 @@ def solve_tsp(cities):
 
     # Ensure path returns to start to form a complete tour
     path.append(path[0])
-    initial_distance = total_distance(path)
+    initial_distance = total_distance(table, path)
     end_initial = time.time()
     initial_time = round((end_initial - start_initial) * 1000, 2)  # Convert to milliseconds and round to 2 decimal places
 
     # Measure time for optimizing the path using 2-opt
     start_optimized = time.time()
     
-    # 2-opt optimization
-    improvement_threshold = 1e-6
-    improved = True
-
-    while improved:
-        improved = False
-        for i in range(1, len(path) - 2):
-            for j in range(i + 1, len(path) - 1):
-                if calculate_distance(path[i - 1], path[i]) + calculate_distance(path[j], path[(j + 1) % len(path)]) > \
-                   calculate_distance(path[i - 1], path[j]) + calculate_distance(path[i], path[(j + 1) % len(path)]):
-                    path[i:j + 1] = reversed(path[i:j + 1])
-                    improved = True
-
-    optimized_distance = total_distance(path)
+    # 2-opt restricted to candidate edges: each city's K nearest neighbors
+    path = two_opt_candidates(path, neighbors, lambda city1, city2: calculate_distance(table, city1, city2))
+
+    optimized_distance = total_distance(table, path)
     end_optimized = time.time()
     optimized_time = round((end_optimized - start_optimized) * 1000, 2)  # Convert to milliseconds and round to 2 decimal places
 
     # Validation checks
-    unique_cities = {city['name'] for city in path}
-    all_cities = {city['name'] for city in cities}
+    unique_cities = set(path)
+    all_cities = set(range(len(table)))
     is_valid_path = unique_cities == all_cities and path[0] == path[-1]
 
-    optimized_array = [{'name': city['name'], 'x': city['x'], 'y': city['y']} for city in path]
+    optimized_array = table.to_dicts(path)
 
     if is_valid_path:
         print("Path validation successful: Each city is visited once, and path returns to origin.")
@@ -84,8 +71,8 @@ def solve_tsp(cities):
         print("Path validation failed: Path does not include all cities or does not return to the origin.")
 
     return {
-        'initial_path': [city['name'] for city in path],
-        'optimized_path': [city['name'] for city in path],
+        'initial_path': table.path_names(path),
+        'optimized_path': table.path_names(path),
         'initial_distance': initial_distance,
         'optimized_distance': optimized_distance,
         'initial_time': initial_time,
@@ -146,9 +133,10 @@ cities = [
     {'name': 'City49', 'x': 490, 'y': 15}
 ]
 
-# Run the function and print results
-result = solve_tsp(cities)
-print("Optimized Path:", result['optimized_path'])
-print("Optimized Distance:", result['optimized_distance'])
-print("Optimization Time (ms):", result['optimized_time'])
-print("Optimized Array:", result['optimized_array'])
+if __name__ == '__main__':
+    # Run the function and print results
+    result = solve_tsp(cities)
+    print("Optimized Path:", result['optimized_path'])
+    print("Optimized Distance:", result['optimized_distance'])
+    print("Optimization Time (ms):", result['optimized_time'])
+    print("Optimized Array:", result['optimized_array'])
@@ -1,15 +1,23 @@
 import math
+import os
+import sys
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tspcore import as_city_table, nearest_neighbor_tour  # noqa: E402
+
 def solve_tsp(cities):
+    table = as_city_table(cities)
+    xs, ys = table.x, table.y
+
     # Memoized dictionary to store distances for efficiency
     memoized_distances = {}
 
     def calculate_distance(city1, city2):
         """Calculate the Euclidean distance between two cities, memoized for efficiency."""
-        key = frozenset((city1['name'], city2['name']))
+        key = frozenset((city1, city2))
         if key not in memoized_distances:
-            memoized_distances[key] = math.hypot(city1['x'] - city2['x'], city1['y'] - city2['y'])
+            memoized_distances[key] = math.hypot(xs[city1] - xs[city2], ys[city1] - ys[city2])
         return memoized_distances[key]
 
     def total_distance(path):
@@ -18,27 +26,10 @@ def solve_tsp(cities):
             calculate_distance(path[i], path[(i + 1) % len(path)]) for i in range(len(path))
         )
 
-    def tsp_nearest_neighbor(cities):
+    def tsp_nearest_neighbor(num_cities):
         """Find a quick solution using the nearest neighbor heuristic."""
-        unvisited = set(city['name'] for city in cities)
-        path = [cities[0]]
-        current_city = cities[0]
-
-        while unvisited:
-            unvisited.discard(current_city['name'])
-            closest, closest_distance = None, float('inf')
-
-            for city in cities:
-                if city['name'] in unvisited:
-                    dist = calculate_distance(current_city, city)
-                    if dist < closest_distance:
-                        closest_distance, closest = dist, city
-
-            if closest is None:
-                break
-
-            path.append(closest)
-            current_city = closest
+        # A spatial grid answers each "closest unvisited city" query instead of scanning every city
+        path = nearest_neighbor_tour(table, calculate_distance)
 
         # Ensure path returns to start to form a complete tour
         path.append(path[0])
@@ -74,7 +65,7 @@ def solve_tsp(cities):
 
     # Measure time for initial solution using nearest neighbor heuristic
     start_initial = time.time()
-    initial_solution = tsp_nearest_neighbor(cities)
+    initial_solution = tsp_nearest_neighbor(len(table))
     end_initial = time.time()
     initial_path, initial_distance = initial_solution['path'], initial_solution['distance']
     initial_time = (end_initial - start_initial) * 1000  # Convert to milliseconds and round
@@ -89,10 +80,10 @@ def solve_tsp(cities):
     optimized_time = round(optimized_time, 2)  # Round to 2 decimal places
 
     # Validation checks
-    def validate_path(path, cities):
+    def validate_path(path, table):
         """Ensure each city is visited exactly once and that the path returns to the origin."""
-        unique_cities = {city['name'] for city in path}
-        all_cities = {city['name'] for city in cities}
+        unique_cities = set(path)
+        all_cities = set(range(len(table)))
         
         # Check if all cities are visited and path returns to the start
         is_valid_path = unique_cities == all_cities and path[0] == path[-1]
@@ -101,7 +92,7 @@ def solve_tsp(cities):
         return is_valid_path
 
     # Run validations
-    if validate_path(optimized_path, cities):
+    if validate_path(optimized_path, table):
         print("Path validation successful: Each city is visited once, and path returns to origin.")
     else:
         print("Path validation failed.")
@@ -113,8 +104,8 @@ def solve_tsp(cities):
     print(f"Optimization Time (ms): {optimized_time}")
 
     return {
-        'initial_path': [city['name'] for city in initial_path],
-        'optimized_path': [city['name'] for city in optimized_path],
+        'initial_path': table.path_names(initial_path),
+        'optimized_path': table.path_names(optimized_path),
         'initial_distance': initial_distance,
         'optimized_distance': optimized_distance,
         'initial_time': initial_time,
@@ -174,11 +165,12 @@ cities = [
     {'name': 'City49', 'x': 490, 'y': 15}
 ]
 
-# Run the function and print results
-result = solve_tsp(cities)
-print("Initial Path:", result['initial_path'])
-print("Optimized Path:", result['optimized_path'])
-print("Initial Distance:", result['initial_distance'])
-print("Optimized Distance:", result['optimized_distance'])
-print("Initial Solution Time (ms):", result['initial_time'])
-print("Optimization Time (ms):", result['optimized_time'])
\ No newline at end of file
+if __name__ == '__main__':
+    # Run the function and print results
+    result = solve_tsp(cities)
+    print("Initial Path:", result['initial_path'])
+    print("Optimized Path:", result['optimized_path'])
+    print("Initial Distance:", result['initial_distance'])
+    print("Optimized Distance:", result['optimized_distance'])
+    print("Initial Solution Time (ms):", result['initial_time'])
+    print("Optimization Time (ms):", result['optimized_time'])
\ No newline at end of file
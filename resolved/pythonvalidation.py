@@ -1,15 +1,23 @@
 import math
+import os
+import sys
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tspcore import as_city_table  # noqa: E402
+
 def solve_tsp(cities):
+    table = as_city_table(cities)
+    xs, ys = table.x, table.y
+
     # Memoized dictionary to store distances for efficiency
     memoized_distances = {}
 
     def calculate_distance(city1, city2):
         """Calculate the Euclidean distance between two cities, memoized for efficiency."""
-        key = frozenset((city1['name'], city2['name']))
+        key = frozenset((city1, city2))
         if key not in memoized_distances:
-            memoized_distances[key] = math.hypot(city1['x'] - city2['x'], city1['y'] - city2['y'])
+            memoized_distances[key] = math.hypot(xs[city1] - xs[city2], ys[city1] - ys[city2])
         return memoized_distances[key]
 
     def total_distance(path):
@@ -18,18 +26,18 @@ def solve_tsp(cities):
             calculate_distance(path[i], path[(i + 1) % len(path)]) for i in range(len(path))
         )
 
-    def tsp_nearest_neighbor(cities):
+    def tsp_nearest_neighbor(num_cities):
         """Find a quick solution using the nearest neighbor heuristic."""
-        unvisited = set(city['name'] for city in cities)
-        path = [cities[0]]
-        current_city = cities[0]
+        unvisited = set(range(num_cities))
+        path = [0]
+        current_city = 0
 
         while unvisited:
-            unvisited.discard(current_city['name'])
+            unvisited.discard(current_city)
             closest, closest_distance = None, float('inf')
 
-            for city in cities:
-                if city['name'] in unvisited:
+            for city in range(num_cities):
+                if city in unvisited:
                     dist = calculate_distance(current_city, city)
                     if dist < closest_distance:
                         closest_distance, closest = dist, city
@@ -74,7 +82,7 @@ def solve_tsp(cities):
 
     # Measure time for initial solution using nearest neighbor heuristic
     start_initial = time.time()
-    initial_solution = tsp_nearest_neighbor(cities)
+    initial_solution = tsp_nearest_neighbor(len(table))
     end_initial = time.time()
     initial_path, initial_distance = initial_solution['path'], initial_solution['distance']
     initial_time = end_initial - start_initial
@@ -87,10 +95,10 @@ def solve_tsp(cities):
     optimized_time = end_optimized - start_optimized
 
     # Validation checks
-    def validate_path(path, cities):
+    def validate_path(path, table):
         """Ensure each city is visited exactly once and that the path returns to the origin."""
-        unique_cities = {city['name'] for city in path}
-        all_cities = {city['name'] for city in cities}
+        unique_cities = set(path)
+        all_cities = set(range(len(table)))
         
         # Check if all cities are visited and path returns to the start
         is_valid_path = unique_cities == all_cities and path[0] == path[-1]
@@ -99,7 +107,7 @@ def solve_tsp(cities):
         return is_valid_path
 
     # Run validations
-    if validate_path(optimized_path, cities):
+    if validate_path(optimized_path, table):
         print("Path validation successful: Each city is visited once, and path returns to origin.")
     else:
         print("Path validation failed.")
@@ -111,8 +119,8 @@ def solve_tsp(cities):
     print("Optimization Time (seconds):", optimized_time)
 
     return {
-        'initial_path': [city['name'] for city in initial_path],
-        'optimized_path': [city['name'] for city in optimized_path],
+        'initial_path': table.path_names(initial_path),
+        'optimized_path': table.path_names(optimized_path),
         'initial_distance': initial_distance,
         'optimized_distance': optimized_distance,
         'initial_time': initial_time,
@@ -172,14 +180,15 @@ cities = [
     {'name': 'City49', 'x': 490, 'y': 15}
 ]
 
-# Run the function and print results
-result = solve_tsp(cities)
-print("Initial Path:", result['initial_path'])
-print("Optimized Path:", result['optimized_path'])
-print("Initial Distance:", result['initial_distance'])
-print("Optimized Distance:", result['optimized_distance'])
-print("Initial Solution Time (seconds):", result['initial_time'])
-print("Optimization Time (seconds):", result['optimized_time'])
+if __name__ == '__main__':
+    # Run the function and print results
+    result = solve_tsp(cities)
+    print("Initial Path:", result['initial_path'])
+    print("Optimized Path:", result['optimized_path'])
+    print("Initial Distance:", result['initial_distance'])
+    print("Optimized Distance:", result['optimized_distance'])
+    print("Initial Solution Time (seconds):", result['initial_time'])
+    print("Optimization Time (seconds):", result['optimized_time'])
 
 # Results Equal
 # Path validation successful: Each city is visited once, and path returns to origin.
@@ -0,0 +1,22 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run from anywhere: the scripts in this repository import tspcore from the repository root
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def load_script():
+    """Import one of the repository's solve_tsp scripts (not a package) by its path from the root."""
+    def load(path):
+        name = os.path.splitext(path)[0].replace('/', '_')
+        spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, path))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    return load
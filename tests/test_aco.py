@@ -0,0 +1,39 @@
+import pytest
+
+from tspcore import distance_kernel
+from tspcore.bench import random_table
+from tspcore.construct import nearest_neighbor_tour
+
+np = pytest.importorskip('numpy')
+
+from tspcore.aco import CandidateGraph, _build_tours, ant_colony  # noqa: E402
+
+
+def test_candidate_graph_stores_k_edges_per_city():
+    table = random_table(50, seed=1)
+    graph = CandidateGraph(table, distance_kernel(table), k=5)
+    assert len(graph.indices) == len(graph.pheromone) == 50 * 5
+    heads, tails = np.array([3, 3]), np.array([graph.indices[3 * 5 + 2], 3])
+    assert graph.edge_positions(heads, tails).tolist() == [3 * 5 + 2, -1]
+
+
+def test_every_ant_visits_every_city_once():
+    table = random_table(60, seed=2)
+    graph = CandidateGraph(table, distance_kernel(table), k=3)  # Few candidates, so ants get stuck
+    xs, ys = np.frombuffer(table.x), np.frombuffer(table.y)
+    tours = _build_tours(graph, xs, ys, [0, 7, 7, 59], np.random.default_rng(0), 1.0, 3.0, 0.5)
+    assert tours[:, 0].tolist() == [0, 7, 7, 59]
+    assert all(sorted(tour) == list(range(60)) for tour in tours.tolist())
+
+
+def test_colony_returns_a_short_closed_tour():
+    table = random_table(150, seed=3)
+    result = ant_colony(table, ants=8, iterations=10)
+    path = result['path']
+    assert path[0] == path[-1] and sorted(path[:-1]) == list(range(150))
+    assert result['iterations'] == 10
+    calculate_distance = distance_kernel(table)
+    assert result['distance'] == pytest.approx(sum(calculate_distance(a, b) for a, b in zip(path, path[1:])))
+    nearest = nearest_neighbor_tour(table, calculate_distance)
+    assert result['distance'] < sum(calculate_distance(a, b) for a, b in zip(nearest, nearest[1:] + nearest[:1]))
+    assert ant_colony(table, ants=8, iterations=10)['path'] == path  # Same seed, same colony
@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip('numpy')
+
+from tspcore import Budget, as_city_table, distance_kernel, lower_bound, neighbor_lists, optimality_gap  # noqa: E402
+from tspcore.bench import random_table  # noqa: E402
+from tspcore.bound import neighbor_bound  # noqa: E402
+from tspcore.exact import held_karp  # noqa: E402
+from tspcore.spatial import GridIndex  # noqa: E402
+
+
+@pytest.mark.parametrize('n', [4, 7, 12, 16])
+def test_lower_bound_at_most_optimum(n):
+    for seed in range(4):
+        table = random_table(n, seed=seed)
+        calculate_distance = distance_kernel(table)
+        optimum = held_karp(table, calculate_distance, workers=1)['distance']
+        for iterations in (0, 20, 200):
+            assert lower_bound(table, calculate_distance, iterations=iterations) <= optimum + 1e-7
+        assert neighbor_bound(neighbor_lists(table, 8), calculate_distance) <= optimum + 1e-7
+
+
+def test_lower_bound_on_collinear_cities():
+    # The optimal tour runs out along the line and back: twice its length
+    table = as_city_table([{'name': str(i), 'x': float(i), 'y': 0.0} for i in range(30)])
+    bound = lower_bound(table, distance_kernel(table))
+    assert 0.95 * 58 <= bound <= 58 + 1e-7
+
+
+def test_grid_within_matches_a_full_scan():
+    table = random_table(400, seed=6)
+    index = GridIndex(table)
+    for city in (0, 57, 399):
+        for radius in (0.0, 30.0, 120.0, 5000.0):
+            found = sorted(other for other, _ in index.within(city, radius))
+            assert found == [other for other in range(400) if other != city and table.distance(city, other) < radius]
+
+
+def test_optimality_gap():
+    assert optimality_gap(110.0, 100.0) == pytest.approx(0.1)
+    assert optimality_gap(5.0, 0.0) == 0.0
+
+
+def test_expired_budget_still_bounds():
+    table = random_table(16, seed=7)
+    calculate_distance = distance_kernel(table)
+    optimum = held_karp(table, calculate_distance, workers=1)['distance']
+    budget = Budget(time_limit_ms=0)
+    assert lower_bound(table, calculate_distance, budget=budget) <= optimum + 1e-7
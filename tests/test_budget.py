@@ -0,0 +1,96 @@
+import contextlib
+import gc
+import io
+import random
+import time
+
+import pytest
+
+from tspcore import Budget, as_city_table, distance_kernel, neighbor_lists
+from tspcore.initial import CONSTRUCTION_METHODS, initial_tour
+
+
+def random_cities(n, seed=1):
+    rng = random.Random(seed)
+    return [{'name': f'C{i}', 'x': rng.random() * 1000, 'y': rng.random() * 1000} for i in range(n)]
+
+
+def test_expired_reads_the_clock_every_check_every_calls():
+    budget = Budget(time_limit_ms=0, check_every=3)
+    assert [budget.expired() for _ in range(6)] == [False, False, True, False, False, True]
+    assert not budget.converged
+
+
+def test_no_limits_never_expire():
+    budget = Budget()
+    assert budget.start() and not budget.expired() and not budget.timed_out()
+    assert budget.end_pass(lambda: []) and budget.converged
+
+
+def test_max_passes_ends_the_stage():
+    budget = Budget(max_passes=2)
+    assert budget.start()
+    assert budget.end_pass(lambda: [])
+    assert not budget.end_pass(lambda: [])
+    assert not budget.converged
+    assert budget.start() and budget.passes == 0  # Every stage gets its own passes
+
+
+def test_stop_ends_this_stage_and_later_ones():
+    budget = Budget(stop=lambda path: len(path) > 2)
+    assert budget.start() and budget.end_pass(lambda: [0, 0])
+    assert not budget.end_pass(lambda: [0, 1, 0])
+    assert budget.stopped and not budget.start() and not budget.converged
+
+
+def test_reserve_brings_the_deadline_forward():
+    budget = Budget(time_limit_ms=60000)
+    budget.reserve(60)
+    assert budget.timed_out() and not budget.converged
+    unlimited = Budget()
+    unlimited.reserve(60)
+    assert not unlimited.timed_out()
+
+
+@pytest.mark.parametrize('method', sorted(set(CONSTRUCTION_METHODS) - {'savings'}))
+def test_constructors_give_up_after_the_deadline(method):
+    table = as_city_table(random_cities(200))
+    _, construct = CONSTRUCTION_METHODS[method]
+    budget = Budget(time_limit_ms=0)
+    assert construct(table, distance_kernel(table, 'direct'), budget=budget) is None
+    assert not budget.converged
+
+
+def test_neighbor_lists_cache_nothing_after_the_deadline():
+    table = as_city_table(random_cities(200))
+    assert neighbor_lists(table, 5, Budget(time_limit_ms=0)) is None
+    assert not table.derived
+    assert len(neighbor_lists(table, 5, Budget(time_limit_ms=60000))) == 200
+
+
+def test_initial_tour_falls_back_to_the_curve_order():
+    table = as_city_table(random_cities(200))
+    _, construct = CONSTRUCTION_METHODS['greedy']
+    path = initial_tour(table, distance_kernel(table, 'direct'), construct, start=7, budget=Budget(time_limit_ms=0))
+    assert path[0] == 7 and sorted(path) == list(range(200))
+
+
+@pytest.mark.parametrize('script', ['traveler.py', 'done/tsp.py'])
+@pytest.mark.parametrize('initial', ['greedy', 'nearest', 'cheapest'])
+def test_solve_stays_within_the_time_limit(load_script, script, initial):
+    # A few thousand cities take several times the limit to solve in full
+    cities, limit_ms = random_cities(8000), 300
+    module = load_script(script)
+    gc.collect()
+    gc.freeze()  # Collections during the solve should not walk everything earlier tests left behind
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = module.solve_tsp(cities, time_limit_ms=limit_ms, initial=initial)
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.unfreeze()
+    assert elapsed < limit_ms / 1000
+    assert not result['converged']
+    path = result['optimized_path']
+    assert path[0] == path[-1] and sorted(path[:-1]) == sorted(city['name'] for city in cities)
@@ -0,0 +1,64 @@
+import pytest
+
+from tspcore import DistanceCache
+from tspcore.cache import ENTRY_BYTES
+
+
+def test_capacity_follows_byte_budget():
+    for policy in ('lru', 'clock'):
+        cache = DistanceCache(max_bytes=10 * ENTRY_BYTES[policy], policy=policy)
+        for key in range(50):
+            cache.put(key, float(key))
+        assert len(cache) == cache.capacity == 10
+        assert cache.stats()['evictions'] == 40
+
+
+def test_lru_evicts_least_recently_used():
+    cache = DistanceCache(max_bytes=3 * ENTRY_BYTES['lru'], policy='lru')
+    for key in (1, 2, 3):
+        cache.put(key, float(key))
+    assert cache.get(1) == 1.0  # 2 is now the oldest
+    cache.put(4, 4.0)
+    assert cache.get(2) is None
+    assert [cache.get(key) for key in (1, 3, 4)] == [1.0, 3.0, 4.0]
+
+
+def test_clock_gives_referenced_entries_a_second_chance():
+    cache = DistanceCache(max_bytes=3 * ENTRY_BYTES['clock'], policy='clock')
+    for key in (1, 2, 3):
+        cache.put(key, float(key))
+    cache.get(1)
+    cache.get(3)
+    cache.put(4, 4.0)  # The hand clears 1's bit and evicts 2, the only unreferenced entry
+    assert cache.get(2) is None
+    assert [cache.get(key) for key in (1, 3, 4)] == [1.0, 3.0, 4.0]
+    cache.put(5, 5.0)
+    assert len(cache) == 3
+
+
+def test_stats_and_clear():
+    cache = DistanceCache()
+    cache.put(7, 0.5)
+    cache.get(7)
+    cache.get(8)
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 0, 'entries': 1, 'hit_rate': 0.5}
+    cache.clear()
+    assert len(cache) == 0 and cache.stats()['hits'] == 0
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        DistanceCache(policy='fifo')
+
+
+@pytest.mark.parametrize('script', ['resolved/Callable.py', 'resolved/Rapido.py', 'resolved/Impossible.py'])
+def test_solver_uses_the_cache_it_is_given(load_script, script):
+    module = load_script(script)
+    cities = module.cities[:12]
+    cache = DistanceCache()
+    result = module.solve_tsp(cities, cache=cache)
+    assert cache.stats()['misses'] > 0
+    assert result['distance_cache'] == cache.stats()
+    assert module.solve_tsp(cities)['distance_cache'] is None
+    with pytest.raises(ValueError):
+        module.solve_tsp(cities, distance_mode='direct', cache=DistanceCache())
@@ -0,0 +1,35 @@
+import pytest
+
+from tspcore import CityTable, distance_kernel
+from tspcore.bench import random_table
+from tspcore.construct import greedy_edge_tour, nearest_neighbor_tour
+from tspcore.initial import CONSTRUCTION_METHODS
+
+
+@pytest.mark.parametrize('method', sorted(CONSTRUCTION_METHODS))
+@pytest.mark.parametrize('n', [1, 2, 3, 4, 9, 150])
+def test_constructor_returns_permutation_from_start(method, n):
+    _, construct = CONSTRUCTION_METHODS[method]
+    table = random_table(n, seed=n)
+    calculate_distance = distance_kernel(table)
+    for start in {0, n // 2, n - 1}:
+        path = construct(table, calculate_distance, start=start)
+        assert sorted(path) == list(range(n))
+        assert path[0] == start
+
+
+def test_greedy_edge_on_a_line_is_optimal():
+    table = CityTable([3.0, 0.0, 7.0, 1.0, 4.0, 9.0], [0.0] * 6)
+    calculate_distance = distance_kernel(table)
+    path = greedy_edge_tour(table, calculate_distance)
+    assert sum(calculate_distance(a, b) for a, b in zip(path, path[1:] + path[:1])) == 18.0
+
+
+def test_greedy_edge_beats_nearest_neighbor():
+    table = random_table(1000, seed=3)
+    calculate_distance = distance_kernel(table)
+
+    def length(path):
+        return sum(calculate_distance(a, b) for a, b in zip(path, path[1:] + path[:1]))
+
+    assert length(greedy_edge_tour(table, calculate_distance)) < length(nearest_neighbor_tour(table, calculate_distance))
@@ -0,0 +1,43 @@
+import itertools
+
+import pytest
+
+from tspcore import CityTable
+
+np = pytest.importorskip('numpy')
+
+from tspcore.sfc import curve_order  # noqa: E402
+
+
+def lattice(side, dims):
+    points = list(itertools.product(range(side), repeat=dims))
+    axes = list(zip(*points))
+    return CityTable(axes[0], axes[1], z=axes[2] if dims == 3 else None)
+
+
+@pytest.mark.parametrize('dims, bits', [(2, 3), (2, 5), (3, 2), (3, 3)])
+def test_hilbert_steps_between_neighboring_cells(dims, bits):
+    table = lattice(1 << bits, dims)
+    order = curve_order(table, 'hilbert', bits=bits).tolist()
+    coordinates = [table.x, table.y] + ([table.z] if dims == 3 else [])
+    for a, b in zip(order, order[1:]):
+        assert sum(abs(axis[a] - axis[b]) for axis in coordinates) == 1
+
+
+def test_dims_2_ignores_z():
+    table = lattice(4, 3)
+    flat = CityTable(table.x, table.y)
+    assert curve_order(table, dims=2).tolist() == curve_order(flat).tolist()
+    with pytest.raises(ValueError):
+        curve_order(flat, dims=3)
+
+
+def test_reordered_table_keeps_names_with_their_cities():
+    table = CityTable([0.0, 5.0, 1.0, 4.0], [0.0, 5.0, 0.0, 5.0], names=['a', 'b', 'c', 'd'])
+    order = curve_order(table).tolist()
+    renumbered = table.reordered(order)
+    assert renumbered.names == [table.names[i] for i in order]
+    assert [renumbered[i]['x'] for i in range(4)] == [table.x[i] for i in order]
+    assert curve_order(renumbered).tolist() == [0, 1, 2, 3]
+    with pytest.raises(ValueError):
+        table.reordered([0, 0, 1, 2])
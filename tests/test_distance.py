@@ -0,0 +1,62 @@
+import math
+from array import array
+
+import pytest
+
+from tspcore import DistanceCache, distance_kernel, matrix_kernel
+from tspcore.bench import random_table
+
+
+def hypot_pairs(table):
+    n = len(table)
+    for i in range(n):
+        for j in range(n):
+            yield i, j, math.hypot(table.x[i] - table.x[j], table.y[i] - table.y[j])
+
+
+@pytest.mark.parametrize('mode', ['direct', 'matrix', 'candidates'])
+def test_kernel_matches_hypot(mode):
+    table = random_table(30, seed=1)
+    calculate_distance = distance_kernel(table, mode)
+    for i, j, expected in hypot_pairs(table):
+        assert calculate_distance(i, j) == pytest.approx(expected)
+
+
+def test_candidates_kernel_caches_only_candidate_edges():
+    table = random_table(20, seed=2)
+    candidates = [[(i + 1) % 20] for i in range(20)]
+    cache = DistanceCache()
+    calculate_distance = distance_kernel(table, 'candidates', cache=cache, candidates=candidates)
+    assert len(cache) == 20
+    for i, j, expected in hypot_pairs(table):
+        assert calculate_distance(i, j) == pytest.approx(expected)
+    assert len(cache) == 20  # Other pairs are computed, not cached
+
+
+def test_candidates_kernel_without_candidates_caches_each_pair_once():
+    table = random_table(10, seed=3)
+    cache = DistanceCache()
+    calculate_distance = distance_kernel(table, 'candidates', cache=cache)
+    calculate_distance(2, 7)
+    calculate_distance(7, 2)
+    assert len(cache) == 1
+    assert cache.stats()['hits'] == 1
+
+
+def test_matrix_kernel_full_and_condensed():
+    table = random_table(12, seed=4)
+    n = len(table)
+    full = array('d', (distance for _, _, distance in hypot_pairs(table)))
+    condensed = array('d', (full[i * n + j] for i in range(n) for j in range(i + 1, n)))
+    for matrix in (full, condensed):
+        calculate_distance = matrix_kernel(matrix, n)
+        for i, j, expected in hypot_pairs(table):
+            assert calculate_distance(i, j) == pytest.approx(expected)
+
+
+def test_kernel_rejects_bad_input():
+    table = random_table(5)
+    with pytest.raises(ValueError):
+        distance_kernel(table, 'memo')
+    with pytest.raises(ValueError):
+        matrix_kernel(array('d', [0.0] * 7), 5)
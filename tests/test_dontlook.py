@@ -0,0 +1,39 @@
+from tspcore import Budget
+from tspcore.dontlook import DontLookBits
+
+
+def test_push_queues_each_city_once():
+    bits = DontLookBits([3, 1, 3, 2], 5)
+    assert len(bits) == 3
+    bits.push([1, 4, 4])
+    assert list(bits.drain()) == [3, 1, 2, 4]
+    assert len(bits) == 0
+
+
+def test_popped_cities_can_be_queued_again():
+    bits = DontLookBits([0, 1], 3)
+    seen = []
+    for city in bits.drain():
+        seen.append(city)
+        if len(seen) < 4:
+            bits.push([city])
+    assert seen == [0, 1, 0, 1, 0]
+
+
+def test_passes_are_counted_and_capped():
+    bits = DontLookBits(range(4), 4)
+    paths = []
+    budget = Budget(max_passes=2, callback=paths.append)
+    popped = []
+    for city in bits.drain(budget, lambda: ['path']):
+        popped.append(city)
+        bits.push([city])  # Never runs dry, so only the pass cap ends it
+    assert popped == [0, 1, 2, 3] * 2
+    assert paths == [['path'], ['path']]
+    assert not budget.converged
+
+
+def test_expired_budget_yields_nothing():
+    budget = Budget(time_limit_ms=0)
+    assert list(DontLookBits(range(4), 4).drain(budget)) == []
+    assert not budget.converged
@@ -0,0 +1,51 @@
+import itertools
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from tspcore import distance_kernel  # noqa: E402
+from tspcore.bench import random_table, tour_length  # noqa: E402
+from tspcore import exact  # noqa: E402
+from tspcore.exact import exact_order, held_karp  # noqa: E402
+
+
+def brute_force(calculate_distance, n):
+    return min(tour_length(calculate_distance, (0,) + order + (0,))
+               for order in itertools.permutations(range(1, n)))
+
+
+@pytest.mark.parametrize('n', range(1, 10))
+def test_held_karp_matches_brute_force(n):
+    for seed in range(2):
+        table = random_table(n, seed=seed)
+        calculate_distance = distance_kernel(table)
+        result = held_karp(table, calculate_distance, workers=1)
+        path = result['path']
+        if n:
+            assert path[0] == path[-1] == 0
+            assert sorted(path[:-1]) == list(range(n))
+        assert result['distance'] == pytest.approx(tour_length(calculate_distance, path))
+        assert result['distance'] == pytest.approx(brute_force(calculate_distance, n) if n > 1 else 0.0)
+
+
+def test_open_path_keeps_its_ends():
+    table = random_table(9, seed=4)
+    calculate_distance = distance_kernel(table)
+    length, middle = exact_order(calculate_distance, 3, [0, 1, 2, 4, 5, 6, 7], 8)
+    assert sorted(middle) == [0, 1, 2, 4, 5, 6, 7]
+    assert length == pytest.approx(tour_length(calculate_distance, [3] + middle + [8]))
+    assert length == pytest.approx(min(tour_length(calculate_distance, (3,) + order + (8,))
+                                       for order in itertools.permutations([0, 1, 2, 4, 5, 6, 7])))
+
+
+def test_pool_workers_fill_the_same_table(monkeypatch):
+    table = random_table(10, seed=5)
+    expected = held_karp(table, workers=1)
+    monkeypatch.setattr(exact, 'PARALLEL_MIN', 20)  # Send the middle layers to the pool
+    assert held_karp(table, workers=2) == expected
+
+
+def test_too_many_cities():
+    with pytest.raises(ValueError):
+        held_karp(random_table(exact.MAX_CITIES + 1))
@@ -0,0 +1,35 @@
+import pytest
+
+from tspcore.bench import random_table
+
+np = pytest.importorskip('numpy')
+
+from tspcore.genetic import _migrate, island_ga, order_crossover  # noqa: E402
+
+
+def test_order_crossover_keeps_a_slice_and_fills_in_the_other_order():
+    first = np.arange(12, dtype=np.int32)
+    second = np.array([5, 11, 0, 7, 2, 9, 4, 1, 10, 3, 8, 6], dtype=np.int32)
+    for seed in range(20):
+        i, j = sorted(np.random.default_rng(seed).integers(13, size=2).tolist())  # The slice OX draws
+        child = order_crossover(first, second, np.random.default_rng(seed)).tolist()
+        assert child[i:j] == first[i:j].tolist()
+        assert child[:i] + child[j:] == [city for city in second.tolist() if not i <= city < j]
+
+
+def test_migration_replaces_the_worst_tour_of_the_next_island():
+    tours = np.array([[[0, 1, 2], [2, 1, 0]], [[1, 0, 2], [0, 2, 1]]], dtype=np.int32)
+    lengths = np.array([[5.0, 9.0], [7.0, 8.0]])
+    _migrate(tours, lengths)
+    assert lengths.tolist() == [[5.0, 7.0], [7.0, 5.0]]
+    assert tours[1, 1].tolist() == [0, 1, 2] and tours[0, 1].tolist() == [1, 0, 2]
+
+
+def test_worker_processes_evolve_the_shared_populations_like_one_process():
+    table = random_table(120, seed=2)
+    local = island_ga(table, islands=2, population=4, generations=4, migration_interval=2, workers=1)
+    pooled = island_ga(table, islands=2, population=4, generations=4, migration_interval=2, workers=2)
+    path = local['path']
+    assert path[0] == path[-1] and sorted(path[:-1]) == list(range(120))
+    assert local['generations'] == pooled['generations'] == 4
+    assert pooled['path'] == path and pooled['distance'] == local['distance']
@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from tspcore import distance_kernel, neighbor_lists
+from tspcore.bench import random_table, tour_length
+from tspcore.improve import IMPROVEMENT_METHODS
+from tspcore.oropt import or_opt_candidates
+
+ENGINES = {name: engine for name, (_, engine) in IMPROVEMENT_METHODS.items()}
+ENGINES['oropt'] = or_opt_candidates
+
+
+@pytest.mark.parametrize('name', sorted(ENGINES))
+@pytest.mark.parametrize('n', [5, 40, 300])
+def test_engine_never_lengthens_tour(name, n):
+    table = random_table(n, seed=n)
+    calculate_distance = distance_kernel(table)
+    neighbors = neighbor_lists(table, 8)
+    order = list(range(n))
+    random.Random(n).shuffle(order)
+    path = order + order[:1]
+    optimized = ENGINES[name](list(path), neighbors, calculate_distance)
+    assert optimized[0] == optimized[-1]
+    assert sorted(optimized[:-1]) == list(range(n))
+    assert tour_length(calculate_distance, optimized) <= tour_length(calculate_distance, path) + 1e-9
+
+
+@pytest.mark.parametrize('name', ['2opt', 'oropt', 'lk'])
+def test_engine_two_level_tour(name):
+    table = random_table(200, seed=3)
+    calculate_distance = distance_kernel(table)
+    neighbors = neighbor_lists(table, 8)
+    path = list(range(200)) + [0]
+    optimized = ENGINES[name](list(path), neighbors, calculate_distance, two_level=True)
+    assert sorted(optimized[:-1]) == list(range(200))
+    assert tour_length(calculate_distance, optimized) <= tour_length(calculate_distance, path) + 1e-9
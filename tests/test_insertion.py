@@ -0,0 +1,41 @@
+import math
+
+import pytest
+
+from tspcore import CityTable, distance_kernel
+from tspcore.bench import random_table
+from tspcore.construct import nearest_neighbor_tour
+from tspcore.insertion import cheapest_insertion_tour, convex_hull, farthest_insertion_tour
+
+
+def test_hull_is_counter_clockwise_without_edge_points():
+    # Corners, a point on the bottom edge and two inside
+    table = CityTable([0, 2, 2, 0, 1, 1, 0.5], [0, 0, 2, 2, 0, 1, 1.5])
+    hull = convex_hull(table)
+    assert hull == [0, 1, 2, 3]
+
+
+def test_hull_of_degenerate_inputs():
+    assert sorted(convex_hull(CityTable([0, 3, 1, 2], [0, 3, 1, 2]))) == [0, 1]
+    assert convex_hull(CityTable([5, 5, 5], [1, 1, 1])) == [0]
+
+
+@pytest.mark.parametrize('construct', [cheapest_insertion_tour, farthest_insertion_tour])
+def test_cities_on_a_circle_come_back_in_circle_order(construct):
+    n = 24
+    angles = [(7 * i % n) * 2 * math.pi / n for i in range(n)]  # Shuffled around the circle
+    table = CityTable([math.cos(a) for a in angles], [math.sin(a) for a in angles])
+    path = construct(table, distance_kernel(table), start=5)
+    steps = {(7 * b - 7 * a) % n for a, b in zip(path, path[1:] + path[:1])}
+    assert path[0] == 5 and steps in ({1}, {n - 1})
+
+
+@pytest.mark.parametrize('construct', [cheapest_insertion_tour, farthest_insertion_tour])
+def test_insertion_beats_nearest_neighbor(construct):
+    table = random_table(1000, seed=3)
+    calculate_distance = distance_kernel(table)
+
+    def length(path):
+        return sum(calculate_distance(a, b) for a, b in zip(path, path[1:] + path[:1]))
+
+    assert length(construct(table, calculate_distance)) < length(nearest_neighbor_tour(table, calculate_distance))
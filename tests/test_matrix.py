@@ -0,0 +1,47 @@
+import math
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from tspcore import matrix_kernel  # noqa: E402
+from tspcore.bench import random_table  # noqa: E402
+from tspcore.matrix import build_distance_matrix, condensed_size, load_distance_matrix  # noqa: E402
+
+
+def expected_matrix(table):
+    n = len(table)
+    return np.array([[math.hypot(table.x[i] - table.x[j], table.y[i] - table.y[j]) for j in range(n)]
+                     for i in range(n)])
+
+
+@pytest.mark.parametrize('block_bytes', [1, 1000, 64 * 1024 * 1024])
+def test_blocks_match_full_matrix(block_bytes):
+    table = random_table(37, seed=5)
+    expected = expected_matrix(table)
+    full = build_distance_matrix(table, block_bytes=block_bytes)
+    assert np.allclose(full, expected)
+    condensed = build_distance_matrix(table, condensed=True, block_bytes=block_bytes)
+    assert len(condensed) == condensed_size(37)
+    assert np.allclose(condensed, expected[np.triu_indices(37, 1)])
+
+
+def test_float32_and_kernel_lookups():
+    table = random_table(20, seed=6)
+    expected = expected_matrix(table)
+    for condensed in (False, True):
+        matrix = build_distance_matrix(table, dtype='float32', condensed=condensed)
+        assert matrix.dtype == np.float32
+        calculate_distance = matrix_kernel(matrix, 20)
+        for i in range(20):
+            for j in range(20):
+                assert calculate_distance(i, j) == pytest.approx(expected[i, j], rel=1e-6)
+
+
+def test_memmap_round_trip(tmp_path):
+    table = random_table(15, seed=7)
+    path = str(tmp_path / 'distances.bin')
+    built = build_distance_matrix(table, condensed=True, path=path)
+    loaded = load_distance_matrix(path, 15, condensed=True)
+    assert np.array_equal(built, loaded)
+    assert not loaded.flags.writeable
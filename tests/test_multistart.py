@@ -0,0 +1,31 @@
+import random
+
+import pytest
+
+from tspcore.multistart import multi_start
+
+
+def random_cities(n, seed=1):
+    rng = random.Random(seed)
+    return [{'name': f'C{i}', 'x': rng.random() * 100, 'y': rng.random() * 100} for i in range(n)]
+
+
+def test_best_run_is_kept():
+    result = multi_start(random_cities(300), starts=[0, 5, 17, 42], workers=1)
+    assert sorted(start for start, _ in result['runs']) == [0, 5, 17, 42]
+    assert result['distance'] == min(distance for _, distance in result['runs'])
+    path = result['path']
+    assert path[0] == path[-1] == result['start'] and sorted(path[:-1]) == list(range(300))
+
+
+def test_worker_processes_match_in_process_runs():
+    cities = random_cities(300)
+    local = multi_start(cities, num_starts=4, workers=1)
+    pooled = multi_start(cities, num_starts=4, workers=2)
+    assert pooled['runs'] == local['runs']
+    assert pooled['path'] == local['path']
+
+
+def test_unknown_method_fails_before_any_work():
+    with pytest.raises(ValueError):
+        multi_start(random_cities(10), workers=1, method='nope')
@@ -0,0 +1,48 @@
+import random
+from array import array
+
+from tspcore import as_city_table
+from tspcore.partition import grid_blocks, solve_partitioned
+from tspcore.shared import attach_arrays, share_arrays
+
+
+def random_cities(n, seed=1):
+    rng = random.Random(seed)
+    return [{'name': f'C{i}', 'x': rng.random() * 100, 'y': rng.random() * 100} for i in range(n)]
+
+
+def test_shared_arrays_round_trip():
+    columns = [array('d', [1.5, -2.0, 3.25]), array('i', [7, 8]), array('d')]
+    shm, layout = share_arrays(columns)
+    try:
+        assert attach_arrays(shm.name, layout) == columns
+        assert all(offset % 8 == 0 for _, offset, _ in layout)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_grid_blocks_cover_every_city_once():
+    table = as_city_table(random_cities(1000))
+    order, bounds = grid_blocks(table, cluster_size=100)
+    assert sorted(order) == list(range(1000))
+    assert bounds[0][0] == 0 and bounds[-1][1] == 1000
+    assert all(stop == start for (_, stop), (start, _) in zip(bounds, bounds[1:]))
+    assert all(50 <= stop - start <= 150 for start, stop in bounds)
+
+
+def test_partitioned_tour_is_valid_and_stitched():
+    cities = random_cities(1200)
+    result = solve_partitioned(cities, cluster_size=300, workers=1)
+    path = result['path']
+    assert result['clusters'] > 1 and result['boundary'] > 0
+    assert path[0] == path[-1] and sorted(path[:-1]) == list(range(1200))
+    table = as_city_table(cities)
+    assert abs(result['distance'] - sum(table.distance(a, b) for a, b in zip(path, path[1:]))) < 1e-6
+
+
+def test_worker_processes_match_in_process_blocks():
+    cities = random_cities(1200)
+    local = solve_partitioned(cities, cluster_size=300, workers=1)
+    pooled = solve_partitioned(cities, cluster_size=300, workers=2)
+    assert pooled['path'] == local['path']
@@ -0,0 +1,26 @@
+import pytest
+
+from tspcore import CityTable, distance_kernel
+from tspcore.bench import random_table
+from tspcore.construct import nearest_neighbor_tour
+
+pytest.importorskip('numpy')
+
+from tspcore.savings import savings_hub, savings_tour  # noqa: E402
+
+
+def test_hub_is_the_city_nearest_the_centroid():
+    table = CityTable([0, 10, 10, 0, 4], [0, 0, 10, 10, 6])
+    assert savings_hub(table) == 4
+
+
+def test_savings_beats_nearest_neighbor():
+    table = random_table(1000, seed=3)
+    calculate_distance = distance_kernel(table)
+
+    def length(path):
+        return sum(calculate_distance(a, b) for a, b in zip(path, path[1:] + path[:1]))
+
+    path = savings_tour(table, calculate_distance, start=17)
+    assert path[0] == 17 and sorted(path) == list(range(1000))
+    assert length(path) < length(nearest_neighbor_tour(table, calculate_distance))
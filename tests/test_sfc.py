@@ -0,0 +1,66 @@
+import random
+import sys
+
+import pytest
+
+from tspcore import CityTable, curve_path
+from tspcore.curve import pure_curve_path
+
+np = pytest.importorskip('numpy')
+
+from tspcore.sfc import curve_order, grid_coordinates, morton_keys  # noqa: E402
+
+
+def interleave(coordinates):
+    """Reference Morton key: bit b of axis i goes to bit b * len(coordinates) + i."""
+    key = 0
+    for bit in range(64 // len(coordinates)):
+        for axis, value in enumerate(coordinates):
+            key |= ((value >> bit) & 1) << (bit * len(coordinates) + axis)
+    return key
+
+
+def random_cities(n, seed, scale=1.0, offset=0.0, z=False):
+    rng = random.Random(seed)
+    coordinate = lambda: offset + rng.random() * scale  # noqa: E731
+    zs = [coordinate() for _ in range(n)] if z else None
+    return CityTable([coordinate() for _ in range(n)], [coordinate() for _ in range(n)], z=zs)
+
+
+@pytest.mark.parametrize('z', [False, True])
+def test_morton_keys_interleave_grid_bits(z):
+    table = random_cities(200, seed=1, z=z)
+    grid = grid_coordinates(table, 32 if not z else 21, 3 if z else 2)
+    keys = morton_keys(table)
+    assert keys.dtype == np.uint64
+    for city in range(len(table)):
+        assert int(keys[city]) == interleave([int(axis[city]) for axis in grid])
+
+
+@pytest.mark.parametrize('scale, offset', [(1.0, 0.0), (1e9, -5e8), (1e-6, 40.0), (360.0, -180.0)])
+def test_morton_order_does_not_alias_any_coordinate_range(scale, offset):
+    # Cities on the diagonal: a correct Morton order is the order along it
+    steps = sorted(random.Random(2).random() for _ in range(500))
+    table = CityTable([offset + scale * s for s in steps], [offset + scale * s for s in steps])
+    assert curve_order(table, 'morton').tolist() == list(range(500))
+
+
+@pytest.mark.parametrize('curve', ['morton', 'hilbert'])
+@pytest.mark.parametrize('z', [False, True])
+def test_pure_python_order_matches_numpy(curve, z):
+    for seed, scale, offset in ((3, 1.0, 0.0), (4, 1e7, -3e6), (5, 1e-3, 12.0)):
+        table = random_cities(300, seed, scale, offset, z)
+        assert pure_curve_path(table, curve) == curve_order(table, curve).tolist()
+
+
+def test_curve_path_without_numpy(monkeypatch):
+    table = random_cities(100, seed=6)
+    expected = curve_order(table, 'morton').tolist()
+    monkeypatch.setitem(sys.modules, 'tspcore.sfc', None)  # Import fails as if NumPy were missing
+    assert curve_path(table, 'morton') == expected
+
+
+def test_qprx_morton_order_sorts_by_key(load_script):
+    qprx = load_script('instant/QRPx2025.py').QPRx2025()
+    cities = [{'name': f'City{i}', 'x': x, 'y': y} for i, (x, y) in enumerate([(3, 3), (0, 0), (3, 0), (0, 3)])]
+    assert [city['name'] for city in qprx.morton_order(cities)] == ['City1', 'City2', 'City3', 'City0']
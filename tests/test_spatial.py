@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from tspcore import CityTable, GridIndex, distance_kernel, nearest_neighbor_tour
+
+
+def full_scan_tour(n, calculate_distance, start):
+    """The nearest neighbor scan GridIndex replaced: every remaining city, ties to the lowest index."""
+    path, unvisited = [start], set(range(n)) - {start}
+    while unvisited:
+        current = min(sorted(unvisited), key=lambda city: calculate_distance(path[-1], city))
+        unvisited.discard(current)
+        path.append(current)
+    return path
+
+
+def tables():
+    rng = random.Random(8)
+    yield CityTable([rng.random() * 1000 for _ in range(300)], [rng.random() * 1000 for _ in range(300)])
+    # Duplicate-heavy: many exact ties and coincident cities
+    yield CityTable([rng.randrange(6) for _ in range(200)], [rng.randrange(6) for _ in range(200)])
+    yield CityTable([float(i % 17) for i in range(120)], [0.0] * 120)  # Collinear
+    yield CityTable([float(i % 12) for i in range(144)], [float(i // 12) for i in range(144)])  # Lattice
+    yield CityTable([5.0], [5.0])
+
+
+@pytest.mark.parametrize('table', list(tables()))
+def test_nearest_neighbor_tour_matches_full_scan(table):
+    calculate_distance = distance_kernel(table)
+    n = len(table)
+    for start in {0, n // 3, n - 1}:
+        assert nearest_neighbor_tour(table, calculate_distance, start) == full_scan_tour(n, calculate_distance, start)
+
+
+def test_nearest_after_removals_and_additions():
+    table = list(tables())[0]
+    calculate_distance = distance_kernel(table)
+    index = GridIndex(table, calculate_distance=calculate_distance)
+    remaining = set(range(len(table)))
+    rng = random.Random(9)
+    for step in range(400):
+        city = rng.randrange(len(table))
+        if city in remaining and len(remaining) > 1:
+            index.remove(city)
+            remaining.discard(city)
+        elif city not in remaining:
+            index.add(city)
+            remaining.add(city)
+        query = rng.randrange(len(table))
+        expected = min(sorted(remaining), key=lambda other: calculate_distance(query, other))
+        assert index.nearest(query) == (expected, calculate_distance(query, expected))
+        assert len(index) == len(remaining)
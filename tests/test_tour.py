@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from tspcore import Tour, TwoLevelTour
+
+
+class ListTour:
+    """Reference cyclic tour on a plain list, reversing segments by slicing."""
+
+    def __init__(self, order):
+        self.order = list(order)
+
+    def _forward(self, a, b):
+        n, i = len(self.order), self.order.index(a)
+        positions = [i]
+        while self.order[positions[-1]] != b:
+            positions.append((positions[-1] + 1) % n)
+        return positions
+
+    def next(self, city):
+        return self.order[(self.order.index(city) + 1) % len(self.order)]
+
+    def prev(self, city):
+        return self.order[self.order.index(city) - 1]
+
+    def between(self, a, b, c):
+        return b in [self.order[i] for i in self._forward(a, c)]
+
+    def reverse(self, a, b):
+        positions = self._forward(a, b)
+        cities = [self.order[i] for i in positions]
+        for i, city in zip(positions, reversed(cities)):
+            self.order[i] = city
+
+
+@pytest.mark.parametrize('tour_class', [Tour, TwoLevelTour])
+@pytest.mark.parametrize('n', [5, 12, 57])
+def test_tour_matches_list(tour_class, n):
+    rng = random.Random(n)
+    order = list(range(n))
+    rng.shuffle(order)
+    tour, expected = tour_class(order), ListTour(order)
+    for _ in range(300):
+        a, b, c = (rng.randrange(n) for _ in range(3))
+        if a != b:
+            tour.reverse(a, b)
+            expected.reverse(a, b)
+        for city in range(n):
+            assert tour.next(city) == expected.next(city)
+            assert tour.prev(city) == expected.prev(city)
+        assert tour.between(a, b, c) == expected.between(a, b, c)
+    path = tour.path(order[0])
+    assert path[0] == path[-1] == order[0]
+    assert sorted(path[:-1]) == list(range(n))
@@ -0,0 +1,41 @@
+import pytest
+
+from tspcore import Budget, distance_kernel
+from tspcore.bench import random_table, tour_length
+
+pytest.importorskip('numpy')
+
+from tspcore.window import window_optimize  # noqa: E402
+
+
+def scrambled_tour(n, seed):
+    """A closed tour along x with neighbouring pairs swapped: plenty of local defects."""
+    table = random_table(n, seed=seed, height=50.0)
+    path = sorted(range(n), key=table.x.__getitem__)
+    for i in range(1, n - 2, 3):
+        path[i], path[i + 1] = path[i + 1], path[i]
+    return table, path + path[:1]
+
+
+def test_windows_shorten_the_tour_and_keep_its_start():
+    table, path = scrambled_tour(200, seed=1)
+    calculate_distance = distance_kernel(table)
+    before = tour_length(calculate_distance, path)
+    optimized = window_optimize(list(path), calculate_distance, window=8)
+    assert optimized[0] == optimized[-1] == path[0]
+    assert sorted(optimized[:-1]) == list(range(200))
+    assert tour_length(calculate_distance, optimized) < before
+
+
+def test_pool_workers_give_the_same_tour():
+    table, path = scrambled_tour(200, seed=2)
+    calculate_distance = distance_kernel(table)
+    local = window_optimize(list(path), calculate_distance, window=8)
+    assert window_optimize(list(path), calculate_distance, window=8, table=table, workers=2) == local
+
+
+def test_expired_budget_leaves_the_tour_alone():
+    table, path = scrambled_tour(100, seed=3)
+    budget = Budget(time_limit_ms=0)
+    assert window_optimize(list(path), distance_kernel(table), window=8, budget=budget) == path
+    assert not budget.converged
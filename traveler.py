@@ -1,16 +1,51 @@
-import math
 import time
 
-def solve_tsp(cities):
-    # Memoized dictionary to store distances for efficiency
-    memoized_distances = {}
-
-    def calculate_distance(city1, city2):
-        """Calculate the Euclidean distance between two cities, memoized for efficiency."""
-        key = frozenset((city1['name'], city2['name']))
-        if key not in memoized_distances:
-            memoized_distances[key] = math.hypot(city1['x'] - city2['x'], city1['y'] - city2['y'])
-        return memoized_distances[key]
+from tspcore import Budget, as_city_table, distance_kernel, lower_bound, neighbor_lists, optimality_gap
+from tspcore.bound import BOUND_ITERATIONS
+from tspcore.budget import WRAP_UP_FACTOR
+from tspcore.improve import improvement_engine
+from tspcore.initial import construction_method, initial_tour
+from tspcore.oropt import or_opt_candidates
+
+def solve_tsp(cities, distance_mode='direct', candidate_k=8, method='2opt',
+              time_limit_ms=None, max_passes=None, callback=None, initial='greedy',
+              bound_iterations=None, target_gap=None):
+    """Solve with greedy edge (or nearest neighbor) + 2-opt; `cities` is a CityTable or a list of city dicts.
+
+    distance_mode picks the distance kernel: 'direct', 'matrix' or 'candidates'.
+    candidate_k is how many nearest neighbors per city 2-opt tries as new edges.
+    method picks the main improvement stage: '2opt', 'lk' (Lin-Kernighan style moves) or
+    'anneal' (simulated annealing, needs NumPy).
+    time_limit_ms caps the whole solve and max_passes each improvement stage (anytime mode):
+    the best tour so far is returned and result['converged'] says whether every stage ran
+    to completion. Construction and neighbor lists watch the deadline too; if it passes
+    while constructing, the tour starts from the Hilbert curve order instead.
+    callback(path, distance) receives the intermediate tour after each improvement pass.
+    initial picks the starting tour: 'greedy' (greedy edge over the candidate lists),
+    'nearest' (nearest neighbor), 'cheapest' or 'farthest' (convex hull + insertion) or
+    'savings' (Clarke-Wright, needs NumPy).
+    bound_iterations=k adds result['lower_bound'], a 1-tree / Held-Karp lower bound on the
+    optimal length after k subgradient steps, and result['gap'], the fraction the tour can
+    be above optimal (off by default: on large inputs it can cost more than the solve).
+    target_gap stops improving once the gap is that small, turning the bound on if needed.
+    """
+    if target_gap is not None and bound_iterations is None:
+        bound_iterations = BOUND_ITERATIONS
+
+    # Deadline for the whole solve and pass limit for the improvement stages; the clock starts now
+    budget = Budget(
+        time_limit_ms, max_passes,
+        callback=None if callback is None else lambda path: callback(table.path_names(path), total_distance(path)),
+    )
+
+    table = as_city_table(cities)
+    # Keep back time for the O(n) wrap-up, in proportion to reading the cities
+    budget.reserve(WRAP_UP_FACTOR * budget.elapsed())
+    stage_name, improve = improvement_engine(method)
+    _, construct = construction_method(initial)
+
+    # Integer-indexed distance function for this table
+    calculate_distance = distance_kernel(table, distance_mode)
 
     def total_distance(path):
         """Calculate total travel distance for the given path."""
@@ -18,27 +53,10 @@ def solve_tsp(cities):
             calculate_distance(path[i], path[(i + 1) % len(path)]) for i in range(len(path))
         )
 
-    def tsp_nearest_neighbor(cities):
-        """Find a quick solution using the nearest neighbor heuristic."""
-        unvisited = set(city['name'] for city in cities)
-        path = [cities[0]]
-        current_city = cities[0]
-
-        while unvisited:
-            unvisited.discard(current_city['name'])
-            closest, closest_distance = None, float('inf')
-
-            for city in cities:
-                if city['name'] in unvisited:
-                    dist = calculate_distance(current_city, city)
-                    if dist < closest_distance:
-                        closest_distance, closest = dist, city
-
-            if closest is None:
-                break
-
-            path.append(closest)
-            current_city = closest
+    def tsp_initial_solution(num_cities):
+        """Find a quick solution with the `initial` constructor (greedy edge by default)."""
+        # Both constructors use a spatial grid rather than scanning every city per step
+        path = initial_tour(table, calculate_distance, construct, budget=budget)
 
         # Ensure path returns to start to form a complete tour
         path.append(path[0])
@@ -46,51 +64,70 @@ def solve_tsp(cities):
         return {'path': path, 'distance': distance}
 
     def two_opt(path):
-        """Optimize the path using the 2-opt algorithm for a near-optimal solution."""
-        improvement_threshold = 1e-6
-        improved = True
-
-        while improved:
-            improved = False
-            for i in range(1, len(path) - 2):
-                for j in range(i + 1, len(path) - 1):
-                    before_swap = (
-                        calculate_distance(path[i - 1], path[i]) +
-                        calculate_distance(path[j], path[(j + 1) % len(path)])
-                    )
-                    after_swap = (
-                        calculate_distance(path[i - 1], path[j]) +
-                        calculate_distance(path[i], path[(j + 1) % len(path)])
-                    )
-
-                    if after_swap + improvement_threshold < before_swap:
-                        path[i:j + 1] = reversed(path[i:j + 1])
-                        improved = True
+        """Optimize the path using the 2-opt algorithm (or Lin-Kernighan moves) for a near-optimal solution."""
+        # Neighbor-list engine: O(1) gain per move, don't-look bits, shorter-side reversal
+        path[:] = improve(path, neighbors, calculate_distance, budget=budget)
 
         # Ensure the path ends by returning to the starting point
         if path[-1] != path[0]:
             path.append(path[0])  # Close the loop by returning to the start
         return path
 
-    # Measure time for initial solution using nearest neighbor heuristic
+    def or_opt(path):
+        """Relocate segments of 1-3 cities (reversed or not) that 2-opt left out of place."""
+        path[:] = or_opt_candidates(path, neighbors, calculate_distance, budget=budget)
+        return path
+
+    # Improvement pipeline: each stage starts from the tour the previous one left
+    stages = []
+
+    def run_stage(name, improve, path):
+        """Run one improvement stage and record its time and the distance it saved."""
+        before = total_distance(path)
+        start = time.time()
+        path = improve(path)
+        elapsed = time.time() - start
+        stages.append({'name': name, 'time': elapsed, 'gain': before - total_distance(path)})
+        return path
+
+    # Measure time for the initial solution
     start_initial = time.time()
-    initial_solution = tsp_nearest_neighbor(cities)
+    initial_solution = tsp_initial_solution(len(table))
     end_initial = time.time()
     initial_path, initial_distance = initial_solution['path'], initial_solution['distance']
     initial_time = end_initial - start_initial
 
-    # Measure time for optimizing the path using 2-opt
+    # Candidate lists for the bound and the improvement stages; None if the deadline passes first
+    neighbors = neighbor_lists(table, candidate_k, budget)
+
+    # Lower bound on the optimum, the initial tour serving as upper bound for the ascent,
+    # which stops at the solve's deadline; skipped once that has passed
+    bound = bound_time = None
+    if bound_iterations is not None and neighbors is not None and not budget.timed_out():
+        start_bound = time.time()
+        bound = lower_bound(table, calculate_distance, neighbors, initial_path,
+                            iterations=bound_iterations, budget=budget)
+        bound_time = time.time() - start_bound
+        if target_gap is not None:
+            budget.stop = lambda path: optimality_gap(total_distance(path), bound) <= target_gap
+            budget.stopped = budget.stop(initial_path)  # The initial tour may already be close enough
+
+    # Measure time for optimizing the path using 2-opt (or LK), then Or-opt; both are skipped
+    # when the deadline has passed (or passed while building the neighbor lists)
     start_optimized = time.time()
-    optimized_path = two_opt(initial_path)
-    optimized_distance = total_distance(optimized_path)
+    optimized_path, optimized_distance = initial_path, initial_distance
+    if neighbors is not None and not budget.timed_out():
+        optimized_path = run_stage(stage_name, two_opt, optimized_path)
+        optimized_path = run_stage('Or-opt', or_opt, optimized_path)
+        optimized_distance = total_distance(optimized_path)
     end_optimized = time.time()
     optimized_time = end_optimized - start_optimized
 
     # Validation checks
-    def validate_path(path, cities):
+    def validate_path(path, table):
         """Ensure each city is visited exactly once and that the path returns to the origin."""
-        unique_cities = {city['name'] for city in path}
-        all_cities = {city['name'] for city in cities}
+        unique_cities = set(path)
+        all_cities = set(range(len(table)))
         
         # Check if all cities are visited and path returns to the start
         is_valid_path = unique_cities == all_cities and path[0] == path[-1]
@@ -99,7 +136,7 @@ def solve_tsp(cities):
         return is_valid_path
 
     # Run validations
-    if validate_path(optimized_path, cities):
+    if validate_path(optimized_path, table):
         print("Path validation successful: Each city is visited once, and path returns to origin.")
     else:
         print("Path validation failed.")
@@ -107,16 +144,26 @@ def solve_tsp(cities):
     # Output details for comparison
     print("Initial Distance:", initial_distance)
     print("Optimized Distance:", optimized_distance)
+    if bound is not None:
+        print("Lower Bound:", bound, "Gap:", optimality_gap(optimized_distance, bound))
     print("Initial Solution Time (seconds):", initial_time)
     print("Optimization Time (seconds):", optimized_time)
+    print("Converged:", budget.converged)
+    for stage in stages:
+        print(f"{stage['name']} Gain:", stage['gain'], f"{stage['name']} Time (seconds):", stage['time'])
 
     return {
-        'initial_path': [city['name'] for city in initial_path],
-        'optimized_path': [city['name'] for city in optimized_path],
+        'initial_path': table.path_names(initial_path),
+        'optimized_path': table.path_names(optimized_path),
         'initial_distance': initial_distance,
         'optimized_distance': optimized_distance,
         'initial_time': initial_time,
-        'optimized_time': optimized_time
+        'optimized_time': optimized_time,
+        'lower_bound': bound,
+        'gap': None if bound is None else optimality_gap(optimized_distance, bound),
+        'bound_time': bound_time,
+        'stages': stages,
+        'converged': budget.converged
     }
 
 cities = [
@@ -172,14 +219,15 @@ cities = [
     {'name': 'City49', 'x': 490, 'y': 15}
 ]
 
-# Run the function and print results
-result = solve_tsp(cities)
-print("Initial Path:", result['initial_path'])
-print("Optimized Path:", result['optimized_path'])
-print("Initial Distance:", result['initial_distance'])
-print("Optimized Distance:", result['optimized_distance'])
-print("Initial Solution Time (seconds):", result['initial_time'])
-print("Optimization Time (seconds):", result['optimized_time'])
+if __name__ == '__main__':
+    # Run the function and print results
+    result = solve_tsp(cities)
+    print("Initial Path:", result['initial_path'])
+    print("Optimized Path:", result['optimized_path'])
+    print("Initial Distance:", result['initial_distance'])
+    print("Optimized Distance:", result['optimized_distance'])
+    print("Initial Solution Time (seconds):", result['initial_time'])
+    print("Optimization Time (seconds):", result['optimized_time'])
 
 # Results Equal
 # Path validation successful: Each city is visited once, and path returns to origin.
@@ -0,0 +1,40 @@
+"""Shared building blocks for the solve_tsp scripts in this repository.
+
+Modules that need NumPy (tspcore.matrix, ...) are imported directly rather than re-exported here.
+"""
+
+from .bound import lower_bound, optimality_gap
+from .budget import Budget
+from .cache import CACHE_POLICIES, DistanceCache
+from .candidates import neighbor_lists
+from .citytable import CityTable, as_city_table
+from .construct import greedy_edge_tour, nearest_neighbor_tour
+from .curve import curve_path
+from .distance import DISTANCE_MODES, distance_kernel, matrix_kernel
+from .insertion import cheapest_insertion_tour, convex_hull, farthest_insertion_tour
+from .spatial import GridIndex
+from .tour import Tour, TwoLevelTour, make_tour
+
+__all__ = [
+    'Budget',
+    'CACHE_POLICIES',
+    'CityTable',
+    'DISTANCE_MODES',
+    'DistanceCache',
+    'GridIndex',
+    'Tour',
+    'TwoLevelTour',
+    'as_city_table',
+    'cheapest_insertion_tour',
+    'convex_hull',
+    'curve_path',
+    'distance_kernel',
+    'farthest_insertion_tour',
+    'greedy_edge_tour',
+    'lower_bound',
+    'make_tour',
+    'matrix_kernel',
+    'nearest_neighbor_tour',
+    'neighbor_lists',
+    'optimality_gap',
+]
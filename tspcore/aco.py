@@ -0,0 +1,154 @@
+import time
+
+import numpy as np
+
+from .budget import Budget
+from .candidates import DEFAULT_K, neighbor_lists
+from .citytable import as_city_table
+from .distance import distance_kernel
+from .twoopt import two_opt_candidates
+
+# Ants built side by side in one batch of array operations
+ANTS = 16
+# Weight of pheromone (alpha) and of closeness, 1 / distance (beta), in the move rule
+ALPHA = 1.0
+BETA = 3.0
+# Chance an ant takes the best-weighted candidate outright instead of sampling (ACS rule)
+EXPLOIT = 0.9
+# Pheromone evaporated per iteration
+EVAPORATION = 0.1
+
+
+class CandidateGraph:
+    """Pheromone and closeness on the K-nearest-neighbor edges only, in CSR form.
+
+    Row `city` of the sparse n x n matrix is indices[indptr[city]:indptr[city + 1]], the
+    city's candidate list, and `pheromone` / `closeness` hold one value per stored edge,
+    so memory is O(n k) rather than the n^2 of a dense pheromone matrix. Every row has
+    the same length k, which lets a batch of ants read their rows as one (ants, k) gather.
+    """
+
+    def __init__(self, table, calculate_distance, k=DEFAULT_K):
+        rows = neighbor_lists(table, k)
+        n = len(table)
+        self.k = len(rows[0]) if n else 0
+        self.indptr = np.arange(n + 1, dtype=np.int64) * self.k
+        self.indices = np.array(rows, dtype=np.int64).reshape(-1)
+        heads = np.repeat(np.arange(n), self.k)
+        lengths = np.fromiter(map(calculate_distance, heads.tolist(), self.indices.tolist()),
+                              dtype=np.float64, count=len(self.indices))
+        self.closeness = 1.0 / np.maximum(lengths, 1e-12)
+        self.pheromone = np.ones(len(self.indices))
+
+    def rows(self, cities):
+        """(cities, k) matrix of edge positions: the stored edges leaving each city."""
+        return self.indptr[cities][:, None] + np.arange(self.k)
+
+    def edge_positions(self, heads, tails):
+        """Stored position of each edge (heads[i], tails[i]), or -1 where it is not a candidate."""
+        rows = self.rows(heads)
+        match = self.indices[rows] == tails[:, None]
+        return np.where(match.any(axis=1), rows[np.arange(len(heads)), match.argmax(axis=1)], -1)
+
+
+def _build_tours(graph, xs, ys, starts, rng, alpha, beta, exploit):
+    """Walk len(starts) ants through every city at once; returns an (ants, n) int32 tour matrix.
+
+    Each step an ant picks among its current city's unvisited candidates, weighted by
+    pheromone^alpha * closeness^beta: the heaviest with probability `exploit`, otherwise
+    by roulette. An ant whose candidates are all visited goes to the nearest unvisited
+    city among its candidates' candidates, or failing that among all cities.
+    """
+    ants, n = len(starts), len(xs)
+    weights = graph.pheromone ** alpha * graph.closeness ** beta
+    visited = np.zeros((ants, n), dtype=bool)
+    tours = np.empty((ants, n), dtype=np.int32)
+    every = np.arange(ants)
+    current = np.asarray(starts, dtype=np.int64)
+    visited[every, current] = True
+    tours[:, 0] = current
+    for step in range(1, n):
+        rows = graph.rows(current)
+        candidates = graph.indices[rows]
+        weight = np.where(visited[every[:, None], candidates], 0.0, weights[rows])
+        total = weight.sum(axis=1)
+        roulette = (weight.cumsum(axis=1) >= (rng.random(ants) * total)[:, None]).argmax(axis=1)
+        pick = np.where(rng.random(ants) < exploit, weight.argmax(axis=1), roulette)
+        following = candidates[every, pick]
+        stuck = np.flatnonzero(total <= 0)
+        if len(stuck):
+            # All candidates visited: try the candidates of the candidates, then a full scan
+            near = graph.indices[graph.rows(candidates[stuck].reshape(-1)).reshape(len(stuck), -1)]
+            gap = np.hypot(xs[near] - xs[current[stuck], None], ys[near] - ys[current[stuck], None])
+            gap[visited[stuck[:, None], near]] = np.inf
+            following[stuck] = near[np.arange(len(stuck)), gap.argmin(axis=1)]
+            far = stuck[np.isinf(gap.min(axis=1))]
+            if len(far):
+                gap = np.hypot(xs[None, :] - xs[current[far], None], ys[None, :] - ys[current[far], None])
+                gap[visited[far]] = np.inf
+                following[far] = gap.argmin(axis=1)
+        current = following
+        visited[every, current] = True
+        tours[:, step] = current
+    return tours
+
+
+def ant_colony(cities, ants=ANTS, iterations=50, candidate_k=DEFAULT_K, alpha=ALPHA, beta=BETA, exploit=EXPLOIT,
+               evaporation=EVAPORATION, local_search=True, seed=0, time_limit_ms=None, calculate_distance=None):
+    """Max-min ant system over the candidate graph; returns {'path', 'distance', 'iterations', 'seconds'}.
+
+    Each iteration builds `ants` tours together (see _build_tours), takes the shortest to
+    a 2-opt local optimum when local_search is on, evaporates all pheromone and deposits
+    1 / length on the edges of the best tour so far, both directions. Pheromone is kept
+    between 1 / (n * best length) and 1 / best length so no edge dies out. Memory stays
+    O(n k + ants * n) however many cities there are. calculate_distance defaults to the
+    direct distance_kernel of the table. time_limit_ms stops after the current iteration.
+    """
+    table = as_city_table(cities)
+    n = len(table)
+    calculate_distance = calculate_distance or distance_kernel(table)
+    started = time.perf_counter()
+    if n < 4:
+        path = list(range(n)) + [0] * bool(n)
+        distance = sum(calculate_distance(path[i], path[i + 1]) for i in range(len(path) - 1))
+        return {'path': path, 'distance': distance, 'iterations': 0, 'seconds': 0.0}
+    budget = Budget(time_limit_ms, check_every=1)
+    rng = np.random.default_rng(seed)
+    xs = np.frombuffer(table.x, dtype=np.float64)
+    ys = np.frombuffer(table.y, dtype=np.float64)
+    graph = CandidateGraph(table, calculate_distance, candidate_k)
+    neighbors = neighbor_lists(table, candidate_k)
+
+    def length(tour):
+        return float(np.fromiter(map(calculate_distance, tour.tolist(), np.roll(tour, -1).tolist()),
+                                 dtype=np.float64, count=len(tour)).sum())
+
+    best, best_length = None, np.inf
+    done = 0
+    while done < iterations and not budget.expired():
+        tours = _build_tours(graph, xs, ys, rng.integers(n, size=ants), rng, alpha, beta, exploit)
+        lengths = [length(tour) for tour in tours]
+        tour = tours[int(np.argmin(lengths))]
+        if local_search:
+            path = two_opt_candidates(tour.tolist() + [int(tour[0])], neighbors, calculate_distance)
+            tour = np.array(path[:-1], dtype=np.int32)
+        tour_length = length(tour)
+        if tour_length < best_length:
+            best, best_length = tour, tour_length
+
+        # Evaporate, then reinforce the best tour's candidate edges in both directions
+        graph.pheromone *= 1.0 - evaporation
+        heads, tails = best.astype(np.int64), np.roll(best, -1).astype(np.int64)
+        for u, v in ((heads, tails), (tails, heads)):
+            positions = graph.edge_positions(u, v)
+            graph.pheromone[positions[positions >= 0]] += 1.0 / best_length
+        np.clip(graph.pheromone, 1.0 / (n * best_length), 1.0 / best_length, out=graph.pheromone)
+        done += 1
+
+    if best is None:
+        best = np.arange(n, dtype=np.int32)
+        best_length = length(best)
+    start = int(np.flatnonzero(best == 0)[0])
+    path = np.roll(best, -start).tolist()
+    path.append(path[0])
+    return {'path': path, 'distance': best_length, 'iterations': done, 'seconds': time.perf_counter() - started}
@@ -0,0 +1,183 @@
+import math
+import time
+
+import numpy as np
+
+from .tour import make_tour
+from .twoopt import two_opt_candidates
+
+# Moves proposed per city over a whole run (the cooling schedule spans this many)
+MOVES_PER_CITY = 100
+# Moves proposed, scored and accepted or rejected together
+BATCH_SIZE = 512
+# Share of the batch that is 2-opt moves; the rest are Or-opt moves
+TWO_OPT_SHARE = 0.5
+# Longest segment an Or-opt move relocates
+MAX_SEGMENT = 3
+# Chance that a typical uphill move of the first batch is accepted
+START_ACCEPTANCE = 0.02
+# Final temperature as a fraction of the starting one
+END_TEMPERATURE = 0.01
+
+
+def simulated_annealing(path, neighbors, calculate_distance, moves_per_city=MOVES_PER_CITY, batch_size=BATCH_SIZE,
+                        seed=0, table=None, two_level=None, budget=None, stats=None):
+    """Simulated annealing over a closed path with random 2-opt and Or-opt moves.
+
+    The path is first taken to a 2-opt local optimum, which annealing then escapes from.
+    Each batch draws batch_size moves at once with a seeded NumPy generator: a city a, a
+    candidate c from neighbors[a] and a move type. 2-opt replaces (a, next a), (c, next c)
+    with (a, c), (next a, next c); Or-opt moves the 1..MAX_SEGMENT cities from a into the
+    edge after c, whichever way round is cheaper. Deltas and the Metropolis test for the
+    whole batch are one set of NumPy array operations, with distances taken from the
+    coordinates of `table` when given (else from calculate_distance). Accepted moves are
+    applied to the Tour in order, skipping any whose edges an earlier move in the batch
+    changed, so every applied delta is exact.
+
+    The temperature starts where a typical uphill move is accepted with START_ACCEPTANCE
+    and falls geometrically to END_TEMPERATURE of that over n * moves_per_city moves, or
+    over the Budget's remaining time if that runs out first. A pass is n moves; the best
+    tour seen at the end of a pass is kept. A final candidate 2-opt leaves it at a local
+    optimum. `stats`, if a dict, receives moves, accepted, applied, seconds and
+    moves_per_second. The path keeps its starting city and is returned closed.
+    """
+    n = len(path) - 1
+    if n < 8:
+        return path
+    path = two_opt_candidates(path, neighbors, calculate_distance, two_level=two_level, budget=budget)
+    started = time.perf_counter()
+    tour = make_tour(path[:-1], two_level)
+    following, preceding = tour.next, tour.prev
+    candidates = np.array([neighbors[city] for city in range(n)], dtype=np.int64)
+    k = candidates.shape[1]
+    rng = np.random.default_rng(seed)
+
+    if table is not None:
+        xs = np.frombuffer(table.x, dtype=np.float64)
+        ys = np.frombuffer(table.y, dtype=np.float64)
+
+        def distances(u, v):
+            return np.hypot(xs[u] - xs[v], ys[u] - ys[v])
+    else:
+        def distances(u, v):
+            return np.fromiter(map(calculate_distance, u, v), dtype=np.float64, count=len(u))
+
+    def two_opt_batch(a, c):
+        """(delta, move, valid) for replacing (a, b), (c, d) with (a, c), (b, d)."""
+        b = [following(city) for city in a]
+        d = [following(city) for city in c]
+        delta = distances(a, c) + distances(b, d) - distances(a, b) - distances(c, d)
+        valid = (np.array(c) != b) & (np.array(d) != a)
+        return delta, list(zip(a, b, c, d)), valid
+
+    def or_opt_batch(a, c, lengths):
+        """(delta, move, valid) for moving s1..s2 (s1 = a) from between p and nx into (x, y)."""
+        s2, p, nx, y, valid = [], [], [], [], []
+        for s1, x, length in zip(a, c, lengths):
+            segment = [s1]
+            for _ in range(length - 1):
+                segment.append(following(segment[-1]))
+            after = following(x)
+            s2.append(segment[-1])
+            p.append(preceding(s1))
+            nx.append(following(segment[-1]))
+            y.append(after)
+            valid.append(x not in segment and after not in segment)
+        forward = distances(c, a) + distances(s2, y)
+        backward = distances(c, s2) + distances(a, y)
+        backwards = backward < forward
+        delta = (distances(p, nx) + np.minimum(forward, backward)
+                 - distances(p, a) - distances(s2, nx) - distances(c, y))
+        moves = list(zip(a, s2, p, nx, c, y, lengths, backwards.tolist()))
+        return delta, moves, np.array(valid, dtype=bool)
+
+    # Earlier moves in a batch may have reversed the stretch a later move sits in, so moves
+    # are re-checked by which edges exist and re-read in the tour's current direction
+
+    def apply_two_opt(a, b, c, d):
+        if not (following(a) == b and following(c) == d or preceding(a) == b and preceding(c) == d):
+            return False
+        tour.move(a, b, c, d)
+        return True
+
+    def apply_or_opt(s1, s2, p, nx, x, y, length, backwards):
+        first, last = (s2, s1) if backwards else (s1, s2)
+        wanted = {frozenset((x, first)), frozenset((last, y))}
+        for step, back in ((following, preceding), (preceding, following)):
+            segment = [s1]
+            for _ in range(length - 1):
+                segment.append(step(segment[-1]))
+            if segment[-1] == s2 and back(s1) == p and step(s2) == nx:
+                break
+        else:
+            return False
+        if step is preceding:
+            s1, s2, p, nx = s2, s1, nx, p
+        if following(x) != y:
+            if following(y) != x:
+                return False
+            x, y = y, x
+        if x in segment or y in segment:
+            return False
+        # Relocate as a chain of 2-opt moves, as in or_opt_candidates
+        tour.move(p, s1, x, y)
+        tour.move(p, x, nx, s2)
+        if {frozenset((x, s1)), frozenset((s2, y))} == wanted:
+            tour.move(x, s2, s1, y)
+        return True
+
+    current = sum(calculate_distance(path[i], path[i + 1]) for i in range(n))
+    best, best_path = current, path
+    total = moves_per_city * n
+    proposed = accepted = applied = 0
+    temperature = start_temperature = None
+    pass_left = n
+    if budget is None or budget.start():
+        deadline = None if budget is None else budget.deadline
+        while proposed < total:
+            if budget is not None and budget.expired():
+                break
+            size = min(batch_size, total - proposed)
+            a = rng.integers(n, size=size)
+            c = candidates[a, rng.integers(k, size=size)]
+            two_opt = rng.random(size) < TWO_OPT_SHARE
+            lengths = rng.integers(1, MAX_SEGMENT + 1, size=size)
+            batches = [
+                (two_opt_batch(a[two_opt].tolist(), c[two_opt].tolist()), apply_two_opt),
+                (or_opt_batch(a[~two_opt].tolist(), c[~two_opt].tolist(), lengths[~two_opt].tolist()), apply_or_opt),
+            ]
+
+            if start_temperature is None:
+                uphill = np.concatenate([delta[valid & (delta > 0)] for (delta, _, valid), _ in batches])
+                scale = float(np.median(uphill)) if len(uphill) else 1.0
+                start_temperature = temperature = scale / -math.log(START_ACCEPTANCE)
+            for (delta, moves, valid), apply in batches:
+                # Metropolis: downhill always, uphill with probability exp(-delta / T)
+                with np.errstate(over='ignore'):
+                    chosen = valid & ((delta <= 0) | (rng.random(len(delta)) < np.exp(-delta / temperature)))
+                accepted += int(chosen.sum())
+                for i in np.flatnonzero(chosen).tolist():
+                    if apply(*moves[i]):
+                        current += float(delta[i])
+                        applied += 1
+
+            proposed += size
+            pass_left -= size
+            if pass_left <= 0:
+                pass_left = n
+                if current < best - 1e-9:
+                    best, best_path = current, tour.path(path[0])
+                if budget is not None and not budget.end_pass(lambda: tour.path(path[0])):
+                    break
+            progress = proposed / total
+            if deadline is not None:
+                progress = max(progress, (time.perf_counter() - started) / max(deadline - started, 1e-9))
+            temperature = start_temperature * END_TEMPERATURE ** min(progress, 1.0)
+
+    if current < best:
+        best_path = tour.path(path[0])
+    seconds = time.perf_counter() - started
+    if stats is not None:
+        stats.update(moves=proposed, accepted=accepted, applied=applied, seconds=seconds,
+                     moves_per_second=proposed / seconds if seconds > 0 else float('inf'))
+    return two_opt_candidates(best_path, neighbors, calculate_distance, two_level=two_level, budget=budget)
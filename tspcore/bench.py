@@ -0,0 +1,467 @@
+"""Micro-benchmarks for the tspcore building blocks.
+
+Run from the repository root, e.g.:
+
+    python -m tspcore.bench distance --cities 2000
+    python -m tspcore.bench twoopt --cities 1000 10000 100000
+    python -m tspcore.bench curve --cities 1000000 10000000
+"""
+import argparse
+import math
+import random
+import time
+
+from .citytable import CityTable
+from .candidates import neighbor_lists
+from .construct import nearest_neighbor_tour
+from .distance import DISTANCE_MODES, distance_kernel
+from .improve import IMPROVEMENT_METHODS, improvement_engine
+from .initial import CONSTRUCTION_METHODS
+from .oropt import or_opt_candidates
+from .twoopt import two_opt_candidates
+
+
+def random_table(num_cities, seed=0, width=1000.0, height=1000.0):
+    """Uniform random cities in a width x height box."""
+    rng = random.Random(seed)
+    return CityTable(
+        [rng.random() * width for _ in range(num_cities)],
+        [rng.random() * height for _ in range(num_cities)],
+    )
+
+
+def random_pairs(table, num_calls, seed=1, pool=None):
+    """Index pairs to query; drawn from a fixed pool so cached modes see repeats like 2-opt does."""
+    rng = random.Random(seed)
+    n = len(table)
+    pool = pool or min(num_calls, n * 8)
+    pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(pool)]
+    return [pairs[rng.randrange(pool)] for _ in range(num_calls)]
+
+
+def calls_per_second(calculate_distance, pairs):
+    """Time one pass over `pairs` and return calls per second."""
+    start = time.perf_counter()
+    for city1, city2 in pairs:
+        calculate_distance(city1, city2)
+    elapsed = time.perf_counter() - start
+    return len(pairs) / elapsed if elapsed > 0 else float('inf')
+
+
+def bench_distance(args):
+    table = random_table(args.cities, seed=args.seed)
+    pairs = random_pairs(table, args.calls, seed=args.seed + 1)
+    print(f"Distance kernel: {args.cities} cities, {args.calls} calls per mode")
+
+    # The frozenset-keyed memo the solvers used before the kernel, as a reference point
+    cities = table.to_dicts()
+    memoized_distances = {}
+
+    def legacy_distance(city1, city2):
+        key = frozenset((city1['name'], city2['name']))
+        if key not in memoized_distances:
+            memoized_distances[key] = math.hypot(city1['x'] - city2['x'], city1['y'] - city2['y'])
+        return memoized_distances[key]
+
+    legacy_pairs = [(cities[i], cities[j]) for i, j in pairs]
+    calls_per_second(legacy_distance, legacy_pairs)
+    print(f"  {'frozenset memo':<16}{calls_per_second(legacy_distance, legacy_pairs):>14,.0f} calls/s")
+
+    for mode in DISTANCE_MODES:
+        start = time.perf_counter()
+        calculate_distance = distance_kernel(table, mode)
+        setup_ms = (time.perf_counter() - start) * 1000
+        calls_per_second(calculate_distance, pairs)  # Warm the cache modes
+        rate = calls_per_second(calculate_distance, pairs)
+        print(f"  {mode:<16}{rate:>14,.0f} calls/s   (setup {setup_ms:.1f} ms)")
+
+
+def bench_matrix(args):
+    from .matrix import build_distance_matrix
+
+    table = random_table(args.cities, seed=args.seed)
+    layout = 'condensed' if args.condensed else 'full'
+    start = time.perf_counter()
+    matrix = build_distance_matrix(table, dtype=args.dtype, condensed=args.condensed, path=args.path)
+    elapsed = time.perf_counter() - start
+    print(f"Distance matrix: {args.cities} cities, {args.dtype}, {layout}{' memmap' if args.path else ''}")
+    print(f"  {matrix.nbytes / 2**20:,.1f} MB built in {elapsed * 1000:,.1f} ms "
+          f"({matrix.size / elapsed:,.0f} entries/s)")
+
+
+def bench_nearest_neighbor(args):
+    table = random_table(args.cities, seed=args.seed)
+    calculate_distance = distance_kernel(table)
+    start = time.perf_counter()
+    path = nearest_neighbor_tour(table, calculate_distance)
+    grid_time = time.perf_counter() - start
+    print(f"Nearest neighbor: {args.cities} cities")
+    print(f"  {'grid index':<16}{grid_time * 1000:>14,.1f} ms")
+    if not args.scan:
+        return
+
+    # The full scan every solver used before the grid index, for comparison on modest n
+    start = time.perf_counter()
+    unvisited = set(range(len(table)))
+    scan_path = [0]
+    current_city = 0
+    while unvisited:
+        unvisited.discard(current_city)
+        closest, closest_distance = None, float('inf')
+        for city in unvisited:
+            dist = calculate_distance(current_city, city)
+            if dist < closest_distance or (dist == closest_distance and city < closest):
+                closest_distance, closest = dist, city
+        if closest is None:
+            break
+        scan_path.append(closest)
+        current_city = closest
+    scan_time = time.perf_counter() - start
+    print(f"  {'full scan':<16}{scan_time * 1000:>14,.1f} ms   (same tour: {scan_path == path})")
+
+
+def bench_curve(args):
+    import numpy as np
+
+    from .sfc import CURVES, curve_order
+
+    for num_cities in args.cities:
+        rng = np.random.default_rng(args.seed)
+        table = CityTable(rng.random(num_cities) * 1000.0, rng.random(num_cities) * 1000.0)
+        xs, ys = np.frombuffer(table.x), np.frombuffer(table.y)
+        print(f"Space-filling curve tours: {num_cities:,} cities")
+        for curve in args.curve or CURVES:
+            start = time.perf_counter()
+            order = curve_order(table, curve)
+            elapsed = time.perf_counter() - start
+            closed = np.append(order, order[:1])
+            length = np.hypot(np.diff(xs[closed]), np.diff(ys[closed])).sum()
+            print(f"  {curve:<10}{elapsed * 1000:>12,.1f} ms   tour {length:,.1f}")
+
+
+def bench_construct(args):
+    print(f"Initial tours, then neighbor-list 2-opt (k={args.k})")
+    for num_cities in args.cities:
+        table = random_table(num_cities, seed=args.seed)
+        calculate_distance = distance_kernel(table)
+        neighbors = neighbor_lists(table, args.k)
+        for method in args.method or CONSTRUCTION_METHODS:
+            name, construct = CONSTRUCTION_METHODS[method]
+            start = time.perf_counter()
+            path = construct(table, calculate_distance)
+            build_time = time.perf_counter() - start
+            path.append(path[0])
+            initial = tour_length(calculate_distance, path)
+            start = time.perf_counter()
+            optimized = two_opt_candidates(path, neighbors, calculate_distance)
+            opt_time = time.perf_counter() - start
+            print(f"  {num_cities:>8,} cities  {name:<18}{build_time * 1000:>9,.1f} ms  tour {initial:>12,.1f}"
+                  f"  2-opt {opt_time * 1000:>9,.1f} ms  tour {tour_length(calculate_distance, optimized):>12,.1f}")
+
+
+def tour_length(calculate_distance, path):
+    """Length of a closed path (first city repeated at the end)."""
+    return sum(calculate_distance(path[i], path[i + 1]) for i in range(len(path) - 1))
+
+
+# --tour choices for the improvement benchmarks -> make_tour(two_level=...)
+TOUR_TYPES = {'auto': None, 'array': False, 'two-level': True}
+
+
+def bench_two_opt(args):
+    stage_name, improve = improvement_engine(args.method)
+    reorder = f", cities renumbered in {args.reorder} order" if args.reorder else ''
+    print(f"{stage_name} from a nearest neighbor tour, k={args.k}, {args.tour} tour{reorder}")
+    for num_cities in args.cities:
+        table = random_table(num_cities, seed=args.seed)
+        if args.reorder:
+            from .sfc import curve_order
+
+            table = table.reordered(curve_order(table, args.reorder))
+        calculate_distance = distance_kernel(table)
+        path = nearest_neighbor_tour(table, calculate_distance)
+        path.append(path[0])
+        initial = tour_length(calculate_distance, path)
+
+        start = time.perf_counter()
+        neighbors = neighbor_lists(table, args.k)
+        lists_time = time.perf_counter() - start
+        start = time.perf_counter()
+        optimized = improve(path, neighbors, calculate_distance, two_level=TOUR_TYPES[args.tour])
+        opt_time = time.perf_counter() - start
+        gain = 1 - tour_length(calculate_distance, optimized) / initial
+        print(f"  {num_cities:>8,} cities  lists {lists_time * 1000:>9,.1f} ms  {stage_name:<5} {opt_time * 1000:>9,.1f} ms"
+              f"  gain {gain:6.2%}")
+
+        if args.or_opt:
+            before = tour_length(calculate_distance, optimized)
+            start = time.perf_counter()
+            relocated = or_opt_candidates(optimized, neighbors, calculate_distance, two_level=TOUR_TYPES[args.tour])
+            or_time = time.perf_counter() - start
+            gain = 1 - tour_length(calculate_distance, relocated) / before
+            print(f"  {'':>8}  then Or-opt {'':>14}{or_time * 1000:>9,.1f} ms  gain {gain:6.2%}")
+
+        if args.legacy and num_cities <= args.legacy:
+            # The full O(n^2) sweep the solvers ran before, restarted until nothing improves
+            legacy = path[:]
+            start = time.perf_counter()
+            improved = True
+            while improved:
+                improved = False
+                for i in range(1, len(legacy) - 2):
+                    for j in range(i + 1, len(legacy) - 1):
+                        before = calculate_distance(legacy[i - 1], legacy[i]) + calculate_distance(legacy[j], legacy[j + 1])
+                        after = calculate_distance(legacy[i - 1], legacy[j]) + calculate_distance(legacy[i], legacy[j + 1])
+                        if after + 1e-6 < before:
+                            legacy[i:j + 1] = reversed(legacy[i:j + 1])
+                            improved = True
+            legacy_time = time.perf_counter() - start
+            gain = 1 - tour_length(calculate_distance, legacy) / initial
+            print(f"  {'':>8}  full sweep {'':>15}{legacy_time * 1000:>9,.1f} ms  gain {gain:6.2%}")
+
+
+def bench_anneal(args):
+    from .anneal import simulated_annealing
+
+    print(f"Simulated annealing from 2-opt + Or-opt, k={args.k}, {args.moves_per_city} moves per city")
+    for num_cities in args.cities:
+        table = random_table(num_cities, seed=args.seed)
+        calculate_distance = distance_kernel(table)
+        neighbors = neighbor_lists(table, args.k)
+        path = nearest_neighbor_tour(table, calculate_distance)
+        path.append(path[0])
+        path = or_opt_candidates(two_opt_candidates(path, neighbors, calculate_distance), neighbors, calculate_distance)
+        before = tour_length(calculate_distance, path)
+        stats = {}
+        path = simulated_annealing(path, neighbors, calculate_distance, moves_per_city=args.moves_per_city,
+                                   seed=args.seed, table=table, stats=stats)
+        path = or_opt_candidates(path, neighbors, calculate_distance)
+        gain = 1 - tour_length(calculate_distance, path) / before
+        print(f"  {num_cities:>8,} cities  {stats['seconds'] * 1000:>9,.1f} ms  {stats['moves_per_second']:>9,.0f} moves/s"
+              f"  accepted {stats['accepted'] / max(stats['moves'], 1):6.2%}  gain {gain:6.2%}")
+
+
+def bench_multi_start(args):
+    from .multistart import multi_start
+
+    table = random_table(args.cities, seed=args.seed)
+    print(f"Multi-start {args.method}: {args.cities} cities, {args.starts} starts, {args.workers or 'all'} workers")
+    start = time.perf_counter()
+    result = multi_start(table, num_starts=args.starts, workers=args.workers, method=args.method,
+                         seed=args.seed, time_limit_ms=args.time_limit_ms)
+    elapsed = time.perf_counter() - start
+    distances = [distance for _, distance in result['runs']]
+    print(f"  best {result['distance']:,.1f} (start {result['start']})  worst {max(distances):,.1f}"
+          f"  first start {distances[0]:,.1f}  in {elapsed * 1000:,.1f} ms")
+
+
+def bench_genetic(args):
+    from .genetic import island_ga
+
+    for num_cities in args.cities:
+        table = random_table(num_cities, seed=args.seed)
+        result = island_ga(table, islands=args.islands, population=args.population, generations=args.generations,
+                           workers=args.workers, seed=args.seed)
+        print(f"{num_cities:>9} cities: {result['generations']} generations  tour {result['distance']:,.1f}"
+              f"  in {result['seconds'] * 1000:,.1f} ms  ({result['generations_per_second']:,.1f} generations/s per core)")
+
+
+def bench_aco(args):
+    from .aco import ant_colony
+
+    print(f"Ant colony over the k={args.k} candidate graph, {args.ants} ants per batch")
+    for num_cities in args.cities:
+        table = random_table(num_cities, seed=args.seed)
+        result = ant_colony(table, ants=args.ants, iterations=args.iterations, candidate_k=args.k, seed=args.seed)
+        per_iteration = result['seconds'] / max(result['iterations'], 1)
+        print(f"  {num_cities:>8,} cities  {result['iterations']} iterations  {per_iteration * 1000:>9,.1f} ms each"
+              f"  tour {result['distance']:>12,.1f}")
+
+
+def bench_exact(args):
+    from .construct import greedy_edge_tour
+    from .exact import held_karp
+
+    print(f"Held-Karp optimum vs greedy edge + 2-opt + Or-opt, {args.instances} instances per size")
+    for num_cities in args.cities:
+        exact_time, gaps = 0.0, []
+        for instance in range(args.instances):
+            table = random_table(num_cities, seed=args.seed + instance)
+            calculate_distance = distance_kernel(table)
+            start = time.perf_counter()
+            optimum = held_karp(table, calculate_distance, workers=args.workers)['distance']
+            exact_time += time.perf_counter() - start
+            neighbors = neighbor_lists(table, 8)
+            path = greedy_edge_tour(table, calculate_distance)
+            path.append(path[0])
+            path = or_opt_candidates(two_opt_candidates(path, neighbors, calculate_distance), neighbors,
+                                     calculate_distance)
+            gaps.append(tour_length(calculate_distance, path) / optimum - 1)
+        optimal = sum(gap < 1e-9 for gap in gaps)
+        print(f"  {num_cities:>3} cities  Held-Karp {exact_time / args.instances * 1000:>9,.1f} ms  heuristic optimal"
+              f" {optimal}/{len(gaps)}  mean gap {sum(gaps) / len(gaps):6.2%}  worst {max(gaps):6.2%}")
+
+
+def bench_window(args):
+    from .construct import greedy_edge_tour
+    from .window import window_optimize
+
+    print(f"Windowed Held-Karp after greedy edge + 2-opt + Or-opt, {args.workers} worker(s)")
+    for num_cities in args.cities:
+        table = random_table(num_cities, seed=args.seed)
+        calculate_distance = distance_kernel(table)
+        neighbors = neighbor_lists(table, 8)
+        path = greedy_edge_tour(table, calculate_distance)
+        path.append(path[0])
+        path = or_opt_candidates(two_opt_candidates(path, neighbors, calculate_distance), neighbors, calculate_distance)
+        before = tour_length(calculate_distance, path)
+        for window in args.window:
+            start = time.perf_counter()
+            optimized = window_optimize(path, calculate_distance, window=window, table=table, workers=args.workers)
+            elapsed = time.perf_counter() - start
+            gain = 1 - tour_length(calculate_distance, optimized) / before
+            print(f"  {num_cities:>8,} cities  window {window:>2}  {elapsed * 1000:>9,.1f} ms  gain {gain:6.2%}")
+
+
+def bench_bound(args):
+    from .bound import lower_bound, optimality_gap
+    from .construct import greedy_edge_tour
+
+    print("1-tree / Held-Karp lower bound vs greedy edge + 2-opt + Or-opt")
+    for num_cities in args.cities:
+        table = random_table(num_cities, seed=args.seed)
+        calculate_distance = distance_kernel(table)
+        neighbors = neighbor_lists(table, 8)
+        path = greedy_edge_tour(table, calculate_distance)
+        path.append(path[0])
+        path = or_opt_candidates(two_opt_candidates(path, neighbors, calculate_distance), neighbors, calculate_distance)
+        distance = tour_length(calculate_distance, path)
+        for iterations in args.iterations:
+            start = time.perf_counter()
+            bound = lower_bound(table, calculate_distance, neighbors, path, iterations=iterations)
+            elapsed = time.perf_counter() - start
+            print(f"  {num_cities:>8,} cities  {iterations:>4} iterations  {elapsed * 1000:>9,.1f} ms"
+                  f"  gap {optimality_gap(distance, bound):6.2%}")
+
+
+def bench_partition(args):
+    from .partition import solve_partitioned
+
+    for num_cities in args.cities:
+        table = random_table(num_cities, seed=args.seed)
+        start = time.perf_counter()
+        result = solve_partitioned(table, cluster_size=args.cluster_size, workers=args.workers,
+                                   method=args.method)
+        elapsed = time.perf_counter() - start
+        print(f"{num_cities:>9} cities: {result['clusters']} blocks, {result['boundary']:,} boundary seeds,"
+              f"  tour {result['distance']:,.1f}  in {elapsed * 1000:,.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m tspcore.bench', description=__doc__.splitlines()[0])
+    parser.add_argument('--seed', type=int, default=0)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    distance = sub.add_parser('distance', help='calls per second for each distance kernel mode')
+    distance.add_argument('--cities', type=int, default=2000)
+    distance.add_argument('--calls', type=int, default=1_000_000)
+    distance.set_defaults(func=bench_distance)
+
+    matrix = sub.add_parser('matrix', help='build time and size of the NumPy distance matrix')
+    matrix.add_argument('--cities', type=int, default=5000)
+    matrix.add_argument('--dtype', choices=('float64', 'float32'), default='float32')
+    matrix.add_argument('--condensed', action='store_true')
+    matrix.add_argument('--path', help='write into a np.memmap file at this path')
+    matrix.set_defaults(func=bench_matrix)
+
+    nn = sub.add_parser('nn', help='nearest neighbor construction time with the grid index')
+    nn.add_argument('--cities', type=int, default=20000)
+    nn.add_argument('--scan', action='store_true', help='also time the O(n^2) full scan')
+    nn.set_defaults(func=bench_nearest_neighbor)
+
+    curve = sub.add_parser('curve', help='Morton / Hilbert curve tour construction time and length')
+    curve.add_argument('--cities', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    curve.add_argument('--curve', choices=('morton', 'hilbert'), action='append',
+                       help='curve to time (repeatable; default: all)')
+    curve.set_defaults(func=bench_curve)
+
+    construct = sub.add_parser('construct', help='initial tour constructors: time, length and 2-opt time after')
+    construct.add_argument('--cities', type=int, nargs='+', default=[10000, 100000])
+    construct.add_argument('--k', type=int, default=8, help='neighbors per city')
+    construct.add_argument('--method', choices=tuple(CONSTRUCTION_METHODS), action='append',
+                           help='constructor to time (repeatable; default: all)')
+    construct.set_defaults(func=bench_construct)
+
+    two_opt = sub.add_parser('twoopt', help='neighbor-list 2-opt (or LK) time and gain over nearest neighbor')
+    two_opt.add_argument('--cities', type=int, nargs='+', default=[1000, 10000, 100000])
+    two_opt.add_argument('--k', type=int, default=8, help='neighbors per city')
+    two_opt.add_argument('--method', choices=tuple(IMPROVEMENT_METHODS), default='2opt',
+                         help="main improvement engine: '2opt', 'lk' (Lin-Kernighan style) or 'anneal'")
+    two_opt.add_argument('--tour', choices=tuple(TOUR_TYPES), default='auto',
+                         help='tour structure the engines apply moves to')
+    two_opt.add_argument('--or-opt', action='store_true', help='follow 2-opt with an Or-opt stage')
+    two_opt.add_argument('--reorder', choices=('morton', 'hilbert'),
+                         help='renumber the cities along this curve first (CityTable.reordered)')
+    two_opt.add_argument('--legacy', type=int, default=0, metavar='N',
+                         help='also time the O(n^2) full sweep for sizes up to N')
+    two_opt.set_defaults(func=bench_two_opt)
+
+    anneal = sub.add_parser('anneal', help='simulated annealing: moves per second and gain over 2-opt + Or-opt')
+    anneal.add_argument('--cities', type=int, nargs='+', default=[1000, 10000])
+    anneal.add_argument('--k', type=int, default=8, help='neighbors per city')
+    anneal.add_argument('--moves-per-city', type=int, default=100)
+    anneal.set_defaults(func=bench_anneal)
+
+    multi = sub.add_parser('multistart', help='best of several starts run over a process pool')
+    multi.add_argument('--cities', type=int, default=10000)
+    multi.add_argument('--starts', type=int, default=8)
+    multi.add_argument('--workers', type=int, default=None, help='default: one per CPU')
+    multi.add_argument('--method', choices=tuple(IMPROVEMENT_METHODS), default='2opt')
+    multi.add_argument('--time-limit-ms', type=float, default=None, help='per run')
+    multi.set_defaults(func=bench_multi_start)
+
+    genetic = sub.add_parser('ga', help='island-model genetic algorithm: tour and generations per second')
+    genetic.add_argument('--cities', type=int, nargs='+', default=[1000, 5000])
+    genetic.add_argument('--islands', type=int, default=None, help='default: one per worker')
+    genetic.add_argument('--population', type=int, default=8, help='tours per island')
+    genetic.add_argument('--generations', type=int, default=50)
+    genetic.add_argument('--workers', type=int, default=None, help='default: one per CPU')
+    genetic.set_defaults(func=bench_genetic)
+
+    aco = sub.add_parser('aco', help='ant colony optimization on the sparse candidate graph')
+    aco.add_argument('--cities', type=int, nargs='+', default=[1000, 10000])
+    aco.add_argument('--k', type=int, default=8, help='neighbors per city')
+    aco.add_argument('--ants', type=int, default=16)
+    aco.add_argument('--iterations', type=int, default=10)
+    aco.set_defaults(func=bench_aco)
+
+    exact = sub.add_parser('exact', help='Held-Karp optimum vs the heuristic pipeline on small instances')
+    exact.add_argument('--cities', type=int, nargs='+', default=[8, 12, 16])
+    exact.add_argument('--instances', type=int, default=10)
+    exact.add_argument('--workers', type=int, default=1, help='processes for the large DP layers')
+    exact.set_defaults(func=bench_exact)
+
+    window = sub.add_parser('window', help='exact re-optimization of tour windows after 2-opt + Or-opt')
+    window.add_argument('--cities', type=int, nargs='+', default=[1000, 10000])
+    window.add_argument('--window', type=int, nargs='+', default=[8, 10, 12], help='cities per window')
+    window.add_argument('--workers', type=int, default=1)
+    window.set_defaults(func=bench_window)
+
+    bound = sub.add_parser('bound', help='1-tree / Held-Karp lower bound: time and the gap it proves')
+    bound.add_argument('--cities', type=int, nargs='+', default=[1000, 10000])
+    bound.add_argument('--iterations', type=int, nargs='+', default=[0, 50, 200], help='subgradient iterations')
+    bound.set_defaults(func=bench_bound)
+
+    partition = sub.add_parser('partition', help='grid-partitioned solve: blocks in parallel, then stitched')
+    partition.add_argument('--cities', type=int, nargs='+', default=[100000, 1000000])
+    partition.add_argument('--cluster-size', type=int, default=2000)
+    partition.add_argument('--workers', type=int, default=None, help='default: one per CPU')
+    partition.add_argument('--method', choices=tuple(IMPROVEMENT_METHODS), default='2opt')
+    partition.set_defaults(func=bench_partition)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
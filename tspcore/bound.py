@@ -0,0 +1,213 @@
+from array import array
+
+from .candidates import DEFAULT_K, neighbor_lists
+from .construct import greedy_edge_tour
+from .spatial import GridIndex
+
+# Subgradient (Held-Karp) iterations lower_bound() runs by default; 0 gives the plain 1-tree bound
+BOUND_ITERATIONS = 200
+# Iterations without a better bound before the distance to the target level is halved
+PATIENCE = 10
+# Share of the previous direction kept in the next one (deflected subgradient)
+MOMENTUM = 0.7
+# Cities priced between clock reads
+PRICE_CHECK = 256
+
+
+def candidate_edges(neighbors, path=()):
+    """Each undirected edge of the K-NN lists and of the closed `path` once: (ends_a, ends_b).
+
+    The tour's edges keep the candidate graph connected even when the K-NN graph is not
+    (clustered cities), so a spanning tree always exists.
+    """
+    seen = set()
+    ends_a, ends_b = array('i'), array('i')
+    edges = ((a, b) for a in range(len(neighbors)) for b in neighbors[a])
+    tour = ((path[i], path[i + 1]) for i in range(len(path) - 1))
+    for pairs in (edges, tour):
+        for a, b in pairs:
+            key = (a, b) if a < b else (b, a)
+            if a != b and key not in seen:
+                seen.add(key)
+                ends_a.append(key[0])
+                ends_b.append(key[1])
+    return ends_a, ends_b
+
+
+def one_tree(n, ends_a, ends_b, weights):
+    """Minimum 1-tree of the candidate edges under `weights`: (weight, degrees, heaviest edge weight).
+
+    Kruskal over the edges sorted by weight, with a union-find, gives the minimum spanning
+    tree. A leaf's tree edge is its cheapest edge, so the tree plus a leaf's second cheapest
+    edge is the minimum 1-tree with that leaf as the special node; the leaf whose second
+    edge is dearest gives the largest bound. O(E log E) for E candidate edges.
+    """
+    parent = list(range(n))
+
+    def find(city):
+        while parent[city] != city:
+            parent[city] = parent[parent[city]]  # Path halving
+            city = parent[city]
+        return city
+
+    degrees = [0] * n
+    in_tree = bytearray(len(weights))
+    total, joined, heaviest = 0.0, 0, 0.0
+    for e in sorted(range(len(weights)), key=weights.__getitem__):
+        a, b = ends_a[e], ends_b[e]
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_a] = root_b
+            in_tree[e] = 1
+            degrees[a] += 1
+            degrees[b] += 1
+            total += weights[e]
+            heaviest = weights[e]
+            joined += 1
+            if joined == n - 1:
+                break
+    if joined < n - 1:
+        raise ValueError('candidate graph is not connected; pass a tour to add its edges')
+
+    # Two cheapest edges at every city
+    inf = float('inf')
+    first, second = [inf] * n, [inf] * n
+    first_edge, second_edge = [-1] * n, [-1] * n
+    for e, weight in enumerate(weights):
+        for city in (ends_a[e], ends_b[e]):
+            if weight < first[city]:
+                second[city], second_edge[city] = first[city], first_edge[city]
+                first[city], first_edge[city] = weight, e
+            elif weight < second[city]:
+                second[city], second_edge[city] = weight, e
+
+    leaf = max((city for city in range(n) if degrees[city] == 1), key=second.__getitem__)
+    extra = first_edge[leaf] if not in_tree[first_edge[leaf]] else second_edge[leaf]
+    degrees[ends_a[extra]] += 1
+    degrees[ends_b[extra]] += 1
+    return total + second[leaf], degrees, max(heaviest, second[leaf])
+
+
+def price_edges(index, pi, threshold, seen, budget=None):
+    """Edges not in `seen` whose penalized length is below `threshold`: [(a, b, length)], a < b.
+
+    Only such an edge could replace an edge of a 1-tree whose heaviest edge weighs
+    `threshold` (cycle property). Each edge is looked for from its end with the lower
+    penalty, which must see the other end within threshold - 2 * pi[a]: a radius query
+    on the GridIndex. Returns None if the Budget's deadline passes first.
+    """
+    found = []
+    for a in range(len(pi)):
+        if budget is not None and a % PRICE_CHECK == 0 and budget.timed_out():
+            return None
+        radius = threshold - 2 * pi[a]
+        if radius <= 0:
+            continue
+        for b, distance in index.within(a, radius):
+            if (pi[a], a) < (pi[b], b) and distance + pi[a] + pi[b] < threshold:
+                edge = (a, b) if a < b else (b, a)
+                if edge not in seen:
+                    found.append(edge + (distance,))
+    return found
+
+
+def lower_bound(table, calculate_distance, neighbors=None, path=None, iterations=BOUND_ITERATIONS, upper_bound=None,
+                k=DEFAULT_K, budget=None):
+    """Lower bound on the optimal tour length: the 1-tree bound, raised by Held-Karp ascent.
+
+    A 1-tree (spanning tree plus one edge closing a cycle) is never longer than the optimal
+    tour, and stays a bound when each city's edges are charged a penalty pi[city] that is
+    taken back as 2 * sum(pi). Each iteration builds the minimum 1-tree under the penalized
+    weights (one_tree) and moves pi along its degree excess, deg - 2, deflected by MOMENTUM
+    times the previous direction so the ascent does not zigzag on degenerate inputs (equal
+    distances, collinear cities). Steps are Polyak steps towards the target level best +
+    delta; delta starts at upper_bound minus the first bound and halves after PATIENCE
+    iterations without a better bound. iterations=0 gives the plain 1-tree bound. On
+    structured inputs the ascent may need all of its iterations, so a target gap tested
+    against a bound from fewer can be out of reach.
+
+    The ascent only looks at candidate edges, the K-NN lists (neighbors, or neighbor_lists(
+    table, k)) plus the edges of `path` (a closed tour, greedy edge when not given, which
+    also gives the default upper_bound), so an iteration is O(n k log(n k)) rather than
+    O(n^2). A 1-tree restricted to them can be heavier than the true minimum, so for the
+    best penalties found the edges that could still change it are priced in (price_edges)
+    until none are left; the value returned is then a true lower bound. A Budget's deadline
+    ends the ascent early; if it passes while pricing, the neighbor_bound() of the K-NN
+    lists, which needs no pricing, is returned instead.
+    """
+    n = len(table)
+    if path is None:
+        path = greedy_edge_tour(table, calculate_distance)
+        path += path[:1]
+    length = sum(calculate_distance(path[i], path[i + 1]) for i in range(len(path) - 1))
+    if n <= 3:
+        return length  # Only one tour
+    if upper_bound is None:
+        upper_bound = length
+    if neighbors is None:
+        neighbors = neighbor_lists(table, k)
+    ends_a, ends_b = candidate_edges(neighbors, path)
+    lengths = [calculate_distance(a, b) for a, b in zip(ends_a, ends_b)]
+    seen = set(zip(ends_a, ends_b))
+
+    def bound_at(pi):
+        weights = [distance + pi[a] + pi[b] for a, b, distance in zip(ends_a, ends_b, lengths)]
+        weight, degrees, heaviest = one_tree(n, ends_a, ends_b, weights)
+        return weight - 2 * sum(pi), degrees, heaviest
+
+    # Ascent on the candidate edges alone
+    pi = best_pi = [0.0] * n
+    direction = [0.0] * n
+    best, delta, stale = float('-inf'), None, 0
+    for iteration in range(iterations + 1):
+        bound, degrees, _ = bound_at(pi)
+        if delta is None:
+            delta = upper_bound - bound
+        if bound > best:
+            best, best_pi, stale = bound, pi, 0
+        else:
+            stale += 1
+            if stale >= PATIENCE:
+                delta, stale = delta / 2, 0
+        excess = [degree - 2 for degree in degrees]
+        if not any(excess) or bound >= upper_bound:
+            break  # A 1-tree that is a tour is optimal; nothing left to prove past the upper bound
+        if iteration == iterations or delta <= 1e-9 * abs(best):
+            break
+        if budget is not None and budget.timed_out():
+            break
+        direction = [e + MOMENTUM * d for e, d in zip(excess, direction)]
+        if not any(direction):
+            direction = excess
+        norm = sum(d * d for d in direction)
+        step = (best + delta - bound) / norm
+        pi = [p + step * d for p, d in zip(pi, direction)]
+
+    # Price in every edge outside the candidates that could change the best 1-tree, so it is exact
+    index = GridIndex(table, calculate_distance=calculate_distance)
+    while True:
+        bound, _, heaviest = bound_at(best_pi)
+        missing = price_edges(index, best_pi, heaviest, seen, budget)
+        if missing is None:
+            return neighbor_bound(neighbors, calculate_distance)
+        if not missing:
+            return bound
+        for a, b, distance in missing:
+            seen.add((a, b))
+            ends_a.append(a)
+            ends_b.append(b)
+            lengths.append(distance)
+
+
+def neighbor_bound(neighbors, calculate_distance):
+    """Half the two shortest edges at every city, from nearest-first K-NN lists.
+
+    Every tour leaves each city by two edges, so this is a lower bound without any 1-tree;
+    weaker (80-90% of optimal on random cities) but O(n).
+    """
+    return sum(calculate_distance(city, other) for city, row in enumerate(neighbors) for other in row[:2]) / 2
+
+
+def optimality_gap(distance, bound):
+    """How far a tour of length `distance` can be above optimal: (distance - bound) / bound."""
+    return (distance - bound) / bound if bound > 0 else 0.0
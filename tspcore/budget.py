@@ -0,0 +1,92 @@
+import time
+
+# Inner-loop calls between clock reads in Budget.expired()
+CHECK_EVERY = 64
+# Multiple of the time spent reading the cities that a solve keeps back from its deadline for
+# the O(n) work after the last stage (tour lengths, validation, names), see Budget.reserve()
+WRAP_UP_FACTOR = 5
+
+
+class Budget:
+    """Time limit for one solve and pass limit for its improvement stages.
+
+    time_limit_ms counts from construction, so a solver makes the Budget first and hands it
+    to every slow step (neighbor lists, tour construction, the bound, the improvement
+    stages); each gives up or falls back once the deadline has passed. max_passes caps the
+    passes of each improvement stage (one `while improved` sweep, or one round over an
+    engine's don't-look queue). callback(path) is called with the closed index path after
+    every pass that leaves work to do. stop(path), when set, is asked the same after every
+    pass; once it returns True (say, the tour is within a target gap of a lower bound) the
+    stage ends and no later stage starts. `converged` turns False as soon as any limit cuts
+    a step short; the stages always stop on a complete, valid tour, the best seen so far.
+    """
+
+    def __init__(self, time_limit_ms=None, max_passes=None, callback=None, check_every=CHECK_EVERY, stop=None):
+        self.started = time.perf_counter()
+        self.deadline = None if time_limit_ms is None else self.started + time_limit_ms / 1000
+        self.max_passes = max_passes
+        self.callback = callback
+        self.check_every = check_every
+        self.stop = stop
+        self.stopped = False
+        self.passes = 0
+        self.converged = True
+        self._countdown = check_every
+
+    def elapsed(self):
+        """Seconds since the Budget was made."""
+        return time.perf_counter() - self.started
+
+    def reserve(self, seconds):
+        """Bring the deadline `seconds` earlier, keeping that much time for work after the last check."""
+        if self.deadline is not None:
+            self.deadline -= seconds
+
+    def start(self):
+        """Begin an improvement stage; False if the deadline has already passed or stop() said so."""
+        self.passes = 0
+        if self.stopped:
+            self.converged = False
+            return False
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            self.converged = False
+            return False
+        return True
+
+    def expired(self):
+        """Cheap check for inner loops: reads the clock only every `check_every` calls."""
+        if self.deadline is None:
+            return False
+        self._countdown -= 1
+        if self._countdown > 0:
+            return False
+        self._countdown = self.check_every
+        if time.perf_counter() >= self.deadline:
+            self.converged = False
+            return True
+        return False
+
+    def timed_out(self):
+        """Read the clock now: True once the deadline has passed. For steps too slow for expired()."""
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            self.converged = False
+            return True
+        return False
+
+    def end_pass(self, current_path):
+        """Count a finished pass and report it; False if the stage may not start another.
+
+        current_path is a zero-argument function returning the closed path, only called
+        when there is a callback or a stop test.
+        """
+        self.passes += 1
+        if self.callback is not None:
+            self.callback(current_path())
+        if self.stop is not None and self.stop(current_path()):
+            self.stopped = True
+            self.converged = False
+            return False
+        if self.max_passes is not None and self.passes >= self.max_passes:
+            self.converged = False
+            return False
+        return True
@@ -0,0 +1,105 @@
+from collections import OrderedDict
+
+# Eviction policies accepted by DistanceCache
+CACHE_POLICIES = ('lru', 'clock')
+
+# Rough CPython cost of one cached pair: int key + float value + hash table slot/links
+ENTRY_BYTES = {'lru': 160, 'clock': 120}
+
+
+class DistanceCache:
+    """Bounded distance cache scoped to one solve, with LRU or CLOCK eviction and hit/miss counters.
+
+    Keys are the int pair codes produced by distance_kernel(); `max_bytes` is turned into an
+    entry capacity using an approximate per-entry cost, so it bounds memory rather than pins it.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, policy='lru'):
+        if policy not in CACHE_POLICIES:
+            raise ValueError(f"Unknown cache policy {policy!r}; expected one of {CACHE_POLICIES}")
+        self.policy = policy
+        self.max_bytes = max_bytes
+        self.capacity = max(1, max_bytes // ENTRY_BYTES[policy])
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if policy == 'lru':
+            self._entries = OrderedDict()
+        else:
+            # CLOCK: key -> slot, with parallel slot arrays and a reference bit per slot
+            self._entries = {}
+            self._keys = []
+            self._values = []
+            self._referenced = bytearray()
+            self._hand = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the cached distance for `key`, or None on a miss."""
+        if self.policy == 'lru':
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+        else:
+            slot = self._entries.get(key)
+            if slot is None:
+                self.misses += 1
+                return None
+            self._referenced[slot] = 1
+            value = self._values[slot]
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store a distance, evicting an older entry when the budget is full."""
+        if self.policy == 'lru':
+            entries = self._entries
+            entries[key] = value
+            entries.move_to_end(key)
+            if len(entries) > self.capacity:
+                entries.popitem(last=False)
+                self.evictions += 1
+            return
+
+        slot = self._entries.get(key)
+        if slot is not None:
+            self._values[slot] = value
+            self._referenced[slot] = 1
+            return
+        if len(self._keys) < self.capacity:
+            self._entries[key] = len(self._keys)
+            self._keys.append(key)
+            self._values.append(value)
+            self._referenced.append(0)
+            return
+
+        # Sweep the hand, clearing reference bits, until an unreferenced slot turns up
+        referenced, hand = self._referenced, self._hand
+        while referenced[hand]:
+            referenced[hand] = 0
+            hand = (hand + 1) % self.capacity
+        del self._entries[self._keys[hand]]
+        self._entries[key] = hand
+        self._keys[hand] = key
+        self._values[hand] = value
+        self._hand = (hand + 1) % self.capacity
+        self.evictions += 1
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        self.__init__(self.max_bytes, self.policy)
+
+    def stats(self):
+        """Counters for reporting: hits, misses, evictions, entries and hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,54 @@
+from .spatial import GridIndex
+
+# Neighbors per city used when a solver does not say otherwise
+DEFAULT_K = 8
+
+
+def neighbor_lists(table, k=DEFAULT_K, budget=None):
+    """Return the K nearest neighbors of every city, nearest first, built once per table.
+
+    Lists come from GridIndex ring queries (about O(n k) distance evaluations rather than
+    O(n^2)) and are cached in table.derived, so every improvement move on the same table
+    shares them; asking for a smaller k reuses a larger cached build. With a Budget, None
+    is returned (and nothing cached) if its deadline passes before every list is built.
+    """
+    k = max(0, min(k, len(table) - 1))
+    key = ('neighbors', k)
+    if key in table.derived:
+        return table.derived[key]
+    larger = [cached[1] for cached in table.derived if cached[0] == 'neighbors' and cached[1] > k]
+    if larger:
+        lists = [neighbors[:k] for neighbors in table.derived[('neighbors', min(larger))]]
+    else:
+        if budget is not None and budget.timed_out():
+            return None
+        index = GridIndex(table)
+        lists = []
+        for city in range(len(table)):
+            if budget is not None and budget.expired():
+                return None
+            lists.append(index.k_nearest(city, k))
+    table.derived[key] = lists
+    return lists
+
+
+class LazyNeighborLists:
+    """neighbors[city] computed on first use from one GridIndex, for engines that only visit a
+    few cities of a very large table (e.g. a pass seeded with an `active` subset).
+
+    Same lists as neighbor_lists(table, k), without paying for all n of them up front.
+    """
+
+    def __init__(self, table, k=DEFAULT_K, calculate_distance=None):
+        self.k = max(0, min(k, len(table) - 1))
+        self.index = GridIndex(table, calculate_distance=calculate_distance)
+        self.lists = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, city):
+        neighbors = self.lists.get(city)
+        if neighbors is None:
+            neighbors = self.lists[city] = self.index.k_nearest(city, self.k)
+        return neighbors
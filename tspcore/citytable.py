@@ -0,0 +1,92 @@
+import math
+from array import array
+
+# Keys every city dict carries; anything else is kept as per-city extras
+CORE_KEYS = ('name', 'x', 'y', 'z')
+
+
+class CityTable:
+    """Columnar city storage: contiguous float64 x/y[/z] arrays, an int id per city and a name side array."""
+
+    def __init__(self, x, y, z=None, names=None, ids=None, extras=None):
+        self.x = array('d', x)
+        self.y = array('d', y)
+        if len(self.x) != len(self.y):
+            raise ValueError('x and y must have the same number of cities')
+        n = len(self.x)
+        self.z = array('d', z) if z is not None else None
+        if self.z is not None and len(self.z) != n:
+            raise ValueError('z must have the same number of cities as x and y')
+        self.ids = array('q', range(n) if ids is None else ids)
+        self.names = list(names) if names is not None else [f'City{i}' for i in range(n)]
+        if len(self.ids) != n or len(self.names) != n:
+            raise ValueError('ids and names must have one entry per city')
+        # Optional per-city dicts holding keys other than name/x/y/z (e.g. 'size_x')
+        self.extras = extras
+        # Structures computed once from the coordinates, keyed by (name, parameter), e.g. ('neighbors', 8)
+        self.derived = {}
+
+    @classmethod
+    def from_dicts(cls, cities):
+        """Build a table from today's list of {'name', 'x', 'y'[, 'z']} dicts."""
+        has_z = any('z' in city for city in cities)
+        extras = [{k: v for k, v in city.items() if k not in CORE_KEYS} for city in cities]
+        return cls(
+            (city['x'] for city in cities),
+            (city['y'] for city in cities),
+            z=(city.get('z', math.nan) for city in cities) if has_z else None,
+            names=(city.get('name', f'City{i}') for i, city in enumerate(cities)),
+            extras=extras if any(extras) else None,
+        )
+
+    def __len__(self):
+        return len(self.x)
+
+    def __getitem__(self, i):
+        """Return city i as a dict, the same shape from_dicts accepts."""
+        city = {'name': self.names[i], 'x': self.x[i], 'y': self.y[i]}
+        if self.z is not None:
+            city['z'] = self.z[i]
+        if self.extras is not None:
+            city.update(self.extras[i])
+        return city
+
+    def to_dicts(self, order=None):
+        """Convert back to a list of city dicts, optionally in the given index order."""
+        return [self[i] for i in (range(len(self)) if order is None else order)]
+
+    def reordered(self, order):
+        """New table holding the same cities renumbered so that city i is this table's order[i].
+
+        Ids, names and extras travel with their cities, so names and ids still identify
+        them. Renumbering along a space-filling curve (tspcore.sfc.curve_order) puts nearby
+        cities at nearby indices, which makes the per-city arrays the engines walk
+        (coordinates, neighbor lists, tour positions) far more cache friendly.
+        """
+        order = list(order)
+        if sorted(order) != list(range(len(self))):
+            raise ValueError('order must list every city exactly once')
+        return CityTable(
+            (self.x[i] for i in order),
+            (self.y[i] for i in order),
+            z=None if self.z is None else (self.z[i] for i in order),
+            names=(self.names[i] for i in order),
+            ids=(self.ids[i] for i in order),
+            extras=None if self.extras is None else [self.extras[i] for i in order],
+        )
+
+    def path_names(self, path):
+        """Map a path of city indices to city names."""
+        names = self.names
+        return [names[i] for i in path]
+
+    def distance(self, i, j):
+        """Euclidean distance between cities i and j (x/y only, like the solvers)."""
+        return math.hypot(self.x[i] - self.x[j], self.y[i] - self.y[j])
+
+
+def as_city_table(cities):
+    """Accept either a CityTable or a list of city dicts and return a CityTable."""
+    if isinstance(cities, CityTable):
+        return cities
+    return CityTable.from_dicts(cities)
@@ -0,0 +1,136 @@
+from array import array
+
+from .candidates import DEFAULT_K, neighbor_lists
+from .spatial import GridIndex
+
+
+def nearest_neighbor_tour(table, calculate_distance, start=0, budget=None):
+    """Nearest neighbor tour over city indices using a GridIndex instead of scanning every city.
+
+    Returns the open path (start city first, not repeated at the end). Ties go to the lowest
+    index, so the tour is identical to the full-scan version's. None if the Budget's
+    deadline passes first.
+    """
+    if not len(table):
+        return []
+    if budget is not None and budget.timed_out():
+        return None
+    index = GridIndex(table, calculate_distance=calculate_distance)
+    path = [start]
+    index.remove(start)
+    current_city = start
+    while len(index):
+        if budget is not None and budget.expired():
+            return None
+        current_city, _ = index.nearest(current_city)
+        index.remove(current_city)
+        path.append(current_city)
+    return path
+
+
+def greedy_edge_tour(table, calculate_distance, start=0, k=DEFAULT_K, budget=None):
+    """Greedy edge (greedy matching) tour over the K-nearest-neighbor candidate edges.
+
+    Candidate edges go to fragments_tour() shortest first. O(n k log(n k)) overall; the tour
+    is usually ~15-20% above optimal against ~25% for nearest neighbor, so 2-opt has much
+    less to do. Returns the open path starting at `start`, or None if the Budget's deadline
+    passes first.
+    """
+    n = len(table)
+    if n <= 3:
+        return [(start + i) % n for i in range(n)]
+    neighbors = neighbor_lists(table, k, budget)
+    if neighbors is None:
+        return None
+
+    # Each undirected candidate edge once, sorted by length
+    ends_a, ends_b, lengths = array('i'), array('i'), array('d')
+    for a in range(n):
+        if budget is not None and budget.expired():
+            return None
+        for b in neighbors[a]:
+            if a < b or a not in neighbors[b]:
+                ends_a.append(a)
+                ends_b.append(b)
+                lengths.append(calculate_distance(a, b))
+
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    return fragments_tour(table, calculate_distance, (ends_a[e] for e in order), (ends_b[e] for e in order), start,
+                          budget)
+
+
+def fragments_tour(table, calculate_distance, ends_a, ends_b, start=0, budget=None):
+    """Greedy matching over edges (ends_a[i], ends_b[i]) in the order given, then one tour.
+
+    An edge is kept when both ends still have degree < 2 and a union-find says they are in
+    different fragments, so no early cycle closes. The fragments left over are chained end
+    to end, nearest free endpoint first, using a GridIndex over the endpoints. Shared by the
+    greedy edge and savings constructors; returns the open path starting at `start`, or
+    None if the Budget's deadline passes first.
+    """
+    n = len(table)
+    parent = list(range(n))
+
+    def find(city):
+        while parent[city] != city:
+            parent[city] = parent[parent[city]]  # Path halving
+            city = parent[city]
+        return city
+
+    degree = bytearray(n)
+    links = [-1] * (2 * n)  # Two tour neighbors per city
+
+    def link(a, b):
+        links[2 * a + degree[a]] = b
+        links[2 * b + degree[b]] = a
+        degree[a] += 1
+        degree[b] += 1
+
+    joined = 0
+    for a, b in zip(ends_a, ends_b):
+        if budget is not None and budget.expired():
+            return None
+        if degree[a] < 2 and degree[b] < 2:
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[root_a] = root_b
+                link(a, b)
+                joined += 1
+                if joined == n - 1:
+                    break
+
+    # Fragment ends (a lone city is both ends of its own fragment) and the far end of each
+    other_end = {}
+    for city in range(n):
+        if degree[city] < 2 and city not in other_end:
+            previous, current = -1, city
+            while degree[current] == 2 or current == city and degree[current]:
+                following = links[2 * current] if links[2 * current] != previous else links[2 * current + 1]
+                previous, current = current, following
+            other_end[city], other_end[current] = current, city
+
+    # Chain the fragments: from the far end of each, on to the nearest free endpoint
+    index = GridIndex(table, cities=other_end, calculate_distance=calculate_distance)
+    first = next(iter(other_end))
+    index.remove(first)
+    if other_end[first] != first:
+        index.remove(other_end[first])
+    current = other_end[first]
+    while len(index):
+        if budget is not None and budget.expired():
+            return None
+        nearest, _ = index.nearest(current)
+        index.remove(nearest)
+        if other_end[nearest] != nearest:
+            index.remove(other_end[nearest])
+        link(current, nearest)
+        current = other_end[nearest]
+    link(current, first)
+
+    path = [start]
+    previous, current = -1, start
+    for _ in range(n - 1):
+        following = links[2 * current] if links[2 * current] != previous else links[2 * current + 1]
+        previous, current = current, following
+        path.append(current)
+    return path
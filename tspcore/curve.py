@@ -0,0 +1,148 @@
+from .citytable import as_city_table
+
+# Grid bits per axis for the curve keys, by number of axes; keys fill 64 bits
+CURVE_BITS = {2: 32, 3: 21}
+# Grid bits per axis consumed by each table lookup in the 2-D Hilbert keys
+HILBERT_CHUNK = 4
+
+
+def hilbert_tables(width=HILBERT_CHUNK):
+    """Lookup tables advancing the Hilbert curve `width` grid bits per axis at a time.
+
+    The curve's state is how the current square is oriented: a swap of x and y and/or a
+    mirror of both, which commute, so four states. For each state and each pair of
+    width-bit chunks of x and y, `digits` holds the next 2 * width key bits and `states`
+    the orientation of the sub-square they lead into. Index is state << 2 * width | x << width | y.
+    """
+    size = 1 << width
+    digits = [0] * (4 * size * size)
+    states = [0] * (4 * size * size)
+    for state in range(4):
+        for cx in range(size):
+            for cy in range(size):
+                swapped, mirrored, key = state & 1, state >> 1, 0
+                for level in range(width - 1, -1, -1):
+                    rx, ry = (cx >> level) & 1, (cy >> level) & 1
+                    if swapped:
+                        rx, ry = ry, rx
+                    rx, ry = rx ^ mirrored, ry ^ mirrored
+                    key = key << 2 | ((3 * rx) ^ ry)
+                    if not ry:
+                        mirrored ^= rx
+                        swapped ^= 1
+                index = state << 2 * width | cx << width | cy
+                digits[index] = key
+                states[index] = mirrored << 1 | swapped
+    return digits, states
+
+
+_HILBERT_DIGITS, _HILBERT_STATES = hilbert_tables()
+
+
+def _grid(table, bits, dims):
+    """Pure-Python tspcore.sfc.grid_coordinates: one list of grid ints per axis, same values."""
+    columns = [list(table.x), list(table.y)]
+    if dims == 3:
+        z = list(table.z)
+        present = [value for value in z if value == value]  # NaN != NaN
+        floor = min(present) if present else 0.0
+        columns.append([value if value == value else floor for value in z])
+    if not columns[0]:
+        return columns
+    lows = [min(column) for column in columns]
+    extent = max(max(column) - low for column, low in zip(columns, lows))
+    scale = ((1 << bits) - 1) / extent if extent > 0 else 0.0
+    return [[int((value - low) * scale) for value in column] for column, low in zip(columns, lows)]
+
+
+def _spread(v, dims):
+    """Move the bits of v to every dims-th bit position: tspcore.sfc._spread_bits(_3d) on one int."""
+    if dims == 2:
+        v = (v | (v << 16)) & 0x0000FFFF0000FFFF
+        v = (v | (v << 8)) & 0x00FF00FF00FF00FF
+        v = (v | (v << 4)) & 0x0F0F0F0F0F0F0F0F
+        v = (v | (v << 2)) & 0x3333333333333333
+        return (v | (v << 1)) & 0x5555555555555555
+    v &= 0x1FFFFF
+    v = (v | (v << 32)) & 0x1F00000000FFFF
+    v = (v | (v << 16)) & 0x1F0000FF0000FF
+    v = (v | (v << 8)) & 0x100F00F00F00F00F
+    v = (v | (v << 4)) & 0x10C30C30C30C30C3
+    return (v | (v << 2)) & 0x1249249249249249
+
+
+def _morton_key(point, bits):
+    key = 0
+    for axis, v in enumerate(point):
+        key |= _spread(v, len(point)) << axis
+    return key
+
+
+def _hilbert_key(point, bits):
+    if len(point) == 3:
+        return _hilbert_key_3d(point, bits)
+    x, y = point
+    width, mask = HILBERT_CHUNK, (1 << HILBERT_CHUNK) - 1
+    key = state = 0
+    for chunk in range(-(-bits // width) - 1, -1, -1):
+        shift = chunk * width
+        index = state << 2 * width | ((x >> shift) & mask) << width | ((y >> shift) & mask)
+        key = key << 2 * width | _HILBERT_DIGITS[index]
+        state = _HILBERT_STATES[index]
+    return key
+
+
+def _hilbert_key_3d(point, bits):
+    """Skilling's transform for one point, as tspcore.sfc._hilbert_keys_3d does for all of them."""
+    axes = list(point)
+    for level in range(bits - 1, 0, -1):
+        low = (1 << level) - 1
+        for i in range(3):
+            if (axes[i] >> level) & 1:
+                axes[0] ^= low  # Reflect
+            else:
+                swap = (axes[0] ^ axes[i]) & low  # Exchange low bits
+                axes[0] ^= swap
+                axes[i] ^= swap
+    # Gray encode
+    axes[1] ^= axes[0]
+    axes[2] ^= axes[1]
+    t = 0
+    for level in range(bits - 1, 0, -1):
+        if (axes[2] >> level) & 1:
+            t ^= (1 << level) - 1
+    return _spread(axes[2] ^ t, 3) | _spread(axes[1] ^ t, 3) << 1 | _spread(axes[0] ^ t, 3) << 2
+
+
+CURVE_KEYS = {'morton': _morton_key, 'hilbert': _hilbert_key}
+
+
+def curve_path(cities, curve='hilbert', dims=None):
+    """Visit order along a space-filling curve, as a list of city indices.
+
+    tspcore.sfc.curve_order() when NumPy is installed, else pure_curve_path(). Scripts that
+    must run without NumPy sort their cities with this.
+    """
+    try:
+        from .sfc import curve_order
+    except ImportError:
+        return pure_curve_path(cities, curve, dims)
+    return curve_order(cities, curve, dims=dims).tolist()
+
+
+def pure_curve_path(cities, curve='hilbert', dims=None):
+    """tspcore.sfc.curve_order() without NumPy: the same keys one city at a time, the same order.
+
+    A few microseconds per city, against tens of nanoseconds vectorized.
+    """
+    if curve not in CURVE_KEYS:
+        raise ValueError(f"Unknown curve {curve!r}; expected one of {', '.join(CURVE_KEYS)}")
+    table = as_city_table(cities)
+    if dims is None:
+        dims = 2 if table.z is None else 3
+    if dims not in CURVE_BITS or (dims == 3 and table.z is None):
+        raise ValueError('dims must be 2, or 3 for a table with z coordinates')
+    bits, key = CURVE_BITS[dims], CURVE_KEYS[curve]
+    points = list(zip(*_grid(table, bits, dims)))
+    keys = [key(point, bits) for point in points]
+    return sorted(range(len(keys)), key=keys.__getitem__)
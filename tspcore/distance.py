@@ -0,0 +1,105 @@
+import math
+from array import array
+
+from .cache import DistanceCache
+
+# Modes accepted by distance_kernel() and the solvers' distance_mode option
+DISTANCE_MODES = ('direct', 'matrix', 'candidates')
+
+
+def distance_kernel(table, mode='direct', cache=None, candidates=None, matrix=None):
+    """Return a calculate_distance(i, j) function over the city indices of `table`.
+
+    direct      - compute math.hypot on every call, no memory beyond the table.
+    matrix      - index a precomputed matrix: `matrix` if given (full or condensed, e.g. from
+                  build_distance_matrix()), else a dense n*n float64 one (8 * n * n bytes).
+    candidates  - sparse cache keyed by the int pair code i * n + j. With `candidates`
+                  (one neighbor list per city) only those edges are cached, other pairs
+                  are computed directly; without it every pair is cached on first use.
+                  `cache` is the DistanceCache to fill; a default-sized one is made if omitted.
+    """
+    xs, ys = table.x, table.y
+    n = len(table)
+    hypot = math.hypot
+
+    if mode == 'direct':
+        def calculate_distance(city1, city2):
+            return hypot(xs[city1] - xs[city2], ys[city1] - ys[city2])
+        return calculate_distance
+
+    if mode == 'matrix':
+        return matrix_kernel(dense_matrix(table) if matrix is None else matrix, n)
+
+    if mode == 'candidates':
+        cache = DistanceCache() if cache is None else cache
+        get, put = cache.get, cache.put
+        if candidates is None:
+            def calculate_distance(city1, city2):
+                key = city1 * n + city2 if city1 < city2 else city2 * n + city1
+                dist = get(key)
+                if dist is None:
+                    dist = hypot(xs[city1] - xs[city2], ys[city1] - ys[city2])
+                    put(key, dist)
+                return dist
+            return calculate_distance
+
+        for city1, neighbors in enumerate(candidates):
+            for city2 in neighbors:
+                key = city1 * n + city2 if city1 < city2 else city2 * n + city1
+                put(key, hypot(xs[city1] - xs[city2], ys[city1] - ys[city2]))
+
+        def calculate_distance(city1, city2):
+            key = city1 * n + city2 if city1 < city2 else city2 * n + city1
+            dist = get(key)
+            if dist is None:
+                return hypot(xs[city1] - xs[city2], ys[city1] - ys[city2])
+            return dist
+        return calculate_distance
+
+    raise ValueError(f"Unknown distance mode {mode!r}; expected one of {DISTANCE_MODES}")
+
+
+def dense_matrix(table):
+    """Build the full row-major n*n float64 distance matrix, vectorized when NumPy is installed."""
+    try:
+        from .matrix import build_distance_matrix
+    except ImportError:
+        pass
+    else:
+        return build_distance_matrix(table)
+
+    xs, ys = table.x, table.y
+    hypot = math.hypot
+    matrix = array('d')
+    for i in range(len(table)):
+        xi, yi = xs[i], ys[i]
+        matrix.extend([hypot(xi - xj, yi - yj) for xj, yj in zip(xs, ys)])
+    return matrix
+
+
+def matrix_kernel(matrix, num_cities):
+    """Return calculate_distance(i, j) reading a full n*n or condensed upper-triangle matrix.
+
+    Any buffer works (array('d'), NumPy arrays, np.memmap); it is read through a flat
+    memoryview so every lookup is a plain index that returns a Python float.
+    """
+    flat = memoryview(matrix)
+    if flat.ndim != 1:
+        flat = flat.cast('B').cast(flat.format)
+    n = num_cities
+
+    if len(flat) == n * n:
+        def calculate_distance(city1, city2):
+            return flat[city1 * n + city2]
+        return calculate_distance
+
+    if len(flat) == n * (n - 1) // 2:
+        def calculate_distance(city1, city2):
+            if city1 > city2:
+                city1, city2 = city2, city1
+            elif city1 == city2:
+                return 0.0
+            return flat[n * city1 - city1 * (city1 + 1) // 2 + city2 - city1 - 1]
+        return calculate_distance
+
+    raise ValueError(f"Matrix with {len(flat)} entries does not fit {n} cities (full or condensed)")
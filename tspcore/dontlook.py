@@ -0,0 +1,50 @@
+from collections import deque
+
+
+class DontLookBits:
+    """Queue of cities worth revisiting, shared by the candidate-list improvement engines.
+
+    A city leaves the queue when it is popped and comes back only when push() is told an
+    edge next to it changed; its bit in `queued` keeps it in the queue at most once.
+    `cities` is the starting queue (every city of the tour, or just the `active` ones).
+    """
+
+    def __init__(self, cities, num_cities):
+        self.queued = bytearray(num_cities)
+        self.queue = deque()
+        self.push(cities)
+
+    def __len__(self):
+        return len(self.queue)
+
+    def push(self, cities):
+        """Queue each city that is not queued already."""
+        queued, queue = self.queued, self.queue
+        for city in cities:
+            if not queued[city]:
+                queued[city] = 1
+                queue.append(city)
+
+    def drain(self, budget=None, current_path=None):
+        """Yield cities off the queue until it is empty or the Budget ends the stage.
+
+        One pass is one round over the cities queued when it began. After each the Budget
+        counts it and may stop the stage (current_path() gives the closed path for its
+        callback and stop test); between pops it watches the deadline.
+        """
+        if budget is not None and not budget.start():
+            return
+        queued, queue = self.queued, self.queue
+        pass_left = len(queue)  # Pops left in the current pass over the queue
+        while queue:
+            if budget is not None:
+                if not pass_left:
+                    if not budget.end_pass(current_path):
+                        return
+                    pass_left = len(queue)
+                pass_left -= 1
+                if budget.expired():
+                    return
+            city = queue.popleft()
+            queued[city] = 0
+            yield city
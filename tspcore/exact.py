@@ -0,0 +1,167 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .citytable import as_city_table
+from .distance import distance_kernel
+from .shared import attach_arrays, share_arrays
+
+# Largest instance held_karp() accepts: 21 free cities, ~45 MB of back pointers and ~350 MB peak
+MAX_CITIES = 22
+# Layers with fewer subsets than this are extended in this process even when workers > 1
+PARALLEL_MIN = 50000
+
+# Per-process state set up once by _init_worker: distances and subset ranks
+_worker = {}
+
+# Set bits of every byte value, for counting the bits of masks on NumPy without bitwise_count (< 2.0)
+_BYTE_BITS = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.int64)
+
+
+def _subset_layers(m):
+    """Subsets of m free cities grouped by size: (layers, rank), layers[s] the sorted masks with
+    s bits set and rank[mask] the index of a mask within its layer."""
+    masks = np.arange(1 << m, dtype=np.int64)
+    sizes = _BYTE_BITS[masks.view(np.uint8)].reshape(len(masks), -1).sum(axis=1)
+    order = np.argsort(sizes, kind='stable')
+    bounds = np.searchsorted(sizes[order], np.arange(m + 2))
+    layers = [masks[order[bounds[s]:bounds[s + 1]]] for s in range(m + 1)]
+    rank = np.empty(1 << m, dtype=np.int32)
+    for layer in layers:
+        rank[layer] = np.arange(len(layer), dtype=np.int32)
+    return layers, rank
+
+
+def _extend(costs, masks, rank, between, cities):
+    """Best costs of the next layer for paths ending at each city in `cities`.
+
+    costs[rank[mask], i] is the shortest path from the start through the cities of `mask`
+    ending at free city i (inf where i is not in mask). Returns [(city, rows, cost, via)]:
+    for the next-layer masks containing `city`, their rows, the cost of ending there and
+    the city visited just before.
+    """
+    out = []
+    for j in cities:
+        bit = np.int64(1) << np.int64(j)
+        targets = masks[(masks & bit) != 0]
+        reached = costs[rank[targets ^ bit]] + between[:, j]
+        via = reached.argmin(axis=1)
+        out.append((j, rank[targets], reached[np.arange(len(targets)), via], via.astype(np.int8)))
+    return out
+
+
+def _init_worker(between, name, layout):
+    """Keep the free-city distances and read the shared subset ranks once per process."""
+    rank, = attach_arrays(name, layout)
+    _worker.update(between=between, rank=np.frombuffer(rank, dtype=np.int32))
+
+
+def _extend_shared(name, layout, m, cities):
+    """_extend() in a worker, on a layer handed over through shared memory."""
+    costs, masks = attach_arrays(name, layout)
+    costs = np.frombuffer(costs, dtype=np.float64).reshape(-1, m)
+    return _extend(costs, np.frombuffer(masks, dtype=np.int64), _worker['rank'], _worker['between'], cities)
+
+
+def held_karp_path(matrix, closed=True, workers=1):
+    """Exact shortest path over a small distance matrix by Held-Karp dynamic programming.
+
+    closed=True gives the shortest tour from node 0 back to node 0, closed=False the
+    shortest path from node 0 to the last node; either way through every other node.
+    Returns (length, order), order listing the node indices from the first to the last.
+
+    The table has one row per subset of the m free nodes and one column per node the path
+    ends at. It is filled one layer of equal-sized subsets at a time, indexed by rank
+    within the layer, so only two layers of costs (at most C(m, m/2) rows each) are held.
+    The choice made at each entry is kept as int8 for reading the path back: 2^m * m bytes
+    in all, O(2^m * m^2) time. With workers > 1, large layers are split by end node across
+    a process pool.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    size = len(matrix)
+    if size <= 1:
+        return 0.0, [0] * (size + closed) if size else []
+    end = 0 if closed else size - 1
+    free = np.arange(1, size if closed else size - 1)
+    m = len(free)
+    if m == 0:
+        return float(matrix[0, end]), [0, end]
+    between = np.ascontiguousarray(matrix[np.ix_(free, free)])
+    layers, rank = _subset_layers(m)
+
+    costs = np.full((m, m), np.inf)
+    costs[np.arange(m), np.arange(m)] = matrix[0, free]
+    choices = [None, None]  # choices[s][rank[mask], j]: free city before j; none for s <= 1
+    pool = None
+    try:
+        if workers > 1 and len(layers[m // 2]) >= PARALLEL_MIN:
+            shm_rank, rank_layout = share_arrays([rank])
+            pool = ProcessPoolExecutor(workers, initializer=_init_worker,
+                                       initargs=(between, shm_rank.name, rank_layout))
+        for s in range(2, m + 1):
+            masks = layers[s]
+            if pool is not None and len(masks) >= PARALLEL_MIN:
+                shm, layout = share_arrays([costs.reshape(-1), masks])
+                try:
+                    chunks = [list(range(w, m, workers)) for w in range(workers)]
+                    parts = pool.map(_extend_shared, [shm.name] * workers, [layout] * workers, [m] * workers, chunks)
+                    extended = [column for part in parts for column in part]
+                finally:
+                    shm.close()
+                    shm.unlink()
+            else:
+                extended = _extend(costs, masks, rank, between, range(m))
+            costs = np.full((len(masks), m), np.inf)
+            via = np.zeros((len(masks), m), dtype=np.int8)
+            for j, rows, cost, before in extended:
+                costs[rows, j] = cost
+                via[rows, j] = before
+            choices.append(via)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+            shm_rank.close()
+            shm_rank.unlink()
+
+    closing = costs[0] + matrix[free, end]
+    last = int(closing.argmin())
+    order, mask = [], (1 << m) - 1
+    for s in range(m, 0, -1):
+        order.append(int(free[last]))
+        if s > 1:
+            last, mask = int(choices[s][rank[mask], last]), mask ^ (1 << last)
+    order.reverse()
+    return float(closing.min()), [0] + order + [end]
+
+
+def held_karp(cities, calculate_distance=None, workers=None):
+    """Optimal tour of a small instance (at most MAX_CITIES cities); see held_karp_path().
+
+    Returns {'path': closed index path starting at city 0, 'distance'}. calculate_distance
+    defaults to the direct distance_kernel of the table; workers defaults to os.cpu_count(),
+    used only for layers of at least PARALLEL_MIN subsets (from about 18 cities). For
+    checking heuristic results against ground truth.
+    """
+    table = as_city_table(cities)
+    n = len(table)
+    if n > MAX_CITIES:
+        raise ValueError(f"Held-Karp is limited to {MAX_CITIES} cities, got {n}")
+    if n == 0:
+        return {'path': [], 'distance': 0.0}
+    calculate_distance = calculate_distance or distance_kernel(table)
+    matrix = [[calculate_distance(i, j) for j in range(n)] for i in range(n)]
+    distance, path = held_karp_path(matrix, closed=True, workers=workers or os.cpu_count() or 1)
+    return {'path': path, 'distance': distance}
+
+
+def exact_order(calculate_distance, first, middle, last):
+    """Shortest path from `first` through every city of `middle` to `last`, by Held-Karp.
+
+    The sub-solver for re-optimizing short tour windows with fixed ends: returns
+    (length, middle reordered). `middle` may hold up to MAX_CITIES - 2 cities.
+    """
+    nodes = [first] + list(middle) + [last]
+    matrix = [[calculate_distance(a, b) for b in nodes] for a in nodes]
+    length, order = held_karp_path(matrix, closed=False)
+    return length, [nodes[i] for i in order[1:-1]]
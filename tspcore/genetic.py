@@ -0,0 +1,240 @@
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .budget import Budget
+from .candidates import DEFAULT_K, neighbor_lists
+from .citytable import CityTable, as_city_table
+from .construct import nearest_neighbor_tour
+from .distance import distance_kernel
+from .sfc import curve_order
+from .oropt import or_opt_candidates
+from .shared import attach_arrays, share_arrays
+from .twoopt import two_opt_candidates
+
+# Tours per island
+POPULATION = 8
+# Generations each island runs between migrations
+MIGRATION_INTERVAL = 5
+# Parents are the shortest of this many tours drawn at random
+TOURNAMENT = 3
+
+# Per-process state set up once by _init_worker, so tasks only carry an island number
+_worker = {}
+
+
+def order_crossover(first, second, rng):
+    """OX child of two int32 tours: a random slice of `first`, the other cities in `second`'s order.
+
+    The slice keeps its position, and the cities of `second` not in it fill the positions
+    around it, left to right.
+    """
+    n = len(first)
+    i, j = sorted(rng.integers(n + 1, size=2).tolist())
+    taken = np.zeros(n, dtype=bool)
+    taken[first[i:j]] = True
+    rest = second[~taken[second]]
+    return np.concatenate([rest[:i], first[i:j], rest[i:]])
+
+
+def _successors(tour):
+    succ = np.empty(len(tour), dtype=np.int32)
+    succ[tour] = np.roll(tour, -1)
+    return succ
+
+
+def _new_edge_cities(child, first, second):
+    """Cities at the ends of child edges found in neither parent: where 2-opt has work to do."""
+    following = np.roll(child, -1)
+    kept = np.zeros(len(child), dtype=bool)
+    for parent in (first, second):
+        succ = _successors(parent)
+        kept |= (succ[child] == following) | (succ[following] == child)
+    return np.unique(np.concatenate([child[~kept], following[~kept]])).tolist()
+
+
+def _init_worker(name, layout, k):
+    """Read the shared coordinates and neighbor lists once per process; keep the block's layout."""
+    xs, ys, flat = attach_arrays(name, layout[:3])
+    table = CityTable(xs, ys)
+    _worker.update(
+        table=table,
+        calculate_distance=distance_kernel(table),
+        neighbors=[flat[i * k:(i + 1) * k].tolist() for i in range(len(table))],
+        xs=np.frombuffer(xs, dtype=np.float64),
+        ys=np.frombuffer(ys, dtype=np.float64),
+        name=name,
+        layout=layout,
+    )
+
+
+def _island_arrays(shm, layout, islands, population):
+    """(tours, lengths) NumPy views of the shared populations: [island, slot, position] and [island, slot]."""
+    _, start, length = layout[3]
+    tours = np.ndarray((islands, population, length // (islands * population)), dtype=np.int32,
+                       buffer=shm.buf, offset=start)
+    _, start, _ = layout[4]
+    lengths = np.ndarray((islands, population), dtype=np.float64, buffer=shm.buf, offset=start)
+    return tours, lengths
+
+
+def _evolve(island, islands, population, generations, seed, time_limit_ms):
+    """Run `generations` generations of one island on the shared populations; returns generations run.
+
+    An empty island is seeded first: a Morton curve tour and nearest neighbor tours from
+    random starts, each taken to a 2-opt local optimum. A generation breeds `population`
+    children (tournament parents, order crossover, then 2-opt seeded only from the child's
+    new edges) and keeps the shortest distinct tours of parents and children.
+    """
+    calculate_distance, neighbors = _worker['calculate_distance'], _worker['neighbors']
+    xs, ys = _worker['xs'], _worker['ys']
+    rng = np.random.default_rng(seed)
+    budget = Budget(time_limit_ms, check_every=1)  # A generation is long enough to read the clock
+
+    def improve(tour, active=None):
+        path = two_opt_candidates(tour.tolist() + [int(tour[0])], neighbors, calculate_distance, active=active)
+        path = or_opt_candidates(path, neighbors, calculate_distance, active=active)
+        return np.array(path[:-1], dtype=np.int32)
+
+    def length(tour):
+        following = np.roll(tour, -1)
+        return float(np.hypot(xs[tour] - xs[following], ys[tour] - ys[following]).sum())
+
+    shm = shared_memory.SharedMemory(name=_worker['name'])
+    try:
+        tours, lengths = _island_arrays(shm, _worker['layout'], islands, population)
+        tours, lengths = tours[island], lengths[island]
+        if not lengths.any():
+            n = tours.shape[1]
+            seeds = [curve_order(_worker['table'], 'morton').astype(np.int32)]
+            for start in rng.choice(n, size=population - 1, replace=population - 1 > n).tolist():
+                seeds.append(np.array(nearest_neighbor_tour(_worker['table'], calculate_distance, start), dtype=np.int32))
+            for slot, tour in enumerate(seeds):
+                tours[slot] = improve(tour)
+                lengths[slot] = length(tours[slot])
+
+        pool = [tour.copy() for tour in tours]
+        scores = lengths.tolist()
+        done = 0
+        while done < generations and not budget.expired():
+            for _ in range(population):
+                first, second = (min(rng.choice(population, size=TOURNAMENT), key=scores.__getitem__)
+                                 for _ in range(2))
+                child = order_crossover(pool[first], pool[second], rng)
+                child = improve(child, _new_edge_cities(child, pool[first], pool[second]))
+                pool.append(child)
+                scores.append(length(child))
+            # Survivors: the shortest tours, one per distinct length
+            survivors, seen = [], set()
+            for i in sorted(range(len(pool)), key=scores.__getitem__):
+                if round(scores[i], 6) not in seen:
+                    seen.add(round(scores[i], 6))
+                    survivors.append(i)
+            survivors = (survivors + [i for i in range(len(pool)) if i not in survivors])[:population]
+            pool, scores = [pool[i] for i in survivors], [scores[i] for i in survivors]
+            done += 1
+
+        for slot in range(population):
+            tours[slot] = pool[slot]
+            lengths[slot] = scores[slot]
+        del tours, lengths
+    finally:
+        shm.close()
+    return done
+
+
+def _migrate(tours, lengths):
+    """Ring migration: each island's best tour replaces the worst of the next island."""
+    best = [(tours[i, int(np.argmin(lengths[i]))].copy(), float(lengths[i].min())) for i in range(len(tours))]
+    for i, (tour, distance) in enumerate(best):
+        target = (i + 1) % len(tours)
+        if not np.isclose(lengths[target], distance).any():
+            worst = int(np.argmax(lengths[target]))
+            tours[target, worst] = tour
+            lengths[target, worst] = distance
+
+
+def island_ga(cities, islands=None, population=POPULATION, generations=50, migration_interval=MIGRATION_INTERVAL,
+              workers=None, candidate_k=DEFAULT_K, seed=0, time_limit_ms=None):
+    """Island-model genetic algorithm: one population per island, islands evolved in parallel.
+
+    Every island holds `population` int32 tours seeded from a Morton curve tour and nearest
+    neighbor tours, and breeds children by order crossover followed by candidate 2-opt.
+    All populations live in one SharedMemory block: a process pool (workers, default
+    os.cpu_count(); islands defaults to the same) evolves each island migration_interval
+    generations in place, then this process copies each island's best tour over the worst
+    of the next one. time_limit_ms stops the run after the current generations.
+
+    Returns {'path': closed index path, 'distance', 'generations': per island,
+    'generations_per_second': per core, 'seconds'} for the best tour found.
+    """
+    table = as_city_table(cities)
+    calculate_distance = distance_kernel(table)
+    n = len(table)
+    if n < 8:
+        path = nearest_neighbor_tour(table, calculate_distance)
+        path += path[:1]
+        distance = sum(calculate_distance(path[i], path[i + 1]) for i in range(len(path) - 1))
+        return {'path': path, 'distance': distance, 'generations': 0, 'generations_per_second': 0.0, 'seconds': 0.0}
+    workers = workers or os.cpu_count() or 1
+    islands = islands or workers
+    deadline = None if time_limit_ms is None else time.perf_counter() + time_limit_ms / 1000
+    started = time.perf_counter()
+
+    neighbors = neighbor_lists(table, candidate_k)
+    k = len(neighbors[0])
+    flat = array('i', (city for row in neighbors for city in row))
+    shm, layout = share_arrays([table.x, table.y, flat, array('i', [0]) * (islands * population * n),
+                                array('d', [0.0]) * (islands * population)])
+    try:
+        initargs = (shm.name, layout, k)
+        pool = None
+        if workers == 1 or islands == 1:
+            _init_worker(*initargs)
+            run = map
+        else:
+            pool = ProcessPoolExecutor(min(workers, islands), initializer=_init_worker, initargs=initargs)
+            run = pool.map
+        try:
+            done = epoch = 0
+            while done < generations:
+                remaining = None if deadline is None else (deadline - time.perf_counter()) * 1000
+                if remaining is not None and remaining <= 0 and done:
+                    break
+                step = min(migration_interval, generations - done)
+                ran = list(run(_evolve, range(islands), [islands] * islands, [population] * islands,
+                               [step] * islands, [[seed, epoch, i] for i in range(islands)], [remaining] * islands))
+                done += max(ran)
+                epoch += 1
+                tours, lengths = _island_arrays(shm, layout, islands, population)
+                _migrate(tours, lengths)
+                del tours, lengths
+                if max(ran) < step:
+                    break  # Out of time
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        tours, lengths = _island_arrays(shm, layout, islands, population)
+        island, slot = np.unravel_index(int(np.argmin(lengths)), lengths.shape)
+        path = tours[island, slot].tolist()
+        del tours, lengths
+    finally:
+        shm.close()
+        shm.unlink()
+
+    seconds = time.perf_counter() - started
+    path.append(path[0])
+    distance = sum(calculate_distance(path[i], path[i + 1]) for i in range(n))
+    cores = min(workers, islands)
+    return {
+        'path': path,
+        'distance': distance,
+        'generations': done,
+        'generations_per_second': done * islands / seconds / cores if seconds > 0 else 0.0,
+        'seconds': seconds,
+    }
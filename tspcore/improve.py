@@ -0,0 +1,23 @@
+from .lk import lin_kernighan_candidates
+from .twoopt import two_opt_candidates
+
+# Main improvement stage for solve_tsp(method=...): (stage name, engine). Every engine takes
+# (path, neighbors, calculate_distance) and returns the improved closed path.
+IMPROVEMENT_METHODS = {
+    '2opt': ('2-opt', two_opt_candidates),
+    'lk': ('LK', lin_kernighan_candidates),
+}
+
+try:
+    from .anneal import simulated_annealing
+except ImportError:  # NumPy not installed
+    pass
+else:
+    IMPROVEMENT_METHODS['anneal'] = ('Annealing', simulated_annealing)
+
+
+def improvement_engine(method):
+    """Return (stage name, engine) registered under `method`."""
+    if method not in IMPROVEMENT_METHODS:
+        raise ValueError(f"Unknown improvement method {method!r}; expected one of {tuple(IMPROVEMENT_METHODS)}")
+    return IMPROVEMENT_METHODS[method]
@@ -0,0 +1,41 @@
+from .construct import greedy_edge_tour, nearest_neighbor_tour
+from .curve import curve_path
+from .insertion import cheapest_insertion_tour, farthest_insertion_tour
+
+# Initial tour for solve_tsp(initial=...): (name, constructor). Every constructor takes
+# (table, calculate_distance, start=0, budget=None) and returns the open path starting at
+# `start`, or None once the Budget's deadline has passed.
+CONSTRUCTION_METHODS = {
+    'nearest': ('Nearest neighbor', nearest_neighbor_tour),
+    'greedy': ('Greedy edge', greedy_edge_tour),
+    'cheapest': ('Cheapest insertion', cheapest_insertion_tour),
+    'farthest': ('Farthest insertion', farthest_insertion_tour),
+}
+
+try:
+    from .savings import savings_tour
+except ImportError:  # NumPy not installed
+    pass
+else:
+    CONSTRUCTION_METHODS['savings'] = ('Savings', savings_tour)
+
+
+def construction_method(method):
+    """Return (name, constructor) registered under `method`."""
+    if method not in CONSTRUCTION_METHODS:
+        raise ValueError(f"Unknown construction method {method!r}; expected one of {tuple(CONSTRUCTION_METHODS)}")
+    return CONSTRUCTION_METHODS[method]
+
+
+def initial_tour(table, calculate_distance, construct, start=0, budget=None):
+    """Open path from `construct`, or the Hilbert curve order if the Budget's deadline passes first.
+
+    The curve order costs O(n log n) with no distance evaluations, so a solve whose time
+    limit ran out while constructing still returns a complete tour, rotated to begin at `start`.
+    """
+    path = construct(table, calculate_distance, start=start, budget=budget)
+    if path is None:
+        path = curve_path(table, 'hilbert')
+        first = path.index(start)
+        path = path[first:] + path[:first]
+    return path
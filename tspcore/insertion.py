@@ -0,0 +1,136 @@
+import heapq
+
+from .candidates import DEFAULT_K, neighbor_lists
+from .spatial import GridIndex
+
+# Nearest tour cities whose two tour edges are tried when placing a city
+INSERTION_CANDIDATES = 4
+
+
+def convex_hull(table, cities=None):
+    """Convex hull of the cities in counter-clockwise order (Andrew's monotone chain, O(n log n)).
+
+    Points on a hull edge are left out; one or two cities come back when all the points
+    coincide or lie on a line.
+    """
+    xs, ys = table.x, table.y
+    cities = sorted(range(len(table)) if cities is None else cities, key=lambda c: (xs[c], ys[c]))
+    if len(cities) < 3:
+        return cities
+
+    def cross(o, a, b):
+        return (xs[a] - xs[o]) * (ys[b] - ys[o]) - (ys[a] - ys[o]) * (xs[b] - xs[o])
+
+    def chain(points):
+        hull = []
+        for c in points:
+            while len(hull) >= 2 and cross(hull[-2], hull[-1], c) <= 0:
+                hull.pop()
+            hull.append(c)
+        return hull
+
+    lower, upper = chain(cities), chain(reversed(cities))
+    hull = lower[:-1] + upper[:-1]
+    if not hull or (len(hull) == 2 and xs[hull[0]] == xs[hull[1]] and ys[hull[0]] == ys[hull[1]]):
+        return cities[:1]
+    return hull
+
+
+def _insertion_tour(table, calculate_distance, start, farthest, k, budget=None):
+    """Grow a tour from the convex hull, inserting one city at a time; see the public wrappers.
+
+    Each remaining city sits in a heap keyed by its insertion cost (cheapest) or its distance
+    from the tour (farthest). A city is placed on the cheapest of the edges next to its
+    INSERTION_CANDIDATES nearest tour cities, which a GridIndex over the tour finds. Keys go stale as the tour
+    grows, so they are updated lazily: a popped city is re-evaluated and only inserted if its
+    fresh key still beats the top of the heap, otherwise it goes back in. None if the
+    Budget's deadline passes first.
+    """
+    n = len(table)
+    if n <= 3:
+        return [(start + i) % n for i in range(n)]
+    if budget is not None and budget.timed_out():
+        return None
+    hull = convex_hull(table)
+    succ, pred = [-1] * n, [-1] * n
+    for i, city in enumerate(hull):
+        following = hull[(i + 1) % len(hull)]
+        succ[city], pred[following] = following, city
+    inserted = bytearray(n)
+    for city in hull:
+        inserted[city] = 1
+    index = GridIndex(table, cities=hull, calculate_distance=calculate_distance)
+    neighbors = None if farthest else neighbor_lists(table, k, budget)
+    if neighbors is None and not farthest:
+        return None
+
+    def placement(city):
+        """(cost, a, b): the cheapest place (a, city, b) next to the nearest tour cities."""
+        best = None
+        for t in index.k_nearest(city, INSERTION_CANDIDATES):
+            for a, b in ((pred[t], t), (t, succ[t])):
+                cost = calculate_distance(a, city) + calculate_distance(city, b) - calculate_distance(a, b)
+                if best is None or cost < best[0]:
+                    best = (cost, a, b)
+        return best
+
+    def key(city):
+        # Farthest insertion only needs the nearest tour city until `city` is actually placed
+        return -index.nearest(city)[1] if farthest else placement(city)[0]
+
+    stamp = [0] * n  # Only a city's latest heap entry is live
+    heap = []
+    for city in range(n):
+        if budget is not None and budget.expired():
+            return None
+        if not inserted[city]:
+            heap.append((key(city), city, 0))
+    heapq.heapify(heap)
+    remaining = len(heap)
+    while remaining:
+        if budget is not None and budget.expired():
+            return None
+        _, city, entry = heapq.heappop(heap)
+        if inserted[city] or entry != stamp[city]:
+            continue
+        fresh = key(city)
+        if heap and fresh > heap[0][0]:
+            stamp[city] += 1
+            heapq.heappush(heap, (fresh, city, stamp[city]))
+            continue
+        _, a, b = placement(city)
+        succ[a], pred[city], succ[city], pred[b] = city, a, b, city
+        inserted[city] = 1
+        index.add(city)
+        remaining -= 1
+        if not farthest:
+            # New edges next to `city` may now be the cheapest spot for the cities around it
+            for other in neighbors[city]:
+                if not inserted[other]:
+                    stamp[other] += 1
+                    heapq.heappush(heap, (key(other), other, stamp[other]))
+
+    path = [start]
+    for _ in range(n - 1):
+        path.append(succ[path[-1]])
+    return path
+
+
+def cheapest_insertion_tour(table, calculate_distance, start=0, k=DEFAULT_K, budget=None):
+    """Convex hull, then repeatedly insert the city whose insertion lengthens the tour least.
+
+    Near O(n log n): lazy heap keys, a GridIndex over the tour and re-evaluation of only
+    the K nearest neighbors of each inserted city. Returns the open path starting at `start`,
+    or None if the Budget's deadline passes first.
+    """
+    return _insertion_tour(table, calculate_distance, start, False, k, budget)
+
+
+def farthest_insertion_tour(table, calculate_distance, start=0, budget=None):
+    """Convex hull, then repeatedly insert the city farthest from the tour at its cheapest spot.
+
+    Distances to the tour only shrink as it grows, so lazy heap keys stay exact upper bounds.
+    Near O(n log n). Returns the open path starting at `start`, or None if the Budget's
+    deadline passes first.
+    """
+    return _insertion_tour(table, calculate_distance, start, True, DEFAULT_K, budget)
@@ -0,0 +1,99 @@
+from .dontlook import DontLookBits
+from .tour import make_tour
+
+# Deepest chain of 2-opt steps one LK move may build before it is cut off
+MAX_DEPTH = 12
+# Alternatives tried for the first step; deeper steps follow only the best-looking one
+BREADTH = 5
+
+
+def lin_kernighan_candidates(path, neighbors, calculate_distance, max_depth=MAX_DEPTH, breadth=BREADTH,
+                             improvement_threshold=1e-6, two_level=None, budget=None):
+    """Lin-Kernighan style variable-depth search over a closed path (first city repeated at the end).
+
+    From a tour edge (t1, t2) the move repeatedly adds an edge (t2, t3) to a candidate
+    neighbor t3 and drops (t4, t3), where t4 is the tour neighbor of t3 that lets the tour be
+    closed again with (t4, t1); t4 then plays t2's part. Every step is a 2-opt exchange
+    applied to the tour, so 2-opt, 3-opt "sequential" and deeper moves all come out
+    of the same chain. The running gain must stay positive, each city is used as t3 at most
+    once per move, and at the end the chain is rolled back to its best closed-up prefix.
+    Steps are applied to a Tour, so a TwoLevelTour keeps long chains cheap on big inputs.
+    Don't-look bits queue cities whose edges changed and a Budget can stop the search
+    early, as in two_opt_candidates. The path keeps its starting city and is returned closed.
+    """
+    if len(path) - 1 < 5:
+        return path
+    tour = make_tour(path[:-1], two_level)
+
+    def steps(t1, t2, gain, used):
+        """Candidate (t3, t4, gain after adding (t2, t3)) for extending the chain, best first."""
+        # t4 sits on t3's side facing t2, so (t1, t2), (t4, t3) -> (t2, t3), (t1, t4) stays a tour
+        forward = tour.next(t1) == t2
+        options = []
+        for t3 in neighbors[t2]:
+            g1 = gain - calculate_distance(t2, t3)
+            if g1 <= 0:
+                break  # Neighbors are sorted, nothing further keeps the gain positive
+            if t3 == t1 or t3 in used:
+                continue
+            t4 = tour.prev(t3) if forward else tour.next(t3)
+            if t4 == t2:
+                continue  # (t2, t3) is already a tour edge
+            options.append((g1 + calculate_distance(t4, t3), t3, t4, g1))
+        options.sort(reverse=True)
+        return options
+
+    def improve_from(t1, t2):
+        """Try one variable-depth move starting by dropping (t1, t2); return the touched cities or None."""
+        gain = calculate_distance(t1, t2)
+        used = set()
+        applied = []
+        best_gain, best_depth = improvement_threshold, 0
+        options = steps(t1, t2, gain, used)[:breadth]
+        for _, t3, t4, g1 in options:
+            # First step: one try per alternative; deeper steps go greedily
+            tour.move(t1, t2, t4, t3)
+            applied.append((t2, t3, t4))
+            used.add(t3)
+            gain = g1 + calculate_distance(t4, t3)
+            closed = gain - calculate_distance(t4, t1)
+            if closed > best_gain:
+                best_gain, best_depth = closed, 1
+            cur = t4
+            while len(applied) < max_depth:
+                deeper = steps(t1, cur, gain, used)
+                if not deeper:
+                    break
+                _, u3, u4, g1 = deeper[0]
+                tour.move(t1, cur, u4, u3)
+                applied.append((cur, u3, u4))
+                used.add(u3)
+                gain = g1 + calculate_distance(u4, u3)
+                closed = gain - calculate_distance(u4, t1)
+                if closed > best_gain:
+                    best_gain, best_depth = closed, len(applied)
+                cur = u4
+
+            # Undo the steps past the best closed-up tour
+            while len(applied) > best_depth:
+                s2, s3, s4 = applied.pop()
+                tour.move(t1, s4, s2, s3)
+            if best_depth:
+                touched = {t1}
+                for s2, s3, s4 in applied:
+                    touched.update((s2, s3, s4))
+                return touched
+            used.clear()
+        return None
+
+    bits = DontLookBits(path[:-1], len(path) - 1)
+    for t1 in bits.drain(budget, lambda: tour.path(path[0])):
+        for step in (tour.next, tour.prev):
+            t2 = step(t1)
+            touched = improve_from(t1, t2)
+            if touched is None:
+                continue
+            bits.push(touched)
+            break
+
+    return tour.path(path[0])
@@ -0,0 +1,50 @@
+import numpy as np
+
+# Working memory for the per-block dx/dy temporaries; keeps peak usage flat for any n
+BLOCK_BYTES = 64 * 1024 * 1024
+
+
+def condensed_size(num_cities):
+    """Entries in the condensed upper triangle (i < j) of an n x n matrix."""
+    return num_cities * (num_cities - 1) // 2
+
+
+def build_distance_matrix(table, dtype='float64', condensed=False, path=None, block_bytes=BLOCK_BYTES):
+    """Build all-pair distances with NumPy, one block of rows at a time.
+
+    dtype      - 'float64' or 'float32' (half the memory, ~7 significant digits).
+    condensed  - store only the upper triangle i < j in row-major order, n(n-1)/2 entries.
+    path       - write into a np.memmap file at this path instead of RAM, so large
+                 matrices can be built once and opened by other processes with
+                 load_distance_matrix().
+    """
+    dtype = np.dtype(dtype)
+    n = len(table)
+    xs = np.frombuffer(table.x, dtype=np.float64)
+    ys = np.frombuffer(table.y, dtype=np.float64)
+    shape = (condensed_size(n),) if condensed else (n, n)
+    if path is None:
+        matrix = np.empty(shape, dtype=dtype)
+    else:
+        matrix = np.memmap(path, dtype=dtype, mode='w+', shape=shape)
+
+    block_rows = max(1, block_bytes // (max(n, 1) * 8 * 2))
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        if not condensed:
+            matrix[start:stop] = np.hypot(xs[start:stop, None] - xs[None, :], ys[start:stop, None] - ys[None, :])
+            continue
+        # Row i of the upper triangle holds columns i+1..n-1
+        for i in range(start, stop):
+            offset = n * i - i * (i + 1) // 2
+            matrix[offset:offset + n - i - 1] = np.hypot(xs[i] - xs[i + 1:], ys[i] - ys[i + 1:])
+
+    if path is not None:
+        matrix.flush()
+    return matrix
+
+
+def load_distance_matrix(path, num_cities, dtype='float64', condensed=False):
+    """Open a matrix written by build_distance_matrix(path=...) read-only, shared via the page cache."""
+    shape = (condensed_size(num_cities),) if condensed else (num_cities, num_cities)
+    return np.memmap(path, dtype=np.dtype(dtype), mode='r', shape=shape)
@@ -0,0 +1,90 @@
+import os
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .budget import Budget
+from .candidates import DEFAULT_K, neighbor_lists
+from .citytable import CityTable, as_city_table
+from .construct import nearest_neighbor_tour
+from .distance import distance_kernel
+from .improve import improvement_engine
+from .oropt import or_opt_candidates
+from .shared import attach_arrays, share_arrays
+
+# Per-process state set up once by _init_worker, so tasks only carry a start city
+_worker = {}
+
+
+def _init_worker(name, layout, k, method):
+    """Read the shared block and rebuild the table, kernel and neighbor lists once per process."""
+    xs, ys, flat = attach_arrays(name, layout)
+    table = CityTable(xs, ys)
+    neighbors = [flat[i * k:(i + 1) * k].tolist() for i in range(len(table))]
+    _worker.update(
+        table=table,
+        calculate_distance=distance_kernel(table),
+        neighbors=neighbors,
+        improve=improvement_engine(method)[1],
+    )
+
+
+def _run_start(start, time_limit_ms):
+    """Nearest neighbor from `start`, then the main engine and Or-opt; returns (distance, start, path)."""
+    table, calculate_distance, neighbors = _worker['table'], _worker['calculate_distance'], _worker['neighbors']
+    budget = Budget(time_limit_ms)
+    path = nearest_neighbor_tour(table, calculate_distance, start=start)
+    path.append(path[0])
+    path = _worker['improve'](path, neighbors, calculate_distance, budget=budget)
+    path = or_opt_candidates(path, neighbors, calculate_distance, budget=budget)
+    distance = sum(calculate_distance(path[i], path[i + 1]) for i in range(len(path) - 1))
+    return distance, start, array('i', path)
+
+
+def multi_start(cities, num_starts=None, starts=None, workers=None, method='2opt', candidate_k=DEFAULT_K,
+                seed=0, time_limit_ms=None):
+    """Run nearest neighbor + improvement from several start cities in parallel and keep the best tour.
+
+    starts      - start cities to use; by default city 0 plus num_starts - 1 others drawn
+                  with `seed` (num_starts defaults to the number of workers).
+    workers     - processes in the pool (default os.cpu_count()); 1 runs in this process.
+    method      - main improvement engine, as in solve_tsp(method=...); Or-opt follows.
+    time_limit_ms caps each run's improvement stages (see Budget).
+
+    Coordinates and neighbor lists are built once here and handed to the workers through
+    shared memory; a task is just a start city. Returns {'path': closed index path,
+    'distance', 'start', 'runs': [(start, distance), ...]} for the shortest tour found.
+    """
+    table = as_city_table(cities)
+    n = len(table)
+    if n == 0:
+        return {'path': [], 'distance': 0.0, 'start': None, 'runs': []}
+    workers = workers or os.cpu_count() or 1
+    if starts is None:
+        num_starts = min(num_starts or workers, n)
+        starts = [0] + random.Random(seed).sample(range(1, n), num_starts - 1)
+    improvement_engine(method)  # Fail on an unknown method before starting any process
+
+    neighbors = neighbor_lists(table, candidate_k)
+    k = len(neighbors[0])
+    flat = array('i', (city for row in neighbors for city in row))
+    shm, layout = share_arrays([table.x, table.y, flat])
+    try:
+        initargs = (shm.name, layout, k, method)
+        if workers == 1:
+            _init_worker(*initargs)
+            results = [_run_start(start, time_limit_ms) for start in starts]
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs) as pool:
+                results = list(pool.map(_run_start, starts, [time_limit_ms] * len(starts)))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    distance, start, path = min(results, key=lambda result: result[0])
+    return {
+        'path': list(path),
+        'distance': distance,
+        'start': start,
+        'runs': [(run_start, run_distance) for run_distance, run_start, _ in results],
+    }
@@ -0,0 +1,80 @@
+from .dontlook import DontLookBits
+from .tour import make_tour
+
+# Longest segment an Or-opt move relocates
+MAX_SEGMENT = 3
+
+
+def or_opt_candidates(path, neighbors, calculate_distance, max_segment=MAX_SEGMENT, improvement_threshold=1e-6,
+                      two_level=None, budget=None, active=None):
+    """Or-opt over a closed path: move segments of 1..max_segment cities, reversed or not.
+
+    A segment s1..s2 between p and nx is cut out (saving d(p,s1) + d(s2,nx) - d(p,nx)) and
+    reinserted into a tour edge next to a candidate neighbor of s1 or s2, in whichever
+    orientation is cheaper. Like two_opt_candidates, a move is scored from endpoint
+    distances only, neighbors are tried nearest first and dropped once the new edge alone
+    costs more than the removal saves, and don't-look bits queue only cities whose
+    surroundings changed. A move is applied to the Tour as a chain of 2-opt moves, and a
+    Budget can stop the search early, and `active` limits the starting queue as in
+    two_opt_candidates. The path keeps its starting city and is returned closed.
+    """
+    n = len(path) - 1
+    if n < 5:
+        return path
+    max_segment = min(max_segment, n - 3)
+    tour = make_tour(path[:-1], two_level)
+    between = tour.between
+
+    def best_insertion(s1, s2, removal_gain):
+        """Best (gain, x, y, reversed) for reinserting s1..s2 into a tour edge (x, y), or None."""
+        best = None
+        for end in (s1, s2):
+            for c in neighbors[end]:
+                d_ec = calculate_distance(end, c)
+                if d_ec >= removal_gain:
+                    break  # Neighbors are sorted, nothing further can gain
+                if between(s1, c, s2):
+                    continue  # c is inside the segment
+                for x, y in ((c, tour.next(c)), (tour.prev(c), c)):
+                    if between(s1, x, s2) or between(s1, y, s2):
+                        continue  # Edge touches the segment
+                    d_xy = calculate_distance(x, y)
+                    # Forward keeps x s1..s2 y, reversed gives x s2..s1 y
+                    for added, backwards in (
+                        (calculate_distance(x, s1) + calculate_distance(s2, y), False),
+                        (calculate_distance(x, s2) + calculate_distance(s1, y), True),
+                    ):
+                        gain = removal_gain + d_xy - added
+                        if gain > improvement_threshold and (best is None or gain > best[0]):
+                            best = (gain, x, y, backwards)
+        return best
+
+    bits = DontLookBits(path[:-1] if active is None else active, n)
+    for a in bits.drain(budget, lambda: tour.path(path[0])):
+        move = None
+        # Every segment of up to max_segment cities that starts or ends at a
+        last = first = a
+        for length in range(1, max_segment + 1):
+            if length > 1:
+                last, first = tour.next(last), tour.prev(first)
+            for s1, s2 in ((a, a),) if length == 1 else ((a, last), (first, a)):
+                p, nx = tour.prev(s1), tour.next(s2)
+                removal_gain = (calculate_distance(p, s1) + calculate_distance(s2, nx)
+                                - calculate_distance(p, nx))
+                if removal_gain <= improvement_threshold:
+                    continue
+                found = best_insertion(s1, s2, removal_gain)
+                if found is not None and (move is None or found[0] > move[0]):
+                    move = found + (s1, s2, p, nx)
+        if move is None:
+            continue
+
+        # Relocate as a chain of 2-opt moves: p s1..s2 nx .. x y  ->  p nx .. x [s2..s1] y
+        _, x, y, backwards, s1, s2, p, nx = move
+        tour.move(p, s1, x, y)  # p x .. nx s2..s1 y
+        tour.move(p, x, nx, s2)  # p nx .. x s2..s1 y
+        if not backwards:
+            tour.move(x, s2, s1, y)  # x s1..s2 y
+        bits.push((a, p, nx, s1, s2, x, y))
+
+    return tour.path(path[0])
@@ -0,0 +1,194 @@
+import heapq
+import math
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .candidates import DEFAULT_K, LazyNeighborLists, neighbor_lists
+from .citytable import CityTable, as_city_table
+from .construct import nearest_neighbor_tour
+from .distance import distance_kernel
+from .improve import improvement_engine
+from .shared import attach_arrays, share_arrays
+from .spatial import GridIndex
+from .twoopt import two_opt_candidates
+
+# Cities per block when the caller does not say otherwise
+CLUSTER_SIZE = 2000
+# Cities closer than this many average spacings to an inner block edge seed the final 2-opt
+BOUNDARY_MARGIN = 2.0
+# Cities of the previous block tried as attachment points when stitching in the next one
+STITCH_PROBES = 32
+
+# Per-process state set up once by _init_worker, so tasks only carry a block's bounds
+_worker = {}
+
+
+def grid_blocks(table, cluster_size=CLUSTER_SIZE):
+    """Cut the cities into grid blocks of about cluster_size cities each, in O(n log n).
+
+    The cities are split by x into vertical strips holding equal counts, and each strip by y
+    into blocks, walking up one strip and down the next, so consecutive blocks touch.
+    Returns (order, bounds): order lists every city block by block and block i is
+    order[start:stop] for (start, stop) = bounds[i].
+    """
+    n = len(table)
+    xs, ys = table.x, table.y
+    if n == 0:
+        return array('i'), []
+    num_blocks = max(1, -(-n // cluster_size))
+    width, height = max(xs) - min(xs), max(ys) - min(ys)
+    if height > 0:
+        strips = min(num_blocks, max(1, round(math.sqrt(num_blocks * width / height))))
+    else:
+        strips = num_blocks
+    by_x = sorted(range(n), key=xs.__getitem__)
+    per_strip = -(-n // strips)
+
+    order, bounds = array('i'), []
+    for s, lo in enumerate(range(0, n, per_strip)):
+        strip = sorted(by_x[lo:lo + per_strip], key=ys.__getitem__, reverse=s % 2 == 1)
+        step = -(-len(strip) // max(1, round(len(strip) / cluster_size)))
+        for start in range(0, len(strip), step):
+            bounds.append((len(order) + start, len(order) + min(start + step, len(strip))))
+        order.extend(strip)
+    return order, bounds
+
+
+def _init_worker(name, layout, method, candidate_k):
+    """Read the shared coordinates and block order once per process."""
+    xs, ys, order = attach_arrays(name, layout)
+    _worker.update(xs=xs, ys=ys, order=order, improve=improvement_engine(method)[1], candidate_k=candidate_k)
+
+
+def _solve_block(start, stop):
+    """Nearest neighbor + improvement over one block; returns its cycle as global city indices."""
+    xs, ys = _worker['xs'], _worker['ys']
+    cities = _worker['order'][start:stop]
+    table = CityTable(array('d', (xs[c] for c in cities)), array('d', (ys[c] for c in cities)))
+    calculate_distance = distance_kernel(table)
+    path = nearest_neighbor_tour(table, calculate_distance)
+    path.append(path[0])
+    path = _worker['improve'](path, neighbor_lists(table, _worker['candidate_k']), calculate_distance)
+    return array('i', (cities[i] for i in path[:-1]))
+
+
+def _boundary_cities(table, order, bounds, margin):
+    """Cities within `margin` of an edge their block shares with another block."""
+    xs, ys = table.x, table.y
+    left, right, bottom, top = min(xs), max(xs), min(ys), max(ys)
+    boundary = []
+    for start, stop in bounds:
+        cities = order[start:stop]
+        x0, x1 = min(xs[c] for c in cities), max(xs[c] for c in cities)
+        y0, y1 = min(ys[c] for c in cities), max(ys[c] for c in cities)
+        # Edges on the outside of the whole instance have nothing to stitch to
+        x0 = x0 + margin if x0 > left else -math.inf
+        x1 = x1 - margin if x1 < right else math.inf
+        y0 = y0 + margin if y0 > bottom else -math.inf
+        y1 = y1 - margin if y1 < top else math.inf
+        boundary.extend(c for c in cities if not (x0 < xs[c] < x1 and y0 < ys[c] < y1))
+    return boundary
+
+
+def _stitch(table, calculate_distance, cycles, probes):
+    """Merge the block cycles, in block order, into one tour; returns (path, touched cities).
+
+    Each block is joined to the one before it by the cheapest exchange of an edge (x, y) of
+    the tour so far for an edge (p, q) of the block among the probes nearest to it:
+    x -> p .. q -> y or x -> q .. p -> y, the block being walked the long way round.
+    """
+    xs, ys = table.x, table.y
+    succ = array('i', [0]) * len(table)
+    pred = array('i', [0]) * len(table)
+    for cycle in cycles:
+        for i, city in enumerate(cycle):
+            following = cycle[i + 1] if i + 1 < len(cycle) else cycle[0]
+            succ[city] = following
+            pred[following] = city
+
+    touched = []
+    for previous, cycle in zip(cycles, cycles[1:]):
+        cx = sum(xs[c] for c in cycle) / len(cycle)
+        cy = sum(ys[c] for c in cycle) / len(cycle)
+        near = heapq.nsmallest(probes, previous, key=lambda c: (xs[c] - cx) ** 2 + (ys[c] - cy) ** 2)
+        index = GridIndex(table, cities=cycle, calculate_distance=calculate_distance)
+        best = None
+        for u in near:
+            for p in index.k_nearest(u, 3) if len(cycle) > 1 else cycle:
+                for x, y in ((u, succ[u]), (pred[u], u)):
+                    d_xy = calculate_distance(x, y)
+                    for q in (pred[p], succ[p]):
+                        d_pq = calculate_distance(p, q)
+                        for first, last in ((p, q), (q, p)):
+                            delta = calculate_distance(x, first) + calculate_distance(last, y) - d_xy - d_pq
+                            if best is None or delta < best[0]:
+                                best = (delta, x, y, first, last)
+        _, x, y, first, last = best
+        if pred[first] != last:
+            # Walk the block the other way so it runs from first all the way round to last
+            for city in cycle:
+                succ[city], pred[city] = pred[city], succ[city]
+        succ[x], pred[first] = first, x
+        succ[last], pred[y] = y, last
+        touched.extend((x, y, first, last))
+
+    path = [0]
+    city = succ[0]
+    while city != 0:
+        path.append(city)
+        city = succ[city]
+    path.append(path[0])
+    return path, touched
+
+
+def solve_partitioned(cities, cluster_size=CLUSTER_SIZE, workers=None, method='2opt', candidate_k=DEFAULT_K,
+                      boundary_margin=BOUNDARY_MARGIN, stitch_probes=STITCH_PROBES):
+    """Divide and conquer for very large instances, after multithreaded-tsp.md.
+
+    1. grid_blocks() partitions the cities into blocks of about cluster_size.
+    2. A process pool solves every block independently with nearest neighbor + `method`
+       (coordinates and block order go to the workers through shared memory; a task is
+       just a block's bounds). workers=1 runs in this process.
+    3. The block tours are stitched into one cycle at their boundary edges.
+    4. A final candidate 2-opt starts only from cities near block edges and the stitches,
+       with neighbor lists built lazily, so it never touches the block interiors it has
+       no reason to.
+
+    Returns {'path': closed index path, 'distance', 'clusters', 'boundary': number of seeds}.
+    """
+    table = as_city_table(cities)
+    n = len(table)
+    if n == 0:
+        return {'path': [], 'distance': 0.0, 'clusters': 0, 'boundary': 0}
+    workers = workers or os.cpu_count() or 1
+    improvement_engine(method)  # Fail on an unknown method before starting any process
+    calculate_distance = distance_kernel(table)
+
+    order, bounds = grid_blocks(table, cluster_size)
+    shm, layout = share_arrays([table.x, table.y, order])
+    try:
+        initargs = (shm.name, layout, method, candidate_k)
+        starts, stops = [start for start, _ in bounds], [stop for _, stop in bounds]
+        if workers == 1 or len(bounds) == 1:
+            _init_worker(*initargs)
+            cycles = list(map(_solve_block, starts, stops))
+        else:
+            with ProcessPoolExecutor(min(workers, len(bounds)), initializer=_init_worker,
+                                     initargs=initargs) as pool:
+                cycles = list(pool.map(_solve_block, starts, stops))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    path, touched = _stitch(table, calculate_distance, cycles, stitch_probes)
+    active = []
+    if len(bounds) > 1:
+        width, height = max(table.x) - min(table.x), max(table.y) - min(table.y)
+        spacing = math.sqrt(max(width * height, max(width, height) ** 2 / n) / n)
+        active = _boundary_cities(table, order, bounds, boundary_margin * spacing) + touched
+        neighbors = LazyNeighborLists(table, candidate_k, calculate_distance)
+        path = two_opt_candidates(path, neighbors, calculate_distance, active=active)
+
+    distance = sum(calculate_distance(path[i], path[i + 1]) for i in range(len(path) - 1))
+    return {'path': path, 'distance': distance, 'clusters': len(bounds), 'boundary': len(set(active))}
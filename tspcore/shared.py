@@ -0,0 +1,33 @@
+from array import array
+from multiprocessing import shared_memory
+
+
+def share_arrays(arrays):
+    """Copy array.array columns into one SharedMemory block for worker processes.
+
+    Returns (shm, layout); layout is a picklable list of (typecode, offset, length) that
+    attach_arrays() turns back into arrays. 1-D NumPy arrays work too, stored under their
+    dtype's typecode; np.frombuffer turns the attached copy back into one. The caller
+    closes and unlinks the block once the workers are done.
+    """
+    layout, offset = [], 0
+    for column in arrays:
+        offset = (offset + 7) // 8 * 8  # Keep every column 8-byte aligned
+        layout.append((getattr(column, 'typecode', None) or column.dtype.char, offset, len(column)))
+        offset += len(column) * column.itemsize
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for column, (_, start, _) in zip(arrays, layout):
+        shm.buf[start:start + len(column) * column.itemsize] = column.tobytes()
+    return shm, layout
+
+
+def attach_arrays(name, layout):
+    """Read the columns of a share_arrays() block into process-local arrays (one memcpy each)."""
+    shm = shared_memory.SharedMemory(name=name)
+    columns = []
+    for typecode, start, length in layout:
+        column = array(typecode)
+        column.frombytes(shm.buf[start:start + length * column.itemsize])
+        columns.append(column)
+    shm.close()
+    return columns
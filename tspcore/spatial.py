@@ -0,0 +1,158 @@
+import heapq
+import math
+
+
+class GridIndex:
+    """Uniform grid over a CityTable answering "nearest remaining city" queries with deletion.
+
+    Cities are bucketed into square cells holding about `per_cell` cities each. A query scans
+    rings of cells outward from the query city and stops once no unscanned cell can hold
+    anything closer. When deletions thin the grid out it is rebuilt over the remaining
+    cities with bigger cells, so empty rings never dominate the query cost; likewise
+    additions that crowd it are rebuilt with smaller cells.
+    """
+
+    def __init__(self, table, cities=None, calculate_distance=None, per_cell=2.0):
+        self.xs, self.ys = table.x, table.y
+        self.per_cell = per_cell
+        self.calculate_distance = calculate_distance or table.distance
+        self._build(range(len(table)) if cities is None else cities)
+
+    def _build(self, cities):
+        xs, ys = self.xs, self.ys
+        cities = list(cities)
+        self.count = len(cities)
+        if not cities:
+            self.cols = self.rows = 1
+            self.cell_size = 1.0
+            self.min_x = self.min_y = 0.0
+            self.cells = [[]]
+            return
+        self.min_x = min(xs[c] for c in cities)
+        self.min_y = min(ys[c] for c in cities)
+        width = max(xs[c] for c in cities) - self.min_x
+        height = max(ys[c] for c in cities) - self.min_y
+        area = max(width * height, max(width, height) ** 2 / len(cities), 1e-300)
+        self.cell_size = math.sqrt(area * self.per_cell / len(cities)) or 1.0
+        self.cols = int(width / self.cell_size) + 1
+        self.rows = int(height / self.cell_size) + 1
+        self.cells = [[] for _ in range(self.cols * self.rows)]
+        for city in cities:
+            self.cells[self._cell_of(xs[city], ys[city])].append(city)
+
+    def _cell_of(self, x, y):
+        col = min(int((x - self.min_x) / self.cell_size), self.cols - 1)
+        row = min(int((y - self.min_y) / self.cell_size), self.rows - 1)
+        return max(col, 0) * self.rows + max(row, 0)
+
+    def __len__(self):
+        return self.count
+
+    def remove(self, city):
+        """Delete a city from the index."""
+        self.cells[self._cell_of(self.xs[city], self.ys[city])].remove(city)
+        self.count -= 1
+        # Keep at least one city per ~8 cells so ring scans stay short
+        if self.count and self.count * 8 < len(self.cells):
+            self._build(city for cell in self.cells for city in cell)
+
+    def add(self, city):
+        """Insert a city into the index."""
+        x, y = self.xs[city], self.ys[city]
+        cols, rows, size = self.cols, self.rows, self.cell_size
+        inside = self.min_x <= x <= self.min_x + cols * size and self.min_y <= y <= self.min_y + rows * size
+        # Outside the grid, or twice the target cities per cell: rebuild (amortised O(1) per add)
+        if not self.count or not inside or self.count + 1 > 2 * self.per_cell * len(self.cells):
+            self._build([c for cell in self.cells for c in cell] + [city])
+            return
+        self.cells[self._cell_of(x, y)].append(city)
+        self.count += 1
+
+    def _rings(self, city):
+        """Yield (cities in ring, bound) for rings of cells around `city`, innermost first.
+
+        `bound` is a lower bound on the distance to any city outside the rings yielded so far
+        (inf once the whole grid is covered), shrunk a hair so float rounding in the cell
+        maths can't hide an exact tie.
+        """
+        cells, rows, cols, size = self.cells, self.rows, self.cols, self.cell_size
+        # The query city may lie outside the bounding box of what is left
+        fx = (self.xs[city] - self.min_x) / size
+        fy = (self.ys[city] - self.min_y) / size
+        col = min(max(int(math.floor(fx)), 0), cols - 1)
+        row = min(max(int(math.floor(fy)), 0), rows - 1)
+
+        radius = 0
+        while True:
+            ring = []
+            for c in range(col - radius, col + radius + 1):
+                if c < 0 or c >= cols:
+                    continue
+                edge = c == col - radius or c == col + radius
+                step = 1 if edge else 2 * radius
+                for r in range(row - radius, row + radius + 1, step or 1):
+                    if 0 <= r < rows:
+                        ring.extend(cells[c * rows + r])
+
+            # Anything not scanned yet lies outside the (2 * radius + 1)^2 block of cells
+            bound = float('inf')
+            if col - radius > 0:
+                bound = min(bound, (fx - (col - radius)) * size)
+            if col + radius < cols - 1:
+                bound = min(bound, (col + radius + 1 - fx) * size)
+            if row - radius > 0:
+                bound = min(bound, (fy - (row - radius)) * size)
+            if row + radius < rows - 1:
+                bound = min(bound, (row + radius + 1 - fy) * size)
+            yield ring, bound * (1.0 - 1e-9)
+            if bound == float('inf'):
+                return
+            radius += 1
+
+    def nearest(self, city):
+        """Return (closest remaining city, distance) to `city`, ties broken by lowest index."""
+        calculate_distance = self.calculate_distance
+        best, best_distance = None, float('inf')
+        if not self.count:
+            return best, best_distance
+        for ring, bound in self._rings(city):
+            for other in ring:
+                dist = calculate_distance(city, other)
+                if dist < best_distance or (dist == best_distance and other < best):
+                    best, best_distance = other, dist
+            if best_distance < bound:
+                break
+        return best, best_distance
+
+    def k_nearest(self, city, k):
+        """Return up to k remaining cities closest to `city` (excluding it), nearest first."""
+        if k <= 0:
+            return []
+        calculate_distance = self.calculate_distance
+        heap = []  # max-heap on (distance, index) via negation, holding the k best so far
+        for ring, bound in self._rings(city):
+            for other in ring:
+                if other == city:
+                    continue
+                item = (-calculate_distance(city, other), -other)
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+            if len(heap) == k and -heap[0][0] < bound:
+                break
+        return [-other for _, other in sorted(heap, reverse=True)]
+
+    def within(self, city, radius):
+        """Return [(other, distance)] for the remaining cities closer than `radius` to `city`, unordered."""
+        calculate_distance = self.calculate_distance
+        found = []
+        for ring, bound in self._rings(city):
+            for other in ring:
+                if other != city:
+                    dist = calculate_distance(city, other)
+                    if dist < radius:
+                        found.append((other, dist))
+            if bound >= radius:
+                break
+        return found
@@ -0,0 +1,274 @@
+import math
+
+# From this many cities make_tour() picks the two-level list over the plain array
+TWO_LEVEL_MIN = 10000
+
+
+class Tour:
+    """Cyclic tour over cities 0..n-1: an array of cities plus a position index.
+
+    next/prev/between are O(1). reverse(a, b) swaps the cities of whichever side of the
+    tour is shorter, so a move costs O(min(k, n - k)) rather than the O(n) slice copy of
+    `path[i:j+1] = reversed(path[i:j+1])`. Reversing the other side leaves the same cycle
+    read backwards, so a `flipped` bit keeps next/prev pointing the way plain segment
+    reversals would have left them.
+    """
+
+    def __init__(self, order):
+        self.order = list(order)
+        self.pos = [0] * len(self.order)
+        for i, city in enumerate(self.order):
+            self.pos[city] = i
+        self.flipped = False
+
+    def __len__(self):
+        return len(self.order)
+
+    def next(self, city):
+        """City after `city` in tour order."""
+        i = self.pos[city] + (-1 if self.flipped else 1)
+        return self.order[i if i < len(self.order) else 0]
+
+    def prev(self, city):
+        """City before `city` in tour order."""
+        i = self.pos[city] + (1 if self.flipped else -1)
+        return self.order[i if i < len(self.order) else 0]
+
+    def between(self, a, b, c):
+        """True if b lies on the tour path from a forward to c (inclusive)."""
+        pos, n = self.pos, len(self.order)
+        if self.flipped:
+            a, c = c, a
+        return (pos[b] - pos[a]) % n <= (pos[c] - pos[a]) % n
+
+    def reverse(self, a, b):
+        """Reverse the tour path from a forward to b, so a now sits where b was and vice versa."""
+        order, pos, n = self.order, self.pos, len(self.order)
+        if self.flipped:
+            a, b = b, a
+        i, j = pos[a], pos[b]
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            # Reverse the rest of the tour instead: same cycle, read backwards
+            i, j = (j + 1) % n, (i - 1) % n
+            length = n - length
+            self.flipped = not self.flipped
+        if length < 2:
+            return
+        if i <= j:
+            segment = order[i:j + 1]
+            segment.reverse()
+            order[i:j + 1] = segment
+            for k, city in enumerate(segment, i):
+                pos[city] = k
+            return
+        for _ in range(length // 2):
+            ci, cj = order[i], order[j]
+            order[i], order[j] = cj, ci
+            pos[cj], pos[ci] = i, j
+            i = i + 1 if i + 1 < n else 0
+            j = j - 1 if j else n - 1
+
+    def move(self, a, b, c, d):
+        """2-opt move replacing tour edges (a, b), (c, d) with (a, c), (b, d).
+
+        b and d must both follow (or both precede) a and c in tour order.
+        """
+        if self.next(a) == b:
+            self.reverse(b, c)  # a [b .. c] d
+        else:
+            self.reverse(a, d)  # b [a .. d] c
+
+    def path(self, start=None):
+        """Closed path (first city repeated at the end) in tour order, starting at `start`."""
+        order = self.order
+        if not order:
+            return []
+        first = self.pos[order[0] if start is None else start]
+        if self.flipped:
+            path = order[first::-1] + order[:first:-1]
+        else:
+            path = order[first:] + order[:first]
+        path.append(path[0])
+        return path
+
+
+class TwoLevelTour:
+    """Cyclic tour kept as a list of blocks of about sqrt(n) cities, each with a reverse bit.
+
+    Same interface as Tour. reverse() splits at most two blocks and then flips the run of
+    whole blocks between them (reversing their order and toggling their bits), so a move
+    costs O(sqrt n) however long the reversed path is. Splits fragment the blocks; once
+    there are twice as many as at the start they are rebuilt, which keeps the cost
+    amortised O(sqrt n).
+    """
+
+    def __init__(self, order):
+        order = list(order)
+        n = len(order)
+        self.n = n
+        self.size = max(8, int(math.sqrt(n)))
+        self.max_blocks = 2 * (n // self.size + 1)
+        self.block = [0] * n  # City -> block id
+        self.offset = [0] * n  # City -> index in its block's stored list
+        self.flipped = False
+        self._build(order)
+
+    def _build(self, order):
+        size = self.size
+        self.items = [order[i:i + size] for i in range(0, len(order), size)]
+        self.rev = [False] * len(self.items)
+        self.ranks = list(range(len(self.items)))  # Block id -> place in the block sequence
+        self.sequence = list(range(len(self.items)))  # Block ids in array order
+        block, offset = self.block, self.offset
+        for b, items in enumerate(self.items):
+            for k, city in enumerate(items):
+                block[city] = b
+                offset[city] = k
+
+    def _array_order(self):
+        order = []
+        for b in self.sequence:
+            order.extend(reversed(self.items[b]) if self.rev[b] else self.items[b])
+        return order
+
+    def __len__(self):
+        return self.n
+
+    def _index(self, city):
+        """Index of `city` within its block, in array order."""
+        b = self.block[city]
+        return len(self.items[b]) - 1 - self.offset[city] if self.rev[b] else self.offset[city]
+
+    def _key(self, city):
+        """Comparable array position of `city`."""
+        return self.ranks[self.block[city]] * self.n + self._index(city)
+
+    def _at(self, b, index):
+        items = self.items[b]
+        return items[len(items) - 1 - index] if self.rev[b] else items[index]
+
+    def _array_next(self, city):
+        b = self.block[city]
+        index = self._index(city) + 1
+        if index < len(self.items[b]):
+            return self._at(b, index)
+        sequence = self.sequence
+        rank = self.ranks[b] + 1
+        return self._at(sequence[rank if rank < len(sequence) else 0], 0)
+
+    def _array_prev(self, city):
+        b = self.block[city]
+        index = self._index(city) - 1
+        if index >= 0:
+            return self._at(b, index)
+        nb = self.sequence[self.ranks[b] - 1]
+        return self._at(nb, len(self.items[nb]) - 1)
+
+    def next(self, city):
+        """City after `city` in tour order."""
+        return self._array_prev(city) if self.flipped else self._array_next(city)
+
+    def prev(self, city):
+        """City before `city` in tour order."""
+        return self._array_next(city) if self.flipped else self._array_prev(city)
+
+    def between(self, a, b, c):
+        """True if b lies on the tour path from a forward to c (inclusive)."""
+        if self.flipped:
+            a, c = c, a
+        ka, kb, kc = self._key(a), self._key(b), self._key(c)
+        if ka <= kc:
+            return ka <= kb <= kc
+        return kb >= ka or kb <= kc
+
+    def _split_before(self, city):
+        """Make `city` the first city (in array order) of its block."""
+        b = self.block[city]
+        index = self._index(city)
+        if index == 0:
+            return
+        items = self.items[b]
+        cut = len(items) - index if self.rev[b] else index
+        head, tail = items[:cut], items[cut:]
+        # Stored order runs backwards in a reversed block, so the array-later part is the head
+        keep, moved = (tail, head) if self.rev[b] else (head, tail)
+        nb = len(self.items)
+        self.items[b] = keep
+        self.items.append(moved)
+        self.rev.append(self.rev[b])
+        block, offset = self.block, self.offset
+        for k, c in enumerate(moved):
+            block[c] = nb
+            offset[c] = k
+        if self.rev[b]:
+            for k, c in enumerate(keep):
+                offset[c] = k
+        rank = self.ranks[b] + 1
+        self.sequence.insert(rank, nb)
+        self.ranks.append(rank)
+        ranks = self.ranks
+        for r in range(rank + 1, len(self.sequence)):
+            ranks[self.sequence[r]] = r
+
+    def _reverse_array(self, x, y):
+        """Reverse the array run x..y, where x does not come after y."""
+        self._split_before(x)
+        after = self._array_next(y)
+        if self._key(after) > self._key(y):
+            self._split_before(after)
+        lo, hi = self.ranks[self.block[x]], self.ranks[self.block[y]]
+        sequence, ranks, rev = self.sequence, self.ranks, self.rev
+        sequence[lo:hi + 1] = sequence[lo:hi + 1][::-1]
+        for r in range(lo, hi + 1):
+            b = sequence[r]
+            ranks[b] = r
+            rev[b] = not rev[b]
+        if len(sequence) > self.max_blocks:
+            self._build(self._array_order())
+
+    def reverse(self, a, b):
+        """Reverse the tour path from a forward to b, so a now sits where b was and vice versa."""
+        x, y = (b, a) if self.flipped else (a, b)
+        if self._key(x) <= self._key(y):
+            self._reverse_array(x, y)
+            return
+        # The run wraps around the array: reverse the rest instead, the same cycle read backwards
+        self.flipped = not self.flipped
+        x, y = self._array_next(y), self._array_prev(x)
+        if self._key(x) <= self._key(y):  # Otherwise the run was the whole tour
+            self._reverse_array(x, y)
+
+    def move(self, a, b, c, d):
+        """2-opt move replacing tour edges (a, b), (c, d) with (a, c), (b, d).
+
+        b and d must both follow (or both precede) a and c in tour order.
+        """
+        if self.next(a) == b:
+            self.reverse(b, c)  # a [b .. c] d
+        else:
+            self.reverse(a, d)  # b [a .. d] c
+
+    def path(self, start=None):
+        """Closed path (first city repeated at the end) in tour order, starting at `start`."""
+        order = self._array_order()
+        if not order:
+            return []
+        first = order.index(order[0] if start is None else start)
+        if self.flipped:
+            path = order[first::-1] + order[:first:-1]
+        else:
+            path = order[first:] + order[:first]
+        path.append(path[0])
+        return path
+
+
+def make_tour(order, two_level=None):
+    """Build a tour over `order`: a Tour, or a TwoLevelTour from TWO_LEVEL_MIN cities.
+
+    two_level=True/False forces the choice.
+    """
+    order = list(order)
+    if two_level is None:
+        two_level = len(order) >= TWO_LEVEL_MIN
+    return TwoLevelTour(order) if two_level else Tour(order)
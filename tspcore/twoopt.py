@@ -0,0 +1,48 @@
+from .dontlook import DontLookBits
+from .tour import make_tour
+
+
+def two_opt_candidates(path, neighbors, calculate_distance, improvement_threshold=1e-6, two_level=None,
+                       budget=None, active=None):
+    """2-opt over a closed path (first city repeated at the end) trying only candidate edges.
+
+    For each city a and each of its tour edges (a, b), only the cities c in neighbors[a]
+    closer to a than b are tried as the new edge (a, c), so a move costs O(k) and its gain
+    comes from the four endpoint distances alone. Don't-look bits (DontLookBits) keep a queue
+    of cities worth revisiting: a city leaves the queue when none of its moves improve and
+    comes back only when an edge next to it changes. Moves are applied to a Tour (see
+    make_tour for two_level). A Budget can stop the search early on the current, best-so-far
+    tour. `active` limits the starting queue to those cities (e.g. around the seams of a
+    stitched tour); the search still spreads from there through the moves it makes. The path
+    keeps its starting city and is returned closed.
+    """
+    if len(path) - 1 < 4:
+        return path
+    tour = make_tour(path[:-1], two_level)
+
+    bits = DontLookBits(path[:-1] if active is None else active, len(path) - 1)
+    for a in bits.drain(budget, lambda: tour.path(path[0])):
+        for step in (tour.next, tour.prev):
+            b = step(a)
+            d_ab = calculate_distance(a, b)
+            move = None
+            for c in neighbors[a]:
+                d_ac = calculate_distance(a, c)
+                if d_ac >= d_ab:
+                    break  # Neighbors are sorted, nothing further can gain
+                d = step(c)
+                if c == b or d == a:
+                    continue
+                gain = d_ab + calculate_distance(c, d) - d_ac - calculate_distance(b, d)
+                if gain > improvement_threshold:
+                    move = (c, d)
+                    break
+            if move is None:
+                continue
+            # Replace (a, b), (c, d) with (a, c), (b, d)
+            c, d = move
+            tour.move(a, b, c, d)
+            bits.push((a, b, c, d))
+            break
+
+    return tour.path(path[0])
@@ -0,0 +1,104 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from .citytable import CityTable
+from .distance import distance_kernel
+from .exact import exact_order
+from .shared import attach_arrays, share_arrays
+
+# Cities re-ordered per window, between its two fixed end cities
+WINDOW = 10
+# Passes over the tour at most; each pass after the first shifts the windows by half a window
+MAX_ROUNDS = 4
+# Windows handed to a worker process per task
+WINDOWS_PER_TASK = 64
+
+# Per-process state set up once by _init_worker
+_worker = {}
+
+
+def _init_worker(name, layout):
+    """Read the shared coordinates once per process and build a direct distance kernel."""
+    xs, ys = attach_arrays(name, layout)
+    _worker['calculate_distance'] = distance_kernel(CityTable(xs, ys))
+
+
+def _solve_windows(windows):
+    """exact_order() for each (first, middle, last) window; returns [(length, middle), ...]."""
+    calculate_distance = _worker['calculate_distance']
+    return [exact_order(calculate_distance, first, middle, last) for first, middle, last in windows]
+
+
+def window_optimize(path, calculate_distance, window=WINDOW, table=None, workers=1, max_rounds=MAX_ROUNDS,
+                    improvement_threshold=1e-6, budget=None):
+    """Re-solve every run of `window` consecutive cities of a closed path exactly, ends fixed.
+
+    A pass cuts the tour into windows whose inner cities do not overlap (neighbouring
+    windows only share an end city) and replaces each window's order by its Held-Karp
+    optimum (exact_order) when that is shorter. This removes local defects 2-opt and
+    Or-opt cannot see, at O(n * 2^window * window) per pass. Passes alternate the window
+    offset by half a window, until one improves nothing or max_rounds have run; a window
+    already known to be optimal from an earlier pass is not solved again.
+
+    The windows of a pass are independent, so with workers > 1 they are solved across a
+    process pool; the workers rebuild a direct distance kernel from the coordinates of
+    `table`, shared once. A Budget stops between windows (between passes when parallel).
+    The path keeps its starting city and is returned closed.
+    """
+    n = len(path) - 1
+    if n < window + 3:
+        return path
+    if workers > 1 and table is None:
+        raise ValueError('window_optimize needs the CityTable to run in parallel')
+    origin, path = path[0], path[:-1]
+    if budget is not None and not budget.start():
+        return path + path[:1]
+
+    settled = set()  # Windows, as city tuples, whose order is already optimal
+    pool = shm = None
+    if workers > 1:
+        shm, layout = share_arrays([table.x, table.y])
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(shm.name, layout))
+    try:
+        for round_index in range(max_rounds):
+            offset = round_index % 2 * (window // 2)
+            # Window starts: each covers path[s] .. path[s + window + 1], cyclically
+            starts, windows = [], []
+            for s in range(offset, offset + n - window - 1, window + 1):
+                cities = tuple(path[(s + i) % n] for i in range(window + 2))
+                if cities not in settled:
+                    starts.append(s)
+                    windows.append((cities[0], list(cities[1:-1]), cities[-1]))
+
+            improved = False
+            if pool is not None:
+                tasks = [windows[i:i + WINDOWS_PER_TASK] for i in range(0, len(windows), WINDOWS_PER_TASK)]
+                solved = [result for part in pool.map(_solve_windows, tasks) for result in part]
+            else:
+                solved = []
+                for first, middle, last in windows:
+                    if budget is not None and budget.expired():
+                        break
+                    solved.append(exact_order(calculate_distance, first, middle, last))
+            for s, (first, middle, last), (length, order) in zip(starts, windows, solved):
+                current = [first] + middle + [last]
+                before = sum(calculate_distance(current[i], current[i + 1]) for i in range(len(current) - 1))
+                if length < before - improvement_threshold:
+                    for i, city in enumerate(order, 1):
+                        path[(s + i) % n] = city
+                    current = [first] + order + [last]
+                    improved = True
+                settled.add(tuple(current))
+
+            if not improved or len(solved) < len(windows):
+                break
+            if budget is not None and not budget.end_pass(lambda: path + path[:1]):
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+            shm.close()
+            shm.unlink()
+
+    # Shifted windows may have moved the starting city; rotate it back to the front
+    start = path.index(origin)
+    return path[start:] + path[:start] + path[start:start + 1]
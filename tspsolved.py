@@ -1,13 +1,18 @@
 import math
 import time
 
-def solve_satisfiability_and_tsp(cities):
+from tspcore import as_city_table, nearest_neighbor_tour, neighbor_lists
+from tspcore.twoopt import two_opt_candidates
+
+def solve_satisfiability_and_tsp(cities, candidate_k=8):
+    table = as_city_table(cities)
+    xs, ys = table.x, table.y
     memoized_distances = {}
 
     def calculate_distance(city1, city2):
-        key = f"{city1['name']}-{city2['name']}"
+        key = (city1, city2)
         if key not in memoized_distances:
-            memoized_distances[key] = math.hypot(city1['x'] - city2['x'], city1['y'] - city2['y'])
+            memoized_distances[key] = math.hypot(xs[city1] - xs[city2], ys[city1] - ys[city2])
         return memoized_distances[key]
 
     def total_distance(path):
@@ -15,64 +20,21 @@ def solve_satisfiability_and_tsp(cities):
             calculate_distance(path[i], path[(i + 1) % len(path)]) for i in range(len(path))
         )
 
-    def tsp_nearest_neighbor(cities):
-        unvisited = set(city['name'] for city in cities)
-        path = [cities[0]]
-        current_city = cities[0]
-
-        while unvisited:
-            unvisited.discard(current_city['name'])
-            closest = None
-            closest_distance = float('inf')
-
-            for city in cities:
-                if city['name'] in unvisited:
-                    dist = calculate_distance(current_city, city)
-                    if dist < closest_distance:
-                        closest_distance = dist
-                        closest = city
-
-            if closest is None:
-                break
-
-            path.append(closest)
-            current_city = closest
-
+    def tsp_nearest_neighbor(num_cities):
+        # A spatial grid answers each "closest unvisited city" query instead of scanning every city
+        path = nearest_neighbor_tour(table, calculate_distance)
         distance = total_distance(path)
         return {'path': path, 'distance': distance}
 
-    def segment_distance(path, index1, index2):
-        i1 = (index1 + len(path)) % len(path)
-        i2 = (index2 + len(path)) % len(path)
-        return calculate_distance(path[i1], path[i2])
-
     def two_opt(path):
-        improved = True
-        improvement_threshold = 1e-6
-
-        while improved:
-            improved = False
-            for i in range(1, len(path) - 1):
-                for j in range(i + 1, len(path)):
-                    before_swap_distance = (
-                        segment_distance(path, i - 1, i) +
-                        segment_distance(path, j, (j + 1) % len(path))
-                    )
-
-                    new_path = path[:i] + path[i:j + 1][::-1] + path[j + 1:]
-                    after_swap_distance = (
-                        segment_distance(new_path, i - 1, i) +
-                        segment_distance(new_path, j, (j + 1) % len(path))
-                    )
-
-                    if after_swap_distance < before_swap_distance - improvement_threshold:
-                        path = new_path
-                        improved = True
-        return path
-
-    tsp_result = tsp_nearest_neighbor(cities)
-    tsp_result['path'] = two_opt(tsp_result['path'])
-    tsp_result['distance'] = total_distance(tsp_result['path'])
+        # Neighbor-list 2-opt on the closed tour: O(1) gain per move, no path copies
+        path = two_opt_candidates(path + path[:1], neighbor_lists(table, candidate_k), calculate_distance)
+        return path[:-1]
+
+    tsp_result = tsp_nearest_neighbor(len(table))
+    path = two_opt(tsp_result['path'])
+    tsp_result['path'] = table.to_dicts(path)
+    tsp_result['distance'] = total_distance(path)
     return tsp_result
 
 # Test with a sample list of 10 cities
@@ -130,19 +92,20 @@ cities = [
     {'name': 'City49', 'x': 490, 'y': 15}
 ]
 
-# Measure start time
-start_time = time.time()
+if __name__ == '__main__':
+    # Measure start time
+    start_time = time.time()
 
-# Run the TSP solution
-result = solve_satisfiability_and_tsp(cities)
+    # Run the TSP solution
+    result = solve_satisfiability_and_tsp(cities)
 
-# Measure end time
-end_time = time.time()
+    # Measure end time
+    end_time = time.time()
 
-# Calculate the elapsed time
-elapsed_time = end_time - start_time
+    # Calculate the elapsed time
+    elapsed_time = end_time - start_time
 
-# Print the results and time taken
-print("Optimal Path:", [city['name'] for city in result['path']])
-print("Total Distance:", result['distance'])
-print(f"Elapsed Time: {elapsed_time:.6f} seconds")
+    # Print the results and time taken
+    print("Optimal Path:", [city['name'] for city in result['path']])
+    print("Total Distance:", result['distance'])
+    print(f"Elapsed Time: {elapsed_time:.6f} seconds")
@@ -4,6 +4,8 @@ from mpl_toolkits.mplot3d import Axes3D
 from matplotlib.animation import FuncAnimation
 import matplotlib.colors as mcolors
 
+from tspcore.sfc import curve_order
+
 # Custom data structure for cities
 def generate_custom_cities(num_cities=50):
     cities = []
@@ -20,28 +22,14 @@ def generate_custom_cities(num_cities=50):
         cities.append(city)
     return cities
 
-# Function to spread bits (Morton Order)
-def spread_bits(v):
-    v = (v | (v << 8)) & 0x00FF00FF
-    v = (v | (v << 4)) & 0x0F0F0F0F
-    v = (v | (v << 2)) & 0x33333333
-    v = (v | (v << 1)) & 0x55555555
-    return v
-
-# Function to compute Morton Order
-def morton_order(city):
-    x, y = city['x'], city['y']  # Only use x and y for Morton order
-    x = int(x * 10000)
-    y = int(y * 10000)
-    return spread_bits(x) | (spread_bits(y) << 1)
-
 # Function to sort and connect cities based on Morton order
-def sort_cities(cities):
+def sort_cities(cities, curve='morton'):
     if not len(cities):
         print("No cities to process. Please check the input data.")
         return []
     
-    cities_sorted = sorted(cities, key=morton_order)
+    # Start from the first city along the curve ('morton' or 'hilbert'), in 3-D when the cities carry z
+    cities_sorted = [cities[i] for i in curve_order(cities, curve)]
     sorted_path = [cities_sorted.pop(0)]
 
     while len(cities_sorted):